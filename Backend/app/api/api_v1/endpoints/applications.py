@@ -6,9 +6,12 @@ from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
 from datetime import date
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db, Application
-from app.core.security import verify_token
+from app.core.principal import Principal, get_current_principal
+from app.core.fieldsets import select_fields
+from app.core.serialization import ModelSerializer, json_response
 
 router = APIRouter()
 
@@ -40,34 +43,18 @@ class ApplicationResponse(BaseModel):
     created_at: str
     updated_at: str
 
+application_serializer = ModelSerializer.for_schema(ApplicationResponse)
+
 @router.get("/", response_model=List[ApplicationResponse])
-async def get_applications(token: str, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_applications(skip: int = 0, limit: int = 100, fields: Optional[str] = None, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get all applications for current user"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
+        selection = select_fields(Application, fields, ApplicationResponse)
+        query = select(Application).where(Application.user_id == current_user.id).offset(skip).limit(limit)
+        result = await db.execute(selection.apply(query) if selection else query)
+        applications = result.scalars().all()
 
-        applications = db.query(Application).filter(Application.user_id == payload['sub']).offset(skip).limit(limit).all()
-
-        return [
-            {
-                "id": app.id,
-                "user_id": app.user_id,
-                "company": app.company,
-                "position": app.position,
-                "status": app.status,
-                "job_description": app.job_description,
-                "application_date": app.application_date.isoformat() if app.application_date else None,
-                "notes": app.notes,
-                "created_at": app.created_at.isoformat() if app.created_at else None,
-                "updated_at": app.updated_at.isoformat() if app.updated_at else None
-            }
-            for app in applications
-        ]
+        return json_response((selection or application_serializer).many(applications))
 
     except HTTPException:
         raise
@@ -78,19 +65,12 @@ async def get_applications(token: str, skip: int = 0, limit: int = 100, db: Sess
         )
 
 @router.post("/", response_model=ApplicationResponse)
-async def create_application(application_data: ApplicationCreate, token: str, db: Session = Depends(get_db)):
+async def create_application(application_data: ApplicationCreate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Create a new job application"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Create new application
         new_application = Application(
-            user_id=payload['sub'],
+            user_id=current_user.id,
             company=application_data.company,
             position=application_data.position,
             status=application_data.status or "applied",
@@ -100,47 +80,31 @@ async def create_application(application_data: ApplicationCreate, token: str, db
         )
 
         db.add(new_application)
-        db.commit()
-        db.refresh(new_application)
+        await db.commit()
+        await db.refresh(new_application)
 
-        return {
-            "id": new_application.id,
-            "user_id": new_application.user_id,
-            "company": new_application.company,
-            "position": new_application.position,
-            "status": new_application.status,
-            "job_description": new_application.job_description,
-            "application_date": new_application.application_date.isoformat() if new_application.application_date else None,
-            "notes": new_application.notes,
-            "created_at": new_application.created_at.isoformat() if new_application.created_at else None,
-            "updated_at": new_application.updated_at.isoformat() if new_application.updated_at else None
-        }
+        return json_response(application_serializer.one(new_application))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create application: {str(e)}"
         )
 
 @router.get("/{application_id}", response_model=ApplicationResponse)
-async def get_application(application_id: str, token: str, db: Session = Depends(get_db)):
+async def get_application(application_id: str, fields: Optional[str] = None, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get a specific application by ID"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get application
-        application = db.query(Application).filter(
+        selection = select_fields(Application, fields, ApplicationResponse)
+        query = select(Application).where(
             Application.id == application_id,
-            Application.user_id == payload['sub']
-        ).first()
+            Application.user_id == current_user.id
+        )
+        application = await db.scalar(selection.apply(query) if selection else query)
 
         if not application:
             raise HTTPException(
@@ -148,18 +112,7 @@ async def get_application(application_id: str, token: str, db: Session = Depends
                 detail="Application not found"
             )
 
-        return {
-            "id": application.id,
-            "user_id": application.user_id,
-            "company": application.company,
-            "position": application.position,
-            "status": application.status,
-            "job_description": application.job_description,
-            "application_date": application.application_date.isoformat() if application.application_date else None,
-            "notes": application.notes,
-            "created_at": application.created_at.isoformat() if application.created_at else None,
-            "updated_at": application.updated_at.isoformat() if application.updated_at else None
-        }
+        return json_response((selection or application_serializer).one(application))
 
     except HTTPException:
         raise
@@ -170,21 +123,14 @@ async def get_application(application_id: str, token: str, db: Session = Depends
         )
 
 @router.put("/{application_id}", response_model=ApplicationResponse)
-async def update_application(application_id: str, application_update: ApplicationUpdate, token: str, db: Session = Depends(get_db)):
+async def update_application(application_id: str, application_update: ApplicationUpdate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Update a job application"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if application exists and belongs to user
-        application = db.query(Application).filter(
+        application = await db.scalar(select(Application).where(
             Application.id == application_id,
-            Application.user_id == payload['sub']
-        ).first()
+            Application.user_id == current_user.id
+        ))
 
         if not application:
             raise HTTPException(
@@ -206,47 +152,29 @@ async def update_application(application_id: str, application_update: Applicatio
         if application_update.notes is not None:
             application.notes = application_update.notes
 
-        db.commit()
-        db.refresh(application)
+        await db.commit()
+        await db.refresh(application)
 
-        return {
-            "id": application.id,
-            "user_id": application.user_id,
-            "company": application.company,
-            "position": application.position,
-            "status": application.status,
-            "job_description": application.job_description,
-            "application_date": application.application_date.isoformat() if application.application_date else None,
-            "notes": application.notes,
-            "created_at": application.created_at.isoformat() if application.created_at else None,
-            "updated_at": application.updated_at.isoformat() if application.updated_at else None
-        }
+        return json_response(application_serializer.one(application))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update application: {str(e)}"
         )
 
 @router.delete("/{application_id}")
-async def delete_application(application_id: str, token: str, db: Session = Depends(get_db)):
+async def delete_application(application_id: str, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Delete a job application"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if application exists and belongs to user
-        application = db.query(Application).filter(
+        application = await db.scalar(select(Application).where(
             Application.id == application_id,
-            Application.user_id == payload['sub']
-        ).first()
+            Application.user_id == current_user.id
+        ))
 
         if not application:
             raise HTTPException(
@@ -255,33 +183,27 @@ async def delete_application(application_id: str, token: str, db: Session = Depe
             )
 
         # Delete application
-        db.delete(application)
-        db.commit()
+        await db.delete(application)
+        await db.commit()
 
         return {"message": "Application deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete application: {str(e)}"
         )
 
 @router.get("/stats/summary", response_model=Dict[str, Any])
-async def get_application_stats(token: str, db: Session = Depends(get_db)):
+async def get_application_stats(current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get application statistics for current user"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get all applications for user
-        applications = db.query(Application).filter(Application.user_id == payload['sub']).all()
+        result = await db.execute(select(Application).where(Application.user_id == current_user.id))
+        applications = result.scalars().all()
 
         if not applications:
             return {
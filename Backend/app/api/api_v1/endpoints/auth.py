@@ -3,18 +3,29 @@ Authentication endpoints for username/password authentication
 """
 
 from datetime import timedelta
-from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import (
-    verify_password,
-    get_password_hash,
     create_access_token,
-    verify_token
+    user_claims
+)
+from app.core.password_hashing import password_hasher, PasswordHashingOverloaded
+from app.core.principal import authenticate, load_principal
+from app.core.rate_limit import enforce_login_limits, record_login_success, enforce_register_limits
+from app.core.sessions import (
+    create_session,
+    rotate_session,
+    revoke_session,
+    end_session,
+    InvalidRefreshToken,
+    RefreshTokenRaced
 )
 from app.core.database import get_db, User
 from app.core.config import settings
+from app.core.serialization import ModelSerializer, json_response
 
 router = APIRouter()
 
@@ -29,17 +40,40 @@ class RegisterRequest(BaseModel):
     name: str
     role: str = "student"  # student or alumni
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    expires_in: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    refresh_token: Optional[str] = None
     user: Dict[str, Any]
 
+# Login and registration return the user without is_active; refresh and
+# verify return the cached principal's public fields
+token_user_serializer = ModelSerializer(("id", "username", "email", "name", "role", "created_at", "updated_at"))
+principal_serializer = ModelSerializer(("id", "username", "email", "name", "role", "is_active", "created_at", "updated_at"))
+
+def token_response(access_token: str, refresh_token: str, user: Dict[str, Any]):
+    """TokenResponse body, sent without re-validation"""
+    return json_response({
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
+        "user": user
+    })
+
 @router.post("/login", response_model=TokenResponse)
-async def login(login_request: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_request: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)):
     """Authenticate user with username and password"""
     try:
+        # Throttle before any database or bcrypt work
+        await enforce_login_limits(request, login_request.username)
+
         # Find user by username
-        user = db.query(User).filter(User.username == login_request.username).first()
+        user = await db.scalar(select(User).where(User.username == login_request.username))
 
         if not user:
             raise HTTPException(
@@ -54,49 +88,50 @@ async def login(login_request: LoginRequest, db: Session = Depends(get_db)):
             )
 
         # Verify password
-        if not verify_password(login_request.password, user.password_hash):
+        if not await password_hasher.verify(login_request.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid username or password"
             )
+        await record_login_success(login_request.username)
 
-        # Create JWT token
+        # Create JWT token and a refresh-token session
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user.id, "username": user.username, "email": user.email},
+            data=user_claims(user),
             expires_delta=access_token_expires
         )
+        refresh_token = await create_session(db, user.id)
+        await db.commit()
 
-        # Convert user to dict for response
-        user_data = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
-
-        return TokenResponse(
-            access_token=access_token,
-            user=user_data
-        )
+        return token_response(access_token, refresh_token, token_user_serializer.one(user))
 
     except HTTPException:
         raise
+    except PasswordHashingOverloaded:
+        # The password was never checked, so this is not a failed attempt
+        await record_login_success(login_request.username)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Login failed: {str(e)}"
         )
 
 @router.post("/register", response_model=TokenResponse)
-async def register(register_request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(register_request: RegisterRequest, request: Request, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     try:
+        # Throttle before any database or bcrypt work
+        await enforce_register_limits(request)
+
         # Check if username already exists
-        existing_username = db.query(User).filter(User.username == register_request.username).first()
+        existing_username = await db.scalar(select(User).where(User.username == register_request.username))
         if existing_username:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -104,7 +139,7 @@ async def register(register_request: RegisterRequest, db: Session = Depends(get_
             )
 
         # Check if email already exists
-        existing_email = db.query(User).filter(User.email == register_request.email).first()
+        existing_email = await db.scalar(select(User).where(User.email == register_request.email))
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -119,7 +154,7 @@ async def register(register_request: RegisterRequest, db: Session = Depends(get_
             )
 
         # Hash password
-        password_hash = get_password_hash(register_request.password)
+        password_hash = await password_hasher.hash(register_request.password)
 
         # Create new user
         new_user = User(
@@ -131,77 +166,106 @@ async def register(register_request: RegisterRequest, db: Session = Depends(get_
         )
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.flush()
+        refresh_token = await create_session(db, new_user.id)
+        await db.commit()
+        await db.refresh(new_user)
 
         # Create JWT token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": new_user.id, "username": new_user.username, "email": new_user.email},
+            data=user_claims(new_user),
             expires_delta=access_token_expires
         )
 
-        # Convert user to dict for response
-        user_data = {
-            "id": new_user.id,
-            "username": new_user.username,
-            "email": new_user.email,
-            "name": new_user.name,
-            "role": new_user.role,
-            "created_at": new_user.created_at.isoformat() if new_user.created_at else None,
-            "updated_at": new_user.updated_at.isoformat() if new_user.updated_at else None
-        }
-
-        return TokenResponse(
-            access_token=access_token,
-            user=user_data
-        )
+        return token_response(access_token, refresh_token, token_user_serializer.one(new_user))
 
     except HTTPException:
         raise
+    except PasswordHashingOverloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-up attempts in progress, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {str(e)}"
         )
 
-@router.post("/verify")
-async def verify_token_endpoint(token: str, db: Session = Depends(get_db)):
-    """Verify JWT token and return user info"""
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(refresh_request: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """Exchange a refresh token for a new access token and the next refresh token"""
     try:
-        payload = verify_token(token)
-        if not payload:
+        session_id, user_id, refresh_token = await rotate_session(db, refresh_request.refresh_token)
+
+        # Claims come from the principal cache, so renewal needs no password check
+        user = await load_principal(db, user_id)
+        if not user or not user.is_active:
+            await revoke_session(db, session_id)
+            await db.commit()
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
+                detail="Account is disabled"
             )
 
-        # Get user from database
-        user = db.query(User).filter(User.id == payload['sub']).first()
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_token = create_access_token(
+            data=user_claims(user),
+            expires_delta=access_token_expires
+        )
 
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
+        return token_response(access_token, refresh_token, principal_serializer.one(user))
+
+    except HTTPException:
+        raise
+    except RefreshTokenRaced as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{e}; retry with the latest refresh token",
+            headers={"Retry-After": "1"}
+        )
+    except InvalidRefreshToken as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Token refresh failed: {str(e)}"
+        )
+
+@router.post("/logout")
+async def logout(refresh_request: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """End the session behind a refresh token"""
+    try:
+        await end_session(db, refresh_request.refresh_token)
+        await db.commit()
+        return {"message": "Logged out successfully"}
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Logout failed: {str(e)}"
+        )
+
+@router.post("/verify")
+async def verify_token_endpoint(token: str, db: AsyncSession = Depends(get_db)):
+    """Verify JWT token and return user info"""
+    try:
+        # Same checks as every authenticated route, including revocation
+        user = await authenticate(token, db)
 
-        # Convert user to dict for response
-        user_data = {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
-
-        return {
+        return json_response({
             "valid": True,
-            "user": user_data
-        }
+            "user": principal_serializer.one(user)
+        })
 
     except HTTPException:
         raise
@@ -5,9 +5,11 @@ Mentorship management endpoints
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.core.database import get_db, Mentorship, User
-from app.core.security import verify_token
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, Mentorship
+from app.core.serialization import ModelSerializer, json_response
+from app.core.principal import Principal, get_current_principal, load_principal
 
 router = APIRouter()
 
@@ -27,34 +29,19 @@ class MentorshipResponse(BaseModel):
     created_at: str
     updated_at: str
 
+mentorship_serializer = ModelSerializer.for_schema(MentorshipResponse)
+
 @router.get("/", response_model=List[MentorshipResponse])
-async def get_mentorships(token: str, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_mentorships(skip: int = 0, limit: int = 100, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get all mentorships for current user (both as mentor and mentee)"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get mentorships where user is mentor or mentee
-        mentorships = db.query(Mentorship).filter(
-            (Mentorship.mentor_id == payload['sub']) | (Mentorship.mentee_id == payload['sub'])
-        ).offset(skip).limit(limit).all()
-
-        return [
-            {
-                "id": mentorship.id,
-                "mentor_id": mentorship.mentor_id,
-                "mentee_id": mentorship.mentee_id,
-                "status": mentorship.status,
-                "message": mentorship.message,
-                "created_at": mentorship.created_at.isoformat() if mentorship.created_at else None,
-                "updated_at": mentorship.updated_at.isoformat() if mentorship.updated_at else None
-            }
-            for mentorship in mentorships
-        ]
+        result = await db.execute(select(Mentorship).where(
+            (Mentorship.mentor_id == current_user.id) | (Mentorship.mentee_id == current_user.id)
+        ).offset(skip).limit(limit))
+        mentorships = result.scalars().all()
+
+        return json_response(mentorship_serializer.many(mentorships))
 
     except HTTPException:
         raise
@@ -65,37 +52,23 @@ async def get_mentorships(token: str, skip: int = 0, limit: int = 100, db: Sessi
         )
 
 @router.post("/request", response_model=MentorshipResponse)
-async def request_mentorship(mentorship_request: MentorshipRequest, token: str, db: Session = Depends(get_db)):
+async def request_mentorship(mentorship_request: MentorshipRequest, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Request mentorship from another user"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
-        # Check if users exist
-        mentor = db.query(User).filter(User.id == mentorship_request.mentor_id).first()
-        mentee = db.query(User).filter(User.id == payload['sub']).first()
+        # Check that the mentor exists; the mentee is the authenticated caller
+        mentor = await load_principal(db, mentorship_request.mentor_id)
 
-        if not mentor:
+        if not mentor or not mentor.is_active:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Mentor not found"
             )
 
-        if not mentee:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
         # Check if mentorship already exists
-        existing_mentorship = db.query(Mentorship).filter(
+        existing_mentorship = await db.scalar(select(Mentorship).where(
             Mentorship.mentor_id == mentorship_request.mentor_id,
-            Mentorship.mentee_id == payload['sub']
-        ).first()
+            Mentorship.mentee_id == current_user.id
+        ))
 
         if existing_mentorship:
             raise HTTPException(
@@ -106,50 +79,35 @@ async def request_mentorship(mentorship_request: MentorshipRequest, token: str,
         # Create mentorship request
         new_mentorship = Mentorship(
             mentor_id=mentorship_request.mentor_id,
-            mentee_id=payload['sub'],
+            mentee_id=current_user.id,
             message=mentorship_request.message,
             status="pending"
         )
 
         db.add(new_mentorship)
-        db.commit()
-        db.refresh(new_mentorship)
-
-        return {
-            "id": new_mentorship.id,
-            "mentor_id": new_mentorship.mentor_id,
-            "mentee_id": new_mentorship.mentee_id,
-            "status": new_mentorship.status,
-            "message": new_mentorship.message,
-            "created_at": new_mentorship.created_at.isoformat() if new_mentorship.created_at else None,
-            "updated_at": new_mentorship.updated_at.isoformat() if new_mentorship.updated_at else None
-        }
+        await db.commit()
+        await db.refresh(new_mentorship)
+
+        return json_response(mentorship_serializer.one(new_mentorship))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create mentorship request: {str(e)}"
         )
 
 @router.get("/{mentorship_id}", response_model=MentorshipResponse)
-async def get_mentorship(mentorship_id: str, token: str, db: Session = Depends(get_db)):
+async def get_mentorship(mentorship_id: str, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get a specific mentorship by ID"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get mentorship
-        mentorship = db.query(Mentorship).filter(
+        mentorship = await db.scalar(select(Mentorship).where(
             Mentorship.id == mentorship_id,
-            (Mentorship.mentor_id == payload['sub']) | (Mentorship.mentee_id == payload['sub'])
-        ).first()
+            (Mentorship.mentor_id == current_user.id) | (Mentorship.mentee_id == current_user.id)
+        ))
 
         if not mentorship:
             raise HTTPException(
@@ -157,15 +115,7 @@ async def get_mentorship(mentorship_id: str, token: str, db: Session = Depends(g
                 detail="Mentorship not found"
             )
 
-        return {
-            "id": mentorship.id,
-            "mentor_id": mentorship.mentor_id,
-            "mentee_id": mentorship.mentee_id,
-            "status": mentorship.status,
-            "message": mentorship.message,
-            "created_at": mentorship.created_at.isoformat() if mentorship.created_at else None,
-            "updated_at": mentorship.updated_at.isoformat() if mentorship.updated_at else None
-        }
+        return json_response(mentorship_serializer.one(mentorship))
 
     except HTTPException:
         raise
@@ -176,21 +126,14 @@ async def get_mentorship(mentorship_id: str, token: str, db: Session = Depends(g
         )
 
 @router.put("/{mentorship_id}", response_model=MentorshipResponse)
-async def update_mentorship(mentorship_id: str, mentorship_update: MentorshipUpdate, token: str, db: Session = Depends(get_db)):
+async def update_mentorship(mentorship_id: str, mentorship_update: MentorshipUpdate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Update mentorship status (accept/reject)"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if mentorship exists and user is the mentor
-        mentorship = db.query(Mentorship).filter(
+        mentorship = await db.scalar(select(Mentorship).where(
             Mentorship.id == mentorship_id,
-            Mentorship.mentor_id == payload['sub']
-        ).first()
+            Mentorship.mentor_id == current_user.id
+        ))
 
         if not mentorship:
             raise HTTPException(
@@ -202,44 +145,29 @@ async def update_mentorship(mentorship_id: str, mentorship_update: MentorshipUpd
         if mentorship_update.status is not None:
             mentorship.status = mentorship_update.status
 
-        db.commit()
-        db.refresh(mentorship)
+        await db.commit()
+        await db.refresh(mentorship)
 
-        return {
-            "id": mentorship.id,
-            "mentor_id": mentorship.mentor_id,
-            "mentee_id": mentorship.mentee_id,
-            "status": mentorship.status,
-            "message": mentorship.message,
-            "created_at": mentorship.created_at.isoformat() if mentorship.created_at else None,
-            "updated_at": mentorship.updated_at.isoformat() if mentorship.updated_at else None
-        }
+        return json_response(mentorship_serializer.one(mentorship))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update mentorship: {str(e)}"
         )
 
 @router.delete("/{mentorship_id}")
-async def delete_mentorship(mentorship_id: str, token: str, db: Session = Depends(get_db)):
+async def delete_mentorship(mentorship_id: str, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Delete a mentorship request"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if mentorship exists and user is involved
-        mentorship = db.query(Mentorship).filter(
+        mentorship = await db.scalar(select(Mentorship).where(
             Mentorship.id == mentorship_id,
-            (Mentorship.mentor_id == payload['sub']) | (Mentorship.mentee_id == payload['sub'])
-        ).first()
+            (Mentorship.mentor_id == current_user.id) | (Mentorship.mentee_id == current_user.id)
+        ))
 
         if not mentorship:
             raise HTTPException(
@@ -248,49 +176,32 @@ async def delete_mentorship(mentorship_id: str, token: str, db: Session = Depend
             )
 
         # Delete mentorship
-        db.delete(mentorship)
-        db.commit()
+        await db.delete(mentorship)
+        await db.commit()
 
         return {"message": "Mentorship deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete mentorship: {str(e)}"
         )
 
 @router.get("/requests/pending", response_model=List[MentorshipResponse])
-async def get_pending_requests(token: str, db: Session = Depends(get_db)):
+async def get_pending_requests(current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get pending mentorship requests for current user (as mentor)"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get pending requests where user is mentor
-        pending_requests = db.query(Mentorship).filter(
-            Mentorship.mentor_id == payload['sub'],
+        result = await db.execute(select(Mentorship).where(
+            Mentorship.mentor_id == current_user.id,
             Mentorship.status == 'pending'
-        ).all()
-
-        return [
-            {
-                "id": mentorship.id,
-                "mentor_id": mentorship.mentor_id,
-                "mentee_id": mentorship.mentee_id,
-                "status": mentorship.status,
-                "message": mentorship.message,
-                "created_at": mentorship.created_at.isoformat() if mentorship.created_at else None,
-                "updated_at": mentorship.updated_at.isoformat() if mentorship.updated_at else None
-            }
-            for mentorship in pending_requests
-        ]
+        ))
+        pending_requests = result.scalars().all()
+
+        return json_response(mentorship_serializer.many(pending_requests))
 
     except HTTPException:
         raise
@@ -301,34 +212,17 @@ async def get_pending_requests(token: str, db: Session = Depends(get_db)):
         )
 
 @router.get("/mentees/active", response_model=List[MentorshipResponse])
-async def get_active_mentees(token: str, db: Session = Depends(get_db)):
+async def get_active_mentees(current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get active mentorships where user is mentor"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get active mentorships where user is mentor
-        active_mentees = db.query(Mentorship).filter(
-            Mentorship.mentor_id == payload['sub'],
+        result = await db.execute(select(Mentorship).where(
+            Mentorship.mentor_id == current_user.id,
             Mentorship.status == 'accepted'
-        ).all()
-
-        return [
-            {
-                "id": mentorship.id,
-                "mentor_id": mentorship.mentor_id,
-                "mentee_id": mentorship.mentee_id,
-                "status": mentorship.status,
-                "message": mentorship.message,
-                "created_at": mentorship.created_at.isoformat() if mentorship.created_at else None,
-                "updated_at": mentorship.updated_at.isoformat() if mentorship.updated_at else None
-            }
-            for mentorship in active_mentees
-        ]
+        ))
+        active_mentees = result.scalars().all()
+
+        return json_response(mentorship_serializer.many(active_mentees))
 
     except HTTPException:
         raise
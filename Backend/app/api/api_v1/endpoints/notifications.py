@@ -2,14 +2,15 @@
 Notifications API endpoints for real-time notifications
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
-import json
 
-from app.core.database import get_db, User, Notification
-from app.core.security import get_current_user
+from app.core.database import get_db, Notification
+from app.core.principal import Principal, get_current_principal
+from app.core.pagination import paginate, split_page
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -44,8 +45,8 @@ class NotificationUpdate(BaseModel):
 async def create_notification(
     notification: NotificationCreate,
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a notification for a user"""
     try:
@@ -55,14 +56,14 @@ async def create_notification(
             message=notification.message,
             type=notification.type,
             priority=notification.priority,
-            data=json.dumps(notification.data) if notification.data else None,
+            data=notification.data or None,
             is_read=False,
             created_at=datetime.utcnow()
         )
 
         db.add(db_notification)
-        db.commit()
-        db.refresh(db_notification)
+        await db.commit()
+        await db.refresh(db_notification)
 
         # Send real-time notification (background task)
         background_tasks.add_task(send_push_notification, db_notification)
@@ -70,41 +71,46 @@ async def create_notification(
         return db_notification
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create notification: {str(e)}")
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     unread_only: bool = False,
     type_filter: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get notifications for current user"""
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    query = select(Notification).where(Notification.user_id == current_user.id)
 
     if unread_only:
-        query = query.filter(Notification.is_read == False)
+        query = query.where(Notification.is_read == False)
 
     if type_filter:
-        query = query.filter(Notification.type == type_filter)
+        query = query.where(Notification.type == type_filter)
 
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(paginate(query, Notification, cursor, skip, limit))
+    notifications, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return notifications
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
 async def get_notification(
     notification_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific notification"""
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == notification_id,
         Notification.user_id == current_user.id
-    ).first()
+    ))
 
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -115,14 +121,14 @@ async def get_notification(
 async def update_notification(
     notification_id: str,
     update: NotificationUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update notification (mark as read/unread)"""
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == notification_id,
         Notification.user_id == current_user.id
-    ).first()
+    ))
 
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -130,62 +136,62 @@ async def update_notification(
     if update.is_read is not None:
         notification.is_read = update.is_read
 
-    db.commit()
-    db.refresh(notification)
+    await db.commit()
+    await db.refresh(notification)
     return notification
 
 @router.delete("/{notification_id}")
 async def delete_notification(
     notification_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a notification"""
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == notification_id,
         Notification.user_id == current_user.id
-    ).first()
+    ))
 
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    db.delete(notification)
-    db.commit()
+    await db.delete(notification)
+    await db.commit()
     return {"message": "Notification deleted successfully"}
 
 @router.post("/mark-all-read")
 async def mark_all_notifications_read(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Mark all notifications as read"""
-    db.query(Notification).filter(
+    await db.execute(update(Notification).where(
         Notification.user_id == current_user.id,
         Notification.is_read == False
-    ).update({"is_read": True})
+    ).values(is_read=True))
 
-    db.commit()
+    await db.commit()
     return {"message": "All notifications marked as read"}
 
 @router.get("/stats/summary")
 async def get_notification_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get notification statistics"""
-    total_count = db.query(Notification).filter(Notification.user_id == current_user.id).count()
-    unread_count = db.query(Notification).filter(
+    total_count = await db.scalar(select(func.count(Notification.id)).where(Notification.user_id == current_user.id))
+    unread_count = await db.scalar(select(func.count(Notification.id)).where(
         Notification.user_id == current_user.id,
         Notification.is_read == False
-    ).count()
+    ))
 
     # Count by type
     type_counts = {}
     for notification_type in ['scholarship', 'project', 'mentorship', 'system']:
-        count = db.query(Notification).filter(
+        count = await db.scalar(select(func.count(Notification.id)).where(
             Notification.user_id == current_user.id,
             Notification.type == notification_type
-        ).count()
+        ))
         type_counts[notification_type] = count
 
     return {
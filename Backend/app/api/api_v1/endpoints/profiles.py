@@ -5,9 +5,11 @@ User profile management endpoints
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from app.core.database import get_db, Profile
-from app.core.security import verify_token
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, Profile, json_array_contains
+from app.core.principal import Principal, get_current_principal
+from app.core.serialization import ModelSerializer, json_response
 
 router = APIRouter()
 
@@ -38,8 +40,8 @@ class ProfileUpdate(BaseModel):
 class ProfileResponse(BaseModel):
     id: str
     bio: Optional[str]
-    skills: Optional[str]  # JSON string
-    interests: Optional[str]  # JSON string
+    skills: Optional[List[str]]
+    interests: Optional[List[str]]
     location: Optional[str]
     phone: Optional[str]
     linkedin_url: Optional[str]
@@ -50,24 +52,19 @@ class ProfileResponse(BaseModel):
     created_at: str
     updated_at: str
 
+profile_serializer = ModelSerializer.for_schema(ProfileResponse)
+
 @router.get("/", response_model=ProfileResponse)
-async def get_profile(token: str, db: Session = Depends(get_db)):
+async def get_profile(current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Get current user's profile"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Get profile from database
-        profile = db.query(Profile).filter(Profile.id == payload['sub']).first()
+        profile = await db.scalar(select(Profile).where(Profile.id == current_user.id))
 
         if not profile:
             # Return empty profile if not found
             return {
-                "id": payload['sub'],
+                "id": current_user.id,
                 "bio": None,
                 "skills": None,
                 "interests": None,
@@ -82,21 +79,7 @@ async def get_profile(token: str, db: Session = Depends(get_db)):
                 "updated_at": None
             }
 
-        return {
-            "id": profile.id,
-            "bio": profile.bio,
-            "skills": profile.skills,
-            "interests": profile.interests,
-            "location": profile.location,
-            "phone": profile.phone,
-            "linkedin_url": profile.linkedin_url,
-            "github_url": profile.github_url,
-            "portfolio_url": profile.portfolio_url,
-            "graduation_year": profile.graduation_year,
-            "company": profile.company,
-            "created_at": profile.created_at.isoformat() if profile.created_at else None,
-            "updated_at": profile.updated_at.isoformat() if profile.updated_at else None
-        }
+        return json_response(profile_serializer.one(profile))
 
     except HTTPException:
         raise
@@ -107,18 +90,11 @@ async def get_profile(token: str, db: Session = Depends(get_db)):
         )
 
 @router.post("/", response_model=ProfileResponse)
-async def create_profile(profile_data: ProfileCreate, token: str, db: Session = Depends(get_db)):
+async def create_profile(profile_data: ProfileCreate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Create or update user's profile"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if profile already exists
-        existing_profile = db.query(Profile).filter(Profile.id == payload['sub']).first()
+        existing_profile = await db.scalar(select(Profile).where(Profile.id == current_user.id))
 
         if existing_profile:
             raise HTTPException(
@@ -128,10 +104,10 @@ async def create_profile(profile_data: ProfileCreate, token: str, db: Session =
 
         # Create new profile
         new_profile = Profile(
-            id=payload['sub'],
+            id=current_user.id,
             bio=profile_data.bio,
-            skills=str(profile_data.skills) if profile_data.skills else None,
-            interests=str(profile_data.interests) if profile_data.interests else None,
+            skills=profile_data.skills or None,
+            interests=profile_data.interests or None,
             location=profile_data.location,
             phone=profile_data.phone,
             linkedin_url=profile_data.linkedin_url,
@@ -142,47 +118,26 @@ async def create_profile(profile_data: ProfileCreate, token: str, db: Session =
         )
 
         db.add(new_profile)
-        db.commit()
-        db.refresh(new_profile)
-
-        return {
-            "id": new_profile.id,
-            "bio": new_profile.bio,
-            "skills": new_profile.skills,
-            "interests": new_profile.interests,
-            "location": new_profile.location,
-            "phone": new_profile.phone,
-            "linkedin_url": new_profile.linkedin_url,
-            "github_url": new_profile.github_url,
-            "portfolio_url": new_profile.portfolio_url,
-            "graduation_year": new_profile.graduation_year,
-            "company": new_profile.company,
-            "created_at": new_profile.created_at.isoformat() if new_profile.created_at else None,
-            "updated_at": new_profile.updated_at.isoformat() if new_profile.updated_at else None
-        }
+        await db.commit()
+        await db.refresh(new_profile)
+
+        return json_response(profile_serializer.one(new_profile))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create profile: {str(e)}"
         )
 
 @router.put("/", response_model=ProfileResponse)
-async def update_profile(profile_update: ProfileUpdate, token: str, db: Session = Depends(get_db)):
+async def update_profile(profile_update: ProfileUpdate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Update user's profile"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if profile exists
-        profile = db.query(Profile).filter(Profile.id == payload['sub']).first()
+        profile = await db.scalar(select(Profile).where(Profile.id == current_user.id))
 
         if not profile:
             raise HTTPException(
@@ -194,9 +149,9 @@ async def update_profile(profile_update: ProfileUpdate, token: str, db: Session
         if profile_update.bio is not None:
             profile.bio = profile_update.bio
         if profile_update.skills is not None:
-            profile.skills = str(profile_update.skills) if profile_update.skills else None
+            profile.skills = profile_update.skills or None
         if profile_update.interests is not None:
-            profile.interests = str(profile_update.interests) if profile_update.interests else None
+            profile.interests = profile_update.interests or None
         if profile_update.location is not None:
             profile.location = profile_update.location
         if profile_update.phone is not None:
@@ -212,47 +167,26 @@ async def update_profile(profile_update: ProfileUpdate, token: str, db: Session
         if profile_update.company is not None:
             profile.company = profile_update.company
 
-        db.commit()
-        db.refresh(profile)
-
-        return {
-            "id": profile.id,
-            "bio": profile.bio,
-            "skills": profile.skills,
-            "interests": profile.interests,
-            "location": profile.location,
-            "phone": profile.phone,
-            "linkedin_url": profile.linkedin_url,
-            "github_url": profile.github_url,
-            "portfolio_url": profile.portfolio_url,
-            "graduation_year": profile.graduation_year,
-            "company": profile.company,
-            "created_at": profile.created_at.isoformat() if profile.created_at else None,
-            "updated_at": profile.updated_at.isoformat() if profile.updated_at else None
-        }
+        await db.commit()
+        await db.refresh(profile)
+
+        return json_response(profile_serializer.one(profile))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update profile: {str(e)}"
         )
 
 @router.delete("/")
-async def delete_profile(token: str, db: Session = Depends(get_db)):
+async def delete_profile(current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Delete user's profile"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if profile exists
-        profile = db.query(Profile).filter(Profile.id == payload['sub']).first()
+        profile = await db.scalar(select(Profile).where(Profile.id == current_user.id))
 
         if not profile:
             raise HTTPException(
@@ -261,16 +195,46 @@ async def delete_profile(token: str, db: Session = Depends(get_db)):
             )
 
         # Delete profile
-        db.delete(profile)
-        db.commit()
+        await db.delete(profile)
+        await db.commit()
 
         return {"message": "Profile deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete profile: {str(e)}"
         )
+
+@router.get("/search", response_model=List[ProfileResponse])
+async def search_profiles(
+    skill: Optional[str] = None,
+    interest: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find profiles listing a skill and/or interest"""
+    try:
+        query = select(Profile)
+
+        if skill:
+            query = query.where(json_array_contains(Profile.skills, skill))
+
+        if interest:
+            query = query.where(json_array_contains(Profile.interests, interest))
+
+        result = await db.execute(query.order_by(Profile.created_at.desc()).offset(skip).limit(limit))
+        return json_response(profile_serializer.many(result.scalars().all()))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search profiles: {str(e)}"
+        )
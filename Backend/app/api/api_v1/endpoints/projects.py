@@ -4,12 +4,24 @@ Project Aid & Support management endpoints
 
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
-from app.core.database import get_db, Project, ProjectSupport, User, AlumniExpertise
-from app.core.security import verify_token
+from sqlalchemy import select, update, func, desc, and_, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, Project, ProjectSupport, AlumniExpertise, json_array_contains
+from app.core.authorization import TokenClaims, get_token_claims, require_role
+from app.core.pagination import paginate, split_page
+from app.core.conditional import (
+    row_validators,
+    list_validators,
+    is_fresh,
+    not_modified,
+    not_modified_row,
+    count_and_version
+)
+from app.core.fieldsets import select_fields, PAGINATION_COLUMNS
+from app.core.response_cache import response_cache
+from app.core.serialization import ModelSerializer
 
 router = APIRouter()
 
@@ -22,7 +34,7 @@ class ProjectCreate(BaseModel):
     funding_type: str = Field(..., pattern="^(financial|mentorship|technical|resources|networking|all)$")
     timeline: str = Field(..., min_length=1, max_length=255)
     expected_outcomes: str = Field(..., min_length=10, max_length=500)
-    team_members: Optional[str] = None
+    team_members: Optional[List[Dict[str, Any]]] = None
 
 class ProjectResponse(BaseModel):
     id: str
@@ -34,7 +46,7 @@ class ProjectResponse(BaseModel):
     funding_type: str
     timeline: str
     expected_outcomes: str
-    team_members: Optional[str]
+    team_members: Optional[List[Dict[str, Any]]]
     status: str
     created_by: str
     created_at: datetime
@@ -66,13 +78,14 @@ class ProjectSupportResponse(BaseModel):
 class ProjectListResponse(BaseModel):
     projects: List[ProjectResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 class AlumniExpertiseCreate(BaseModel):
     expertise_area: str = Field(..., min_length=1, max_length=255)
     years_experience: Optional[int] = Field(default=0, ge=0)
     current_position: Optional[str] = None
     company: Optional[str] = None
-    skills: Optional[str] = None
+    skills: Optional[List[str]] = None
     availability_status: str = Field(default="available", pattern="^(available|busy|unavailable)$")
 
 class AlumniExpertiseResponse(BaseModel):
@@ -82,7 +95,7 @@ class AlumniExpertiseResponse(BaseModel):
     years_experience: int
     current_position: Optional[str]
     company: Optional[str]
-    skills: Optional[str]
+    skills: Optional[List[str]]
     availability_status: str
     created_at: datetime
     updated_at: datetime
@@ -90,23 +103,19 @@ class AlumniExpertiseResponse(BaseModel):
     class Config:
         from_attributes = True
 
+project_serializer = ModelSerializer.for_schema(ProjectResponse)
+support_serializer = ModelSerializer.for_schema(ProjectSupportResponse)
+expertise_serializer = ModelSerializer.for_schema(AlumniExpertiseResponse)
+
 # Project CRUD endpoints
 @router.post("/projects", response_model=ProjectResponse)
 async def create_project(
     project_data: ProjectCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("student", "Only students can create projects")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new project (Students only)"""
     try:
-        # Verify user is student
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "student":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only students can create projects"
-            )
-
         # Create project
         new_project = Project(
             title=project_data.title,
@@ -121,15 +130,16 @@ async def create_project(
         )
 
         db.add(new_project)
-        db.commit()
-        db.refresh(new_project)
+        await db.commit()
+        await db.refresh(new_project)
+        response_cache.invalidate("projects")
 
         return new_project
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create project: {str(e)}"
@@ -137,31 +147,50 @@ async def create_project(
 
 @router.get("/projects", response_model=ProjectListResponse)
 async def get_projects(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     status: str = "pending",
     funding_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all projects with optional filtering"""
     try:
-        query = db.query(Project).filter(Project.status == status)
+        cached = response_cache.get(request)
+        if cached is not None:
+            return cached
+
+        selection = select_fields(Project, fields, ProjectResponse, also=PAGINATION_COLUMNS)
+        query = select(Project).where(Project.status == status)
 
         if category:
-            query = query.filter(Project.category == category)
+            query = query.where(Project.category == category)
 
         if funding_type:
-            query = query.filter(Project.funding_type == funding_type)
+            query = query.where(Project.funding_type == funding_type)
 
-        total = query.count()
-        projects = query.order_by(desc(Project.created_at)).offset(skip).limit(limit).all()
+        # One aggregate gives the total and the list's version
+        total, version = await count_and_version(db, query)
+        validators = list_validators(request, total, version)
+        if is_fresh(request, validators):
+            return not_modified(validators)
 
-        return ProjectListResponse(
-            projects=projects,
-            total=total
-        )
+        if selection:
+            query = selection.apply(query)
+        result = await db.execute(paginate(query, Project, cursor, skip, limit))
+        projects, next_cursor = split_page(result.scalars().all(), limit)
 
+        return response_cache.put(request, {
+            "projects": (selection or project_serializer).many(projects),
+            "total": total,
+            "next_cursor": next_cursor
+        }, tags=("projects",), headers=validators.headers())
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -171,11 +200,23 @@ async def get_projects(
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific project by ID"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        cached = response_cache.get(request)
+        if cached is not None:
+            return cached
+
+        unchanged = await not_modified_row(request, db, Project, Project.id == project_id)
+        if unchanged:
+            return unchanged
+
+        selection = select_fields(Project, fields, ProjectResponse, also=("updated_at",))
+        query = select(Project).where(Project.id == project_id)
+        project = await db.scalar(selection.apply(query) if selection else query)
 
         if not project:
             raise HTTPException(
@@ -183,7 +224,13 @@ async def get_project(
                 detail="Project not found"
             )
 
-        return project
+        validators = row_validators(request, project.updated_at)
+        return response_cache.put(
+            request,
+            (selection or project_serializer).one(project),
+            tags=(f"project:{project_id}",),
+            headers=validators.headers()
+        )
 
     except HTTPException:
         raise
@@ -197,22 +244,15 @@ async def get_project(
 async def update_project(
     project_id: str,
     project_data: ProjectCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a project (Project owner only)"""
     try:
         # Verify user owns the project
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User not found"
-            )
-
-        project = db.query(Project).filter(
+        project = await db.scalar(select(Project).where(
             and_(Project.id == project_id, Project.created_by == user.id)
-        ).first()
+        ))
 
         if not project:
             raise HTTPException(
@@ -225,15 +265,16 @@ async def update_project(
             if hasattr(project, field):
                 setattr(project, field, value)
 
-        db.commit()
-        db.refresh(project)
+        await db.commit()
+        await db.refresh(project)
+        response_cache.invalidate("projects", f"project:{project_id}")
 
         return project
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update project: {str(e)}"
@@ -242,22 +283,15 @@ async def update_project(
 @router.delete("/projects/{project_id}")
 async def delete_project(
     project_id: str,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a project (Project owner only)"""
     try:
         # Verify user owns the project
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User not found"
-            )
-
-        project = db.query(Project).filter(
+        project = await db.scalar(select(Project).where(
             and_(Project.id == project_id, Project.created_by == user.id)
-        ).first()
+        ))
 
         if not project:
             raise HTTPException(
@@ -265,15 +299,16 @@ async def delete_project(
                 detail="Project not found or access denied"
             )
 
-        db.delete(project)
-        db.commit()
+        await db.delete(project)
+        await db.commit()
+        response_cache.invalidate("projects", f"project:{project_id}", f"project-supporters:{project_id}")
 
         return {"message": "Project deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete project: {str(e)}"
@@ -284,23 +319,15 @@ async def delete_project(
 async def provide_project_support(
     project_id: str,
     support_data: ProjectSupportCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can provide project support")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Provide support for a project (Alumni only)"""
     try:
-        # Verify user is alumni
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can provide project support"
-            )
-
         # Check if project exists and is active
-        project = db.query(Project).filter(
+        project = await db.scalar(select(Project).where(
             and_(Project.id == project_id, Project.status.in_(["pending", "in_progress"]))
-        ).first()
+        ))
 
         if not project:
             raise HTTPException(
@@ -309,12 +336,12 @@ async def provide_project_support(
             )
 
         # Check if alumni already provided support for this project
-        existing_support = db.query(ProjectSupport).filter(
+        existing_support = await db.scalar(select(ProjectSupport).where(
             and_(
                 ProjectSupport.project_id == project_id,
                 ProjectSupport.supporter_id == user.id
             )
-        ).first()
+        ))
 
         if existing_support:
             raise HTTPException(
@@ -331,24 +358,40 @@ async def provide_project_support(
             support_description=support_data.support_description
         )
 
-        # Update project funding if financial support
+        # Add the funding and flip the status once the goal is met in one
+        # statement, so concurrent supporters cannot overwrite each other
         if support_data.support_type == "financial" and support_data.support_amount:
-            project.current_funding += support_data.support_amount
+            new_funding = Project.current_funding + support_data.support_amount
+            funded = await db.scalar(
+                update(Project)
+                .where(and_(Project.id == project_id, Project.status.in_(["pending", "in_progress"])))
+                .values(
+                    current_funding=new_funding,
+                    status=case((new_funding >= Project.funding_goal, "funded"), else_=Project.status)
+                )
+                .returning(Project.current_funding)
+                .execution_options(synchronize_session=False)
+            )
 
-            # Check if project is fully funded
-            if project.current_funding >= project.funding_goal:
-                project.status = "funded"
+            if funded is None:
+                await db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Project not found or not accepting support"
+                )
 
         db.add(new_support)
-        db.commit()
-        db.refresh(new_support)
+        await db.commit()
+        await db.refresh(new_support)
+        # Funding and status may have changed along with the supporter list
+        response_cache.invalidate("projects", f"project:{project_id}", f"project-supporters:{project_id}")
 
         return new_support
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to provide support: {str(e)}"
@@ -357,11 +400,16 @@ async def provide_project_support(
 @router.get("/projects/{project_id}/support")
 async def get_project_supporters(
     project_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all supporters for a project"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        cached = response_cache.get(request)
+        if cached is not None:
+            return cached
+
+        project = await db.scalar(select(Project.id).where(Project.id == project_id))
 
         if not project:
             raise HTTPException(
@@ -369,11 +417,16 @@ async def get_project_supporters(
                 detail="Project not found"
             )
 
-        supporters = db.query(ProjectSupport).filter(
+        result = await db.execute(select(ProjectSupport).where(
             ProjectSupport.project_id == project_id
-        ).all()
+        ))
+        supporters = result.scalars().all()
 
-        return supporters
+        return response_cache.put(
+            request,
+            support_serializer.many(supporters),
+            tags=(f"project-supporters:{project_id}",)
+        )
 
     except HTTPException:
         raise
@@ -385,22 +438,15 @@ async def get_project_supporters(
 
 @router.get("/projects/my-supports")
 async def get_my_project_supports(
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can view their supports")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get projects supported by current user (Alumni only)"""
     try:
-        # Verify user is alumni
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can view their supports"
-            )
-
-        supports = db.query(ProjectSupport).filter(
+        result = await db.execute(select(ProjectSupport).where(
             ProjectSupport.supporter_id == user.id
-        ).all()
+        ))
+        supports = result.scalars().all()
 
         return supports
 
@@ -416,31 +462,24 @@ async def get_my_project_supports(
 @router.post("/alumni/expertise", response_model=AlumniExpertiseResponse)
 async def add_alumni_expertise(
     expertise_data: AlumniExpertiseCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can add expertise")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Add or update alumni expertise (Alumni only)"""
     try:
-        # Verify user is alumni
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can add expertise"
-            )
-
         # Check if expertise already exists
-        existing_expertise = db.query(AlumniExpertise).filter(
+        existing_expertise = await db.scalar(select(AlumniExpertise).where(
             AlumniExpertise.user_id == user.id
-        ).first()
+        ))
 
         if existing_expertise:
             # Update existing
             for field, value in expertise_data.dict().items():
                 if hasattr(existing_expertise, field):
                     setattr(existing_expertise, field, value)
-            db.commit()
-            db.refresh(existing_expertise)
+            await db.commit()
+            await db.refresh(existing_expertise)
+            response_cache.invalidate("alumni-expertise")
             return existing_expertise
         else:
             # Create new
@@ -449,14 +488,15 @@ async def add_alumni_expertise(
                 **expertise_data.dict()
             )
             db.add(new_expertise)
-            db.commit()
-            db.refresh(new_expertise)
+            await db.commit()
+            await db.refresh(new_expertise)
+            response_cache.invalidate("alumni-expertise")
             return new_expertise
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to add expertise: {str(e)}"
@@ -464,28 +504,42 @@ async def add_alumni_expertise(
 
 @router.get("/alumni/expertise")
 async def get_alumni_expertise(
+    request: Request,
     expertise_area: Optional[str] = None,
+    skill: Optional[str] = None,
     availability_status: str = "available",
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get alumni expertise with optional filtering"""
     try:
-        query = db.query(AlumniExpertise).filter(
+        cached = response_cache.get(request)
+        if cached is not None:
+            return cached
+
+        query = select(AlumniExpertise).where(
             AlumniExpertise.availability_status == availability_status
         )
 
         if expertise_area:
-            query = query.filter(AlumniExpertise.expertise_area == expertise_area)
+            query = query.where(AlumniExpertise.expertise_area == expertise_area)
+
+        if skill:
+            query = query.where(json_array_contains(AlumniExpertise.skills, skill))
+
+        total, version = await count_and_version(db, query)
+        validators = list_validators(request, total, version)
+        if is_fresh(request, validators):
+            return not_modified(validators)
 
-        total = query.count()
-        expertise_list = query.offset(skip).limit(limit).all()
+        result = await db.execute(query.offset(skip).limit(limit))
+        expertise_list = result.scalars().all()
 
-        return {
-            "expertise": expertise_list,
+        return response_cache.put(request, {
+            "expertise": expertise_serializer.many(expertise_list),
             "total": total
-        }
+        }, tags=("alumni-expertise",), headers=validators.headers())
 
     except Exception as e:
         raise HTTPException(
@@ -496,13 +550,19 @@ async def get_alumni_expertise(
 @router.get("/alumni/expertise/{expertise_id}", response_model=AlumniExpertiseResponse)
 async def get_alumni_expertise_by_id(
     expertise_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get specific alumni expertise by ID"""
     try:
-        expertise = db.query(AlumniExpertise).filter(
+        unchanged = await not_modified_row(request, db, AlumniExpertise, AlumniExpertise.id == expertise_id)
+        if unchanged:
+            return unchanged
+
+        expertise = await db.scalar(select(AlumniExpertise).where(
             AlumniExpertise.id == expertise_id
-        ).first()
+        ))
 
         if not expertise:
             raise HTTPException(
@@ -510,6 +570,7 @@ async def get_alumni_expertise_by_id(
                 detail="Expertise not found"
             )
 
+        response.headers.update(row_validators(request, expertise.updated_at).headers())
         return expertise
 
     except HTTPException:
@@ -524,22 +585,15 @@ async def get_alumni_expertise_by_id(
 async def update_alumni_expertise(
     expertise_id: str,
     expertise_data: AlumniExpertiseCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can update expertise")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update alumni expertise (Owner only)"""
     try:
         # Verify user owns the expertise
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can update expertise"
-            )
-
-        expertise = db.query(AlumniExpertise).filter(
+        expertise = await db.scalar(select(AlumniExpertise).where(
             and_(AlumniExpertise.id == expertise_id, AlumniExpertise.user_id == user.id)
-        ).first()
+        ))
 
         if not expertise:
             raise HTTPException(
@@ -552,15 +606,16 @@ async def update_alumni_expertise(
             if hasattr(expertise, field):
                 setattr(expertise, field, value)
 
-        db.commit()
-        db.refresh(expertise)
+        await db.commit()
+        await db.refresh(expertise)
+        response_cache.invalidate("alumni-expertise")
 
         return expertise
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update expertise: {str(e)}"
@@ -569,22 +624,15 @@ async def update_alumni_expertise(
 @router.delete("/alumni/expertise/{expertise_id}")
 async def delete_alumni_expertise(
     expertise_id: str,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can delete expertise")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete alumni expertise (Owner only)"""
     try:
         # Verify user owns the expertise
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can delete expertise"
-            )
-
-        expertise = db.query(AlumniExpertise).filter(
+        expertise = await db.scalar(select(AlumniExpertise).where(
             and_(AlumniExpertise.id == expertise_id, AlumniExpertise.user_id == user.id)
-        ).first()
+        ))
 
         if not expertise:
             raise HTTPException(
@@ -592,15 +640,16 @@ async def delete_alumni_expertise(
                 detail="Expertise not found or access denied"
             )
 
-        db.delete(expertise)
-        db.commit()
+        await db.delete(expertise)
+        await db.commit()
+        response_cache.invalidate("alumni-expertise")
 
         return {"message": "Expertise deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete expertise: {str(e)}"
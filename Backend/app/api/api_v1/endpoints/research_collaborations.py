@@ -2,20 +2,39 @@
 Research Collaboration API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select, update, desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import json
 
 from app.core.database import (
     ResearchCollaboration, CollaborationApplication, CollaborationParticipant,
-    ResearchUpdate, User, get_db
+    ResearchUpdate, get_db
 )
-from app.core.security import get_current_user
+from app.core.principal import Principal, get_current_principal
+from app.core.authorization import TokenClaims, require_role
+from app.core.pagination import paginate, split_page
+from app.core.conditional import row_validators, not_modified_row
+from app.core.fieldsets import select_fields, PAGINATION_COLUMNS
+from app.core.serialization import json_response
 
 router = APIRouter()
 
+async def claim_collaborator_slot(db: AsyncSession, collaboration_id: str) -> bool:
+    """Take one collaborator slot if any is left, as a single conditional UPDATE"""
+    claimed = await db.scalar(
+        update(ResearchCollaboration)
+        .where(
+            ResearchCollaboration.id == collaboration_id,
+            ResearchCollaboration.current_collaborators < ResearchCollaboration.max_collaborators
+        )
+        .values(current_collaborators=ResearchCollaboration.current_collaborators + 1)
+        .returning(ResearchCollaboration.current_collaborators)
+        .execution_options(synchronize_session=False)
+    )
+    return claimed is not None
+
 @router.post("/create")
 async def create_research_collaboration(
     title: str,
@@ -29,14 +48,11 @@ async def create_research_collaboration(
     budget: int = 0,
     requirements: str = "",
     deliverables: str = "",
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: TokenClaims = Depends(require_role("alumni", "Only alumni can create research collaborations")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new research collaboration project"""
 
-    if current_user.role != "alumni":
-        raise HTTPException(status_code=403, detail="Only alumni can create research collaborations")
-
     # Validate max_collaborators
     if max_collaborators < 5 or max_collaborators > 10:
         raise HTTPException(status_code=400, detail="Max collaborators must be between 5 and 10")
@@ -57,8 +73,8 @@ async def create_research_collaboration(
     )
 
     db.add(db_collaboration)
-    db.commit()
-    db.refresh(db_collaboration)
+    await db.commit()
+    await db.refresh(db_collaboration)
 
     return {
         "message": "Research collaboration created successfully",
@@ -67,47 +83,68 @@ async def create_research_collaboration(
 
 @router.get("/")
 async def get_research_collaborations(
+    response: Response,
     status: Optional[str] = None,
     research_area: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get research collaborations with optional filters"""
 
-    query = db.query(ResearchCollaboration)
+    selection = select_fields(ResearchCollaboration, fields, also=PAGINATION_COLUMNS)
+    query = select(ResearchCollaboration)
+    if selection:
+        query = selection.apply(query)
 
     # Apply filters
     if status:
-        query = query.filter(ResearchCollaboration.status == status)
+        query = query.where(ResearchCollaboration.status == status)
 
     if research_area:
-        query = query.filter(ResearchCollaboration.research_area.ilike(f"%{research_area}%"))
+        query = query.where(ResearchCollaboration.research_area.ilike(f"%{research_area}%"))
 
-    # Order by creation date (newest first)
-    query = query.order_by(desc(ResearchCollaboration.created_at))
-
-    # Paginate
-    collaborations = query.offset(skip).limit(limit).all()
+    # Newest first; cursor pages seek on (created_at, id), skip falls back to offset
+    result = await db.execute(paginate(query, ResearchCollaboration, cursor, skip, limit))
+    collaborations, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
+    if selection:
+        return json_response(selection.many(collaborations), headers=response.headers)
     return collaborations
 
 @router.get("/{collaboration_id}")
 async def get_research_collaboration(
     collaboration_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific research collaboration"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
-        ResearchCollaboration.id == collaboration_id
-    ).first()
+    unchanged = await not_modified_row(
+        request, db, ResearchCollaboration, ResearchCollaboration.id == collaboration_id
+    )
+    if unchanged:
+        return unchanged
+
+    selection = select_fields(ResearchCollaboration, fields, also=("updated_at",))
+    query = select(ResearchCollaboration).where(ResearchCollaboration.id == collaboration_id)
+    collaboration = await db.scalar(selection.apply(query) if selection else query)
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
 
+    validators = row_validators(request, collaboration.updated_at)
+    if selection:
+        return json_response(selection.one(collaboration), headers=validators.headers())
+    response.headers.update(validators.headers())
     return collaboration
 
 @router.post("/{collaboration_id}/apply")
@@ -118,14 +155,14 @@ async def apply_for_collaboration(
     relevant_skills: str = "",
     availability_hours: int = 10,
     proposed_contribution: str = "",
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Apply for a research collaboration"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
@@ -137,10 +174,10 @@ async def apply_for_collaboration(
         raise HTTPException(status_code=400, detail="Collaboration is full")
 
     # Check if user already applied
-    existing_application = db.query(CollaborationApplication).filter(
+    existing_application = await db.scalar(select(CollaborationApplication).where(
         CollaborationApplication.collaboration_id == collaboration_id,
         CollaborationApplication.applicant_id == current_user.id
-    ).first()
+    ))
 
     if existing_application:
         raise HTTPException(status_code=400, detail="You have already applied for this collaboration")
@@ -157,8 +194,8 @@ async def apply_for_collaboration(
     )
 
     db.add(db_application)
-    db.commit()
-    db.refresh(db_application)
+    await db.commit()
+    await db.refresh(db_application)
 
     return {
         "message": "Application submitted successfully",
@@ -169,14 +206,15 @@ async def apply_for_collaboration(
 async def get_collaboration_applications(
     collaboration_id: str,
     status: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get applications for a research collaboration (lead researcher only)"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
@@ -184,15 +222,21 @@ async def get_collaboration_applications(
     if collaboration.lead_researcher != current_user.id:
         raise HTTPException(status_code=403, detail="Only lead researcher can view applications")
 
-    query = db.query(CollaborationApplication).filter(
+    selection = select_fields(CollaborationApplication, fields)
+    query = select(CollaborationApplication).where(
         CollaborationApplication.collaboration_id == collaboration_id
     )
+    if selection:
+        query = selection.apply(query)
 
     if status:
-        query = query.filter(CollaborationApplication.status == status)
+        query = query.where(CollaborationApplication.status == status)
 
-    applications = query.order_by(desc(CollaborationApplication.created_at)).all()
+    result = await db.execute(query.order_by(desc(CollaborationApplication.created_at)))
+    applications = result.scalars().all()
 
+    if selection:
+        return json_response(selection.many(applications))
     return applications
 
 @router.put("/{collaboration_id}/applications/{application_id}/review")
@@ -201,14 +245,14 @@ async def review_application(
     application_id: str,
     status: str,  # accepted, rejected, under_review
     review_notes: str = "",
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Review a collaboration application"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
@@ -219,10 +263,10 @@ async def review_application(
     if status not in ["accepted", "rejected", "under_review"]:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    application = db.query(CollaborationApplication).filter(
+    application = await db.scalar(select(CollaborationApplication).where(
         CollaborationApplication.id == application_id,
         CollaborationApplication.collaboration_id == collaboration_id
-    ).first()
+    ))
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -235,8 +279,9 @@ async def review_application(
 
     # If accepted, add as participant
     if status == "accepted":
-        # Check if collaboration has space
-        if collaboration.current_collaborators >= collaboration.max_collaborators:
+        # Check for space and take the slot in one statement
+        if not await claim_collaborator_slot(db, collaboration_id):
+            await db.rollback()
             raise HTTPException(status_code=400, detail="Collaboration is full")
 
         # Add as participant
@@ -247,9 +292,8 @@ async def review_application(
         )
 
         db.add(participant)
-        collaboration.current_collaborators += 1
 
-    db.commit()
+    await db.commit()
 
     return {
         "message": f"Application {status} successfully",
@@ -261,14 +305,14 @@ async def add_collaboration_participant(
     collaboration_id: str,
     user_id: str,
     role: str = "researcher",
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Add a participant to research collaboration (lead researcher only)"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
@@ -276,18 +320,19 @@ async def add_collaboration_participant(
     if collaboration.lead_researcher != current_user.id:
         raise HTTPException(status_code=403, detail="Only lead researcher can add participants")
 
-    if collaboration.current_collaborators >= collaboration.max_collaborators:
-        raise HTTPException(status_code=400, detail="Collaboration is full")
-
     # Check if user is already a participant
-    existing_participant = db.query(CollaborationParticipant).filter(
+    existing_participant = await db.scalar(select(CollaborationParticipant).where(
         CollaborationParticipant.collaboration_id == collaboration_id,
         CollaborationParticipant.user_id == user_id
-    ).first()
+    ))
 
     if existing_participant:
         raise HTTPException(status_code=400, detail="User is already a participant")
 
+    # Check for space and take the slot in one statement
+    if not await claim_collaborator_slot(db, collaboration_id):
+        raise HTTPException(status_code=400, detail="Collaboration is full")
+
     # Add participant
     participant = CollaborationParticipant(
         collaboration_id=collaboration_id,
@@ -296,9 +341,8 @@ async def add_collaboration_participant(
     )
 
     db.add(participant)
-    collaboration.current_collaborators += 1
 
-    db.commit()
+    await db.commit()
 
     return {
         "message": "Participant added successfully",
@@ -308,21 +352,22 @@ async def add_collaboration_participant(
 @router.get("/{collaboration_id}/participants")
 async def get_collaboration_participants(
     collaboration_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get participants of a research collaboration"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
 
-    participants = db.query(CollaborationParticipant).filter(
+    result = await db.execute(select(CollaborationParticipant).where(
         CollaborationParticipant.collaboration_id == collaboration_id
-    ).all()
+    ))
+    participants = result.scalars().all()
 
     return participants
 
@@ -333,23 +378,23 @@ async def add_research_update(
     content: str,
     update_type: str = "progress",  # progress, milestone, issue, solution
     is_public: bool = True,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Add a research update"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
 
     # Check if user is a participant or lead researcher
-    is_participant = db.query(CollaborationParticipant).filter(
+    is_participant = await db.scalar(select(CollaborationParticipant).where(
         CollaborationParticipant.collaboration_id == collaboration_id,
         CollaborationParticipant.user_id == current_user.id
-    ).first()
+    ))
 
     if not is_participant and collaboration.lead_researcher != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to add updates")
@@ -367,8 +412,8 @@ async def add_research_update(
     )
 
     db.add(update)
-    db.commit()
-    db.refresh(update)
+    await db.commit()
+    await db.refresh(update)
 
     return {
         "message": "Research update added successfully",
@@ -381,36 +426,37 @@ async def get_research_updates(
     update_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get research updates for a collaboration"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
 
     # Check if user is a participant or lead researcher
-    is_participant = db.query(CollaborationParticipant).filter(
+    is_participant = await db.scalar(select(CollaborationParticipant).where(
         CollaborationParticipant.collaboration_id == collaboration_id,
         CollaborationParticipant.user_id == current_user.id
-    ).first()
+    ))
 
     if not is_participant and collaboration.lead_researcher != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view updates")
 
-    query = db.query(ResearchUpdate).filter(
+    query = select(ResearchUpdate).where(
         ResearchUpdate.collaboration_id == collaboration_id
     )
 
     if update_type:
-        query = query.filter(ResearchUpdate.update_type == update_type)
+        query = query.where(ResearchUpdate.update_type == update_type)
 
     # Order by creation date (newest first)
-    updates = query.order_by(desc(ResearchUpdate.created_at)).offset(skip).limit(limit).all()
+    result = await db.execute(query.order_by(desc(ResearchUpdate.created_at)).offset(skip).limit(limit))
+    updates = result.scalars().all()
 
     return updates
 
@@ -418,14 +464,14 @@ async def get_research_updates(
 async def update_collaboration_status(
     collaboration_id: str,
     status: str,  # open, in_progress, completed, cancelled
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update research collaboration status"""
 
-    collaboration = db.query(ResearchCollaboration).filter(
+    collaboration = await db.scalar(select(ResearchCollaboration).where(
         ResearchCollaboration.id == collaboration_id
-    ).first()
+    ))
 
     if not collaboration:
         raise HTTPException(status_code=404, detail="Research collaboration not found")
@@ -438,7 +484,7 @@ async def update_collaboration_status(
 
     collaboration.status = status
 
-    db.commit()
+    await db.commit()
 
     return {
         "message": f"Collaboration status updated to {status}",
@@ -447,22 +493,22 @@ async def update_collaboration_status(
 
 @router.get("/stats/summary")
 async def get_collaborations_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get research collaborations statistics"""
 
-    total_collaborations = db.query(func.count(ResearchCollaboration.id)).scalar()
-    open_collaborations = db.query(func.count(ResearchCollaboration.id)).filter(
+    total_collaborations = await db.scalar(select(func.count(ResearchCollaboration.id)))
+    open_collaborations = await db.scalar(select(func.count(ResearchCollaboration.id)).where(
         ResearchCollaboration.status == "open"
-    ).scalar()
-    in_progress_collaborations = db.query(func.count(ResearchCollaboration.id)).filter(
+    ))
+    in_progress_collaborations = await db.scalar(select(func.count(ResearchCollaboration.id)).where(
         ResearchCollaboration.status == "in_progress"
-    ).scalar()
-    completed_collaborations = db.query(func.count(ResearchCollaboration.id)).filter(
+    ))
+    completed_collaborations = await db.scalar(select(func.count(ResearchCollaboration.id)).where(
         ResearchCollaboration.status == "completed"
-    ).scalar()
-    total_participants = db.query(func.count(CollaborationParticipant.id)).scalar() or 0
+    ))
+    total_participants = await db.scalar(select(func.count(CollaborationParticipant.id))) or 0
 
     return {
         "total_collaborations": total_collaborations,
@@ -475,19 +521,20 @@ async def get_collaborations_stats(
 @router.get("/areas/popular")
 async def get_popular_research_areas(
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get most popular research areas"""
 
-    popular_areas = db.query(
+    result = await db.execute(select(
         ResearchCollaboration.research_area,
         func.count(ResearchCollaboration.id).label('collaboration_count')
     ).group_by(
         ResearchCollaboration.research_area
     ).order_by(
         desc(func.count(ResearchCollaboration.id))
-    ).limit(limit).all()
+    ).limit(limit))
+    popular_areas = result.all()
 
     return [
         {
@@ -4,12 +4,24 @@ Scholarship management endpoints
 
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
-from app.core.database import get_db, Scholarship, ScholarshipApplication, User
-from app.core.security import verify_token
+from sqlalchemy import select, update, func, desc, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, Scholarship, ScholarshipApplication
+from app.core.authorization import TokenClaims, get_token_claims, require_role
+from app.core.pagination import paginate, split_page
+from app.core.conditional import (
+    row_validators,
+    list_validators,
+    is_fresh,
+    not_modified,
+    not_modified_row,
+    count_and_version
+)
+from app.core.fieldsets import select_fields, PAGINATION_COLUMNS
+from app.core.response_cache import response_cache
+from app.core.serialization import ModelSerializer, json_response
 
 router = APIRouter()
 
@@ -67,24 +79,19 @@ class ScholarshipApplicationResponse(BaseModel):
 class ScholarshipListResponse(BaseModel):
     scholarships: List[ScholarshipResponse]
     total: int
+    next_cursor: Optional[str] = None
+
+scholarship_serializer = ModelSerializer.for_schema(ScholarshipResponse)
 
 # Scholarship CRUD endpoints
 @router.post("/scholarships", response_model=ScholarshipResponse)
 async def create_scholarship(
     scholarship_data: ScholarshipCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can create scholarships")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new scholarship (Alumni only)"""
     try:
-        # Verify user is alumni
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can create scholarships"
-            )
-
         # Create scholarship
         new_scholarship = Scholarship(
             title=scholarship_data.title,
@@ -98,15 +105,16 @@ async def create_scholarship(
         )
 
         db.add(new_scholarship)
-        db.commit()
-        db.refresh(new_scholarship)
+        await db.commit()
+        await db.refresh(new_scholarship)
+        response_cache.invalidate("scholarships")
 
         return new_scholarship
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create scholarship: {str(e)}"
@@ -114,27 +122,46 @@ async def create_scholarship(
 
 @router.get("/scholarships", response_model=ScholarshipListResponse)
 async def get_scholarships(
+    request: Request,
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
     category: Optional[str] = None,
     status: str = "active",
-    db: Session = Depends(get_db)
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all scholarships with optional filtering"""
     try:
-        query = db.query(Scholarship).filter(Scholarship.status == status)
+        cached = response_cache.get(request)
+        if cached is not None:
+            return cached
+
+        selection = select_fields(Scholarship, fields, ScholarshipResponse, also=PAGINATION_COLUMNS)
+        query = select(Scholarship).where(Scholarship.status == status)
 
         if category:
-            query = query.filter(Scholarship.category == category)
+            query = query.where(Scholarship.category == category)
 
-        total = query.count()
-        scholarships = query.offset(skip).limit(limit).all()
+        # One aggregate gives the total and the list's version
+        total, version = await count_and_version(db, query)
+        validators = list_validators(request, total, version)
+        if is_fresh(request, validators):
+            return not_modified(validators)
 
-        return ScholarshipListResponse(
-            scholarships=scholarships,
-            total=total
-        )
+        if selection:
+            query = selection.apply(query)
+        result = await db.execute(paginate(query, Scholarship, cursor, skip, limit))
+        scholarships, next_cursor = split_page(result.scalars().all(), limit)
+
+        return response_cache.put(request, {
+            "scholarships": (selection or scholarship_serializer).many(scholarships),
+            "total": total,
+            "next_cursor": next_cursor
+        }, tags=("scholarships",), headers=validators.headers())
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -144,11 +171,23 @@ async def get_scholarships(
 @router.get("/scholarships/{scholarship_id}", response_model=ScholarshipResponse)
 async def get_scholarship(
     scholarship_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific scholarship by ID"""
     try:
-        scholarship = db.query(Scholarship).filter(Scholarship.id == scholarship_id).first()
+        cached = response_cache.get(request)
+        if cached is not None:
+            return cached
+
+        unchanged = await not_modified_row(request, db, Scholarship, Scholarship.id == scholarship_id)
+        if unchanged:
+            return unchanged
+
+        selection = select_fields(Scholarship, fields, ScholarshipResponse, also=("updated_at",))
+        query = select(Scholarship).where(Scholarship.id == scholarship_id)
+        scholarship = await db.scalar(selection.apply(query) if selection else query)
 
         if not scholarship:
             raise HTTPException(
@@ -156,7 +195,13 @@ async def get_scholarship(
                 detail="Scholarship not found"
             )
 
-        return scholarship
+        validators = row_validators(request, scholarship.updated_at)
+        return response_cache.put(
+            request,
+            (selection or scholarship_serializer).one(scholarship),
+            tags=(f"scholarship:{scholarship_id}",),
+            headers=validators.headers()
+        )
 
     except HTTPException:
         raise
@@ -170,22 +215,15 @@ async def get_scholarship(
 async def update_scholarship(
     scholarship_id: str,
     scholarship_data: ScholarshipCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can update scholarships")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a scholarship (Alumni only)"""
     try:
-        # Verify user is alumni and owns the scholarship
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can update scholarships"
-            )
-
-        scholarship = db.query(Scholarship).filter(
+        # Verify user owns the scholarship
+        scholarship = await db.scalar(select(Scholarship).where(
             and_(Scholarship.id == scholarship_id, Scholarship.created_by == user.id)
-        ).first()
+        ))
 
         if not scholarship:
             raise HTTPException(
@@ -198,15 +236,16 @@ async def update_scholarship(
             if hasattr(scholarship, field):
                 setattr(scholarship, field, value)
 
-        db.commit()
-        db.refresh(scholarship)
+        await db.commit()
+        await db.refresh(scholarship)
+        response_cache.invalidate("scholarships", f"scholarship:{scholarship_id}")
 
         return scholarship
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update scholarship: {str(e)}"
@@ -215,22 +254,15 @@ async def update_scholarship(
 @router.delete("/scholarships/{scholarship_id}")
 async def delete_scholarship(
     scholarship_id: str,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can delete scholarships")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a scholarship (Alumni only)"""
     try:
-        # Verify user is alumni and owns the scholarship
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can delete scholarships"
-            )
-
-        scholarship = db.query(Scholarship).filter(
+        # Verify user owns the scholarship
+        scholarship = await db.scalar(select(Scholarship).where(
             and_(Scholarship.id == scholarship_id, Scholarship.created_by == user.id)
-        ).first()
+        ))
 
         if not scholarship:
             raise HTTPException(
@@ -238,15 +270,16 @@ async def delete_scholarship(
                 detail="Scholarship not found or access denied"
             )
 
-        db.delete(scholarship)
-        db.commit()
+        await db.delete(scholarship)
+        await db.commit()
+        response_cache.invalidate("scholarships", f"scholarship:{scholarship_id}")
 
         return {"message": "Scholarship deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete scholarship: {str(e)}"
@@ -257,23 +290,15 @@ async def delete_scholarship(
 async def apply_for_scholarship(
     scholarship_id: str,
     application_data: ScholarshipApplicationCreate,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("student", "Only students can apply for scholarships")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Apply for a scholarship"""
     try:
-        # Verify user is student
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "student":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only students can apply for scholarships"
-            )
-
         # Check if scholarship exists and is active
-        scholarship = db.query(Scholarship).filter(
+        scholarship = await db.scalar(select(Scholarship).where(
             and_(Scholarship.id == scholarship_id, Scholarship.status == "active")
-        ).first()
+        ))
 
         if not scholarship:
             raise HTTPException(
@@ -288,20 +313,13 @@ async def apply_for_scholarship(
                 detail="Application deadline has passed"
             )
 
-        # Check if maximum applications reached
-        if scholarship.current_applications >= scholarship.max_applications:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Maximum number of applications reached"
-            )
-
         # Check if user already applied
-        existing_application = db.query(ScholarshipApplication).filter(
+        existing_application = await db.scalar(select(ScholarshipApplication).where(
             and_(
                 ScholarshipApplication.scholarship_id == scholarship_id,
                 ScholarshipApplication.applicant_id == user.id
             )
-        ).first()
+        ))
 
         if existing_application:
             raise HTTPException(
@@ -309,6 +327,27 @@ async def apply_for_scholarship(
                 detail="You have already applied for this scholarship"
             )
 
+        # Claim a slot and bump the count in one statement, so concurrent
+        # applicants can never push current_applications past the limit
+        claimed = await db.scalar(
+            update(Scholarship)
+            .where(and_(
+                Scholarship.id == scholarship_id,
+                Scholarship.status == "active",
+                Scholarship.current_applications < Scholarship.max_applications
+            ))
+            .values(current_applications=Scholarship.current_applications + 1)
+            .returning(Scholarship.current_applications)
+            .execution_options(synchronize_session=False)
+        )
+
+        if claimed is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Maximum number of applications reached"
+            )
+
         # Create application
         new_application = ScholarshipApplication(
             scholarship_id=scholarship_id,
@@ -318,19 +357,18 @@ async def apply_for_scholarship(
             financial_need_statement=application_data.financial_need_statement
         )
 
-        # Update scholarship application count
-        scholarship.current_applications += 1
-
         db.add(new_application)
-        db.commit()
-        db.refresh(new_application)
+        await db.commit()
+        await db.refresh(new_application)
+        # current_applications changed
+        response_cache.invalidate("scholarships", f"scholarship:{scholarship_id}")
 
         return new_application
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to submit application: {str(e)}"
@@ -339,22 +377,18 @@ async def apply_for_scholarship(
 @router.get("/scholarships/{scholarship_id}/applications")
 async def get_scholarship_applications(
     scholarship_id: str,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = None,
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can view applications")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all applications for a scholarship (Alumni only)"""
     try:
-        # Verify user is alumni and owns the scholarship
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can view applications"
-            )
+        selection = select_fields(ScholarshipApplication, fields, ScholarshipApplicationResponse)
 
-        scholarship = db.query(Scholarship).filter(
+        # Verify user owns the scholarship
+        scholarship = await db.scalar(select(Scholarship.id).where(
             and_(Scholarship.id == scholarship_id, Scholarship.created_by == user.id)
-        ).first()
+        ))
 
         if not scholarship:
             raise HTTPException(
@@ -362,10 +396,14 @@ async def get_scholarship_applications(
                 detail="Scholarship not found or access denied"
             )
 
-        applications = db.query(ScholarshipApplication).filter(
+        query = select(ScholarshipApplication).where(
             ScholarshipApplication.scholarship_id == scholarship_id
-        ).all()
+        )
+        result = await db.execute(selection.apply(query) if selection else query)
+        applications = result.scalars().all()
 
+        if selection:
+            return json_response(selection.many(applications))
         return applications
 
     except HTTPException:
@@ -381,22 +419,14 @@ async def review_scholarship_application(
     application_id: str,
     status: str,
     review_notes: Optional[str] = None,
-    token: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    user: TokenClaims = Depends(require_role("alumni", "Only alumni can review applications")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Review a scholarship application (Alumni only)"""
     try:
-        # Verify user is alumni
-        user = db.query(User).filter(User.id == token['sub']).first()
-        if not user or user.role != "alumni":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only alumni can review applications"
-            )
-
-        application = db.query(ScholarshipApplication).filter(
+        application = await db.scalar(select(ScholarshipApplication).where(
             ScholarshipApplication.id == application_id
-        ).first()
+        ))
 
         if not application:
             raise HTTPException(
@@ -405,9 +435,9 @@ async def review_scholarship_application(
             )
 
         # Verify alumni owns the scholarship
-        scholarship = db.query(Scholarship).filter(
+        scholarship = await db.scalar(select(Scholarship).where(
             Scholarship.id == application.scholarship_id
-        ).first()
+        ))
 
         if scholarship.created_by != user.id:
             raise HTTPException(
@@ -421,14 +451,14 @@ async def review_scholarship_application(
         application.reviewed_at = datetime.now()
         application.review_notes = review_notes
 
-        db.commit()
+        await db.commit()
 
         return {"message": f"Application {status} successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to review application: {str(e)}"
@@ -2,9 +2,9 @@
 Study Materials API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response
+from sqlalchemy import select, update, desc, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import os
 import shutil
@@ -12,9 +12,14 @@ from datetime import datetime
 
 from app.core.database import (
     StudyMaterial, StudyMaterialDownload, StudyMaterialRating,
-    User, get_db
+    get_db, json_array_contains
 )
-from app.core.security import get_current_user
+from app.core.principal import Principal, get_current_principal
+from app.core.authorization import TokenClaims, require_role
+from app.core.pagination import paginate, split_page
+from app.core.conditional import row_validators, not_modified_row
+from app.core.fieldsets import select_fields, PAGINATION_COLUMNS
+from app.core.serialization import json_response
 
 router = APIRouter()
 
@@ -28,10 +33,10 @@ async def upload_study_material(
     description: str = Form(""),
     subject_code: str = Form(...),
     subject_name: str = Form(...),
-    tags: str = Form(""),
+    tags: str = Form(""),  # comma separated
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload a new study material"""
 
@@ -67,13 +72,13 @@ async def upload_study_material(
         file_type=file_extension,
         file_size=file_size,
         uploaded_by=current_user.id,
-        tags=tags,
+        tags=[tag.strip() for tag in tags.split(",") if tag.strip()] or None,
         is_approved=current_user.role == "alumni"  # Auto-approve if uploaded by alumni
     )
 
     db.add(db_material)
-    db.commit()
-    db.refresh(db_material)
+    await db.commit()
+    await db.refresh(db_material)
 
     return {
         "message": "Study material uploaded successfully",
@@ -83,45 +88,71 @@ async def upload_study_material(
 
 @router.get("/")
 async def get_study_materials(
+    response: Response,
     subject_code: Optional[str] = None,
     subject_name: Optional[str] = None,
+    tag: Optional[str] = None,
     approved_only: bool = True,
     skip: int = 0,
     limit: int = 20,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get study materials with optional filters"""
 
-    query = db.query(StudyMaterial)
+    selection = select_fields(StudyMaterial, fields, also=PAGINATION_COLUMNS)
+    query = select(StudyMaterial)
+    if selection:
+        query = selection.apply(query)
 
     # Apply filters
     if subject_code:
-        query = query.filter(StudyMaterial.subject_code.ilike(f"%{subject_code}%"))
+        query = query.where(StudyMaterial.subject_code.ilike(f"%{subject_code}%"))
 
     if subject_name:
-        query = query.filter(StudyMaterial.subject_name.ilike(f"%{subject_name}%"))
+        query = query.where(StudyMaterial.subject_name.ilike(f"%{subject_name}%"))
 
-    if approved_only:
-        query = query.filter(StudyMaterial.is_approved == True)
+    if tag:
+        query = query.where(json_array_contains(StudyMaterial.tags, tag))
 
-    # Order by creation date (newest first)
-    query = query.order_by(desc(StudyMaterial.created_at))
+    if approved_only:
+        query = query.where(StudyMaterial.is_approved == True)
 
-    # Paginate
-    materials = query.offset(skip).limit(limit).all()
+    # Newest first; cursor pages seek on (created_at, id), skip falls back to offset
+    result = await db.execute(paginate(query, StudyMaterial, cursor, skip, limit))
+    materials, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
+    if selection:
+        return json_response(selection.many(materials), headers=response.headers)
     return materials
 
 @router.get("/{material_id}")
 async def get_study_material(
     material_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific study material"""
 
-    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    # Only answer 304 for materials this user may see
+    unchanged = await not_modified_row(
+        request, db, StudyMaterial,
+        StudyMaterial.id == material_id,
+        or_(StudyMaterial.is_approved == True, StudyMaterial.uploaded_by == current_user.id)
+    )
+    if unchanged:
+        return unchanged
+
+    selection = select_fields(StudyMaterial, fields, also=("is_approved", "uploaded_by", "updated_at"))
+    query = select(StudyMaterial).where(StudyMaterial.id == material_id)
+    material = await db.scalar(selection.apply(query) if selection else query)
 
     if not material:
         raise HTTPException(status_code=404, detail="Study material not found")
@@ -130,17 +161,21 @@ async def get_study_material(
     if not material.is_approved and material.uploaded_by != current_user.id:
         raise HTTPException(status_code=403, detail="Material not yet approved")
 
+    validators = row_validators(request, material.updated_at)
+    if selection:
+        return json_response(selection.one(material), headers=validators.headers())
+    response.headers.update(validators.headers())
     return material
 
 @router.post("/{material_id}/download")
 async def download_study_material(
     material_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Download a study material and track the download"""
 
-    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    material = await db.scalar(select(StudyMaterial).where(StudyMaterial.id == material_id))
 
     if not material:
         raise HTTPException(status_code=404, detail="Study material not found")
@@ -156,15 +191,21 @@ async def download_study_material(
 
     db.add(download_record)
 
-    # Increment download count
-    material.download_count += 1
+    # Increment in SQL so concurrent downloads are all counted
+    download_count = await db.scalar(
+        update(StudyMaterial)
+        .where(StudyMaterial.id == material_id)
+        .values(download_count=StudyMaterial.download_count + 1)
+        .returning(StudyMaterial.download_count)
+        .execution_options(synchronize_session=False)
+    )
 
-    db.commit()
+    await db.commit()
 
     return {
         "message": "Download recorded",
         "file_path": material.file_path,
-        "download_count": material.download_count
+        "download_count": download_count
     }
 
 @router.post("/{material_id}/rate")
@@ -172,15 +213,15 @@ async def rate_study_material(
     material_id: str,
     rating: int,
     review: str = "",
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Rate a study material"""
 
     if rating < 1 or rating > 5:
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
 
-    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    material = await db.scalar(select(StudyMaterial).where(StudyMaterial.id == material_id))
 
     if not material:
         raise HTTPException(status_code=404, detail="Study material not found")
@@ -189,10 +230,10 @@ async def rate_study_material(
         raise HTTPException(status_code=403, detail="Cannot rate unapproved material")
 
     # Check if user already rated this material
-    existing_rating = db.query(StudyMaterialRating).filter(
+    existing_rating = await db.scalar(select(StudyMaterialRating).where(
         StudyMaterialRating.material_id == material_id,
         StudyMaterialRating.user_id == current_user.id
-    ).first()
+    ))
 
     if existing_rating:
         # Update existing rating
@@ -209,22 +250,28 @@ async def rate_study_material(
         )
         db.add(new_rating)
 
-    # Recalculate average rating
-    ratings = db.query(StudyMaterialRating).filter(
-        StudyMaterialRating.material_id == material_id
-    ).all()
-
-    if ratings:
-        avg_rating = sum(r.rating for r in ratings) / len(ratings)
-        material.rating = round(avg_rating, 1)
-        material.rating_count = len(ratings)
+    # Recalculate the average from the ratings table in the same statement
+    # that stores it, instead of loading every rating into Python
+    await db.flush()
+    of_material = StudyMaterialRating.material_id == material_id
+    result = await db.execute(
+        update(StudyMaterial)
+        .where(StudyMaterial.id == material_id)
+        .values(
+            rating=select(func.round(func.avg(StudyMaterialRating.rating))).where(of_material).scalar_subquery(),
+            rating_count=select(func.count(StudyMaterialRating.id)).where(of_material).scalar_subquery()
+        )
+        .returning(StudyMaterial.rating, StudyMaterial.rating_count)
+        .execution_options(synchronize_session=False)
+    )
+    average_rating, total_ratings = result.one()
 
-    db.commit()
+    await db.commit()
 
     return {
         "message": "Rating submitted successfully",
-        "average_rating": material.rating,
-        "total_ratings": material.rating_count
+        "average_rating": average_rating,
+        "total_ratings": total_ratings
     }
 
 @router.get("/{material_id}/ratings")
@@ -232,34 +279,32 @@ async def get_material_ratings(
     material_id: str,
     skip: int = 0,
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get ratings for a study material"""
 
-    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    material = await db.scalar(select(StudyMaterial).where(StudyMaterial.id == material_id))
 
     if not material:
         raise HTTPException(status_code=404, detail="Study material not found")
 
-    ratings = db.query(StudyMaterialRating).filter(
+    result = await db.execute(select(StudyMaterialRating).where(
         StudyMaterialRating.material_id == material_id
-    ).offset(skip).limit(limit).all()
+    ).offset(skip).limit(limit))
+    ratings = result.scalars().all()
 
     return ratings
 
 @router.put("/{material_id}/approve")
 async def approve_study_material(
     material_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: TokenClaims = Depends(require_role("alumni", "Only alumni can approve materials")),
+    db: AsyncSession = Depends(get_db)
 ):
     """Approve a study material (alumni only)"""
 
-    if current_user.role != "alumni":
-        raise HTTPException(status_code=403, detail="Only alumni can approve materials")
-
-    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    material = await db.scalar(select(StudyMaterial).where(StudyMaterial.id == material_id))
 
     if not material:
         raise HTTPException(status_code=404, detail="Study material not found")
@@ -268,19 +313,19 @@ async def approve_study_material(
     material.approved_by = current_user.id
     material.approved_at = func.now()
 
-    db.commit()
+    await db.commit()
 
     return {"message": "Study material approved successfully"}
 
 @router.delete("/{material_id}")
 async def delete_study_material(
     material_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a study material"""
 
-    material = db.query(StudyMaterial).filter(StudyMaterial.id == material_id).first()
+    material = await db.scalar(select(StudyMaterial).where(StudyMaterial.id == material_id))
 
     if not material:
         raise HTTPException(status_code=404, detail="Study material not found")
@@ -297,24 +342,24 @@ async def delete_study_material(
         print(f"Failed to delete file: {e}")
 
     # Delete from database
-    db.delete(material)
-    db.commit()
+    await db.delete(material)
+    await db.commit()
 
     return {"message": "Study material deleted successfully"}
 
 @router.get("/stats/summary")
 async def get_study_materials_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get study materials statistics"""
 
-    total_materials = db.query(func.count(StudyMaterial.id)).scalar()
-    approved_materials = db.query(func.count(StudyMaterial.id)).filter(
+    total_materials = await db.scalar(select(func.count(StudyMaterial.id)))
+    approved_materials = await db.scalar(select(func.count(StudyMaterial.id)).where(
         StudyMaterial.is_approved == True
-    ).scalar()
-    total_downloads = db.query(func.sum(StudyMaterial.download_count)).scalar() or 0
-    avg_rating = db.query(func.avg(StudyMaterial.rating)).scalar() or 0
+    ))
+    total_downloads = await db.scalar(select(func.sum(StudyMaterial.download_count))) or 0
+    avg_rating = await db.scalar(select(func.avg(StudyMaterial.rating))) or 0
 
     return {
         "total_materials": total_materials,
@@ -326,23 +371,24 @@ async def get_study_materials_stats(
 @router.get("/subjects/popular")
 async def get_popular_subjects(
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get most popular subjects based on material count"""
 
-    popular_subjects = db.query(
+    result = await db.execute(select(
         StudyMaterial.subject_code,
         StudyMaterial.subject_name,
         func.count(StudyMaterial.id).label('material_count')
-    ).filter(
+    ).where(
         StudyMaterial.is_approved == True
     ).group_by(
         StudyMaterial.subject_code,
         StudyMaterial.subject_name
     ).order_by(
         desc(func.count(StudyMaterial.id))
-    ).limit(limit).all()
+    ).limit(limit))
+    popular_subjects = result.all()
 
     return [
         {
@@ -3,7 +3,7 @@ File upload API endpoints for document submission
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 import os
@@ -11,8 +11,8 @@ import uuid
 import aiofiles
 from pathlib import Path
 
-from app.core.database import get_db, User
-from app.core.security import get_current_user
+from app.core.database import get_db
+from app.core.principal import Principal, get_current_principal
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -71,8 +71,8 @@ async def upload_file(
     file: UploadFile = File(...),
     file_type: str = Form(..., description="Type of file: resume, transcript, certificate, etc."),
     description: Optional[str] = Form(None, description="Optional description of the file"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload a file (document, image, etc.)"""
     try:
@@ -123,8 +123,8 @@ async def upload_multiple_files(
     files: List[UploadFile] = File(...),
     file_type: str = Form(..., description="Type of files being uploaded"),
     description: Optional[str] = Form(None, description="Optional description"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload multiple files at once"""
     if len(files) > 10:  # Limit to 10 files at once
@@ -173,7 +173,7 @@ async def upload_multiple_files(
 @router.get("/files/{filename}")
 async def get_file_info(
     filename: str,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Get information about an uploaded file"""
     file_path = UPLOAD_DIR / filename
@@ -194,7 +194,7 @@ async def get_file_info(
 @router.delete("/files/{filename}")
 async def delete_file(
     filename: str,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """Delete an uploaded file"""
     file_path = UPLOAD_DIR / filename
@@ -210,7 +210,7 @@ async def delete_file(
 
 @router.get("/files")
 async def list_uploaded_files(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """List all uploaded files for the current user"""
     try:
@@ -5,9 +5,13 @@ User management endpoints
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
-from app.core.database import get_db, User
-from app.core.security import verify_token
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, User, AuthSession
+from app.core.principal import Principal, get_current_principal, principal_cache
+from app.core.pagination import paginate, split_page
+from app.core.fieldsets import select_fields, PAGINATION_COLUMNS
+from app.core.serialization import ModelSerializer, json_response
 
 router = APIRouter()
 
@@ -25,57 +29,20 @@ class UserResponse(BaseModel):
     created_at: str
     updated_at: str
 
+# Also serializes cached Principals, which carry the same attributes
+user_serializer = ModelSerializer.for_schema(UserResponse)
+
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(token: str, db: Session = Depends(get_db)):
+async def get_current_user(current_user: Principal = Depends(get_current_principal)):
     """Get current user information"""
-    try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
-        user = db.query(User).filter(User.id == payload['sub']).first()
-
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Authentication failed: {str(e)}"
-        )
+    return json_response(user_serializer.one(current_user))
 
 @router.put("/me", response_model=UserResponse)
-async def update_current_user(user_update: UserUpdate, token: str, db: Session = Depends(get_db)):
+async def update_current_user(user_update: UserUpdate, current_user: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
     """Update current user information"""
     try:
-        payload = verify_token(token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-
         # Check if user exists
-        user = db.query(User).filter(User.id == payload['sub']).first()
+        user = await db.scalar(select(User).where(User.id == current_user.id))
 
         if not user:
             raise HTTPException(
@@ -89,48 +56,40 @@ async def update_current_user(user_update: UserUpdate, token: str, db: Session =
         if user_update.email is not None:
             user.email = user_update.email
 
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
+        principal_cache.invalidate(user.id)
 
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
+        return json_response(user_serializer.one(user))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Update failed: {str(e)}"
         )
 
 @router.get("/", response_model=List[UserResponse])
-async def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_users(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
     """Get all users (admin endpoint)"""
     try:
-        users = db.query(User).offset(skip).limit(limit).all()
-
-        return [
-            {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "name": user.name,
-                "role": user.role,
-                "is_active": user.is_active,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "updated_at": user.updated_at.isoformat() if user.updated_at else None
-            }
-            for user in users
-        ]
+        selection = select_fields(User, fields, UserResponse, also=PAGINATION_COLUMNS)
+        query = selection.apply(select(User)) if selection else select(User)
+        result = await db.execute(paginate(query, User, cursor, skip, limit))
+        users, next_cursor = split_page(result.scalars().all(), limit)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+
+        return json_response((selection or user_serializer).many(users), headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -138,10 +97,12 @@ async def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
         )
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: str, db: Session = Depends(get_db)):
+async def get_user(user_id: str, fields: Optional[str] = None, db: AsyncSession = Depends(get_db)):
     """Get user by ID"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        selection = select_fields(User, fields, UserResponse)
+        query = select(User).where(User.id == user_id)
+        user = await db.scalar(selection.apply(query) if selection else query)
 
         if not user:
             raise HTTPException(
@@ -149,16 +110,7 @@ async def get_user(user_id: str, db: Session = Depends(get_db)):
                 detail="User not found"
             )
 
-        return {
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role,
-            "is_active": user.is_active,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "updated_at": user.updated_at.isoformat() if user.updated_at else None
-        }
+        return json_response((selection or user_serializer).one(user))
 
     except HTTPException:
         raise
@@ -169,11 +121,11 @@ async def get_user(user_id: str, db: Session = Depends(get_db)):
         )
 
 @router.delete("/{user_id}")
-async def delete_user(user_id: str, db: Session = Depends(get_db)):
+async def delete_user(user_id: str, db: AsyncSession = Depends(get_db)):
     """Delete user by ID (admin endpoint)"""
     try:
         # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).where(User.id == user_id))
 
         if not user:
             raise HTTPException(
@@ -182,15 +134,17 @@ async def delete_user(user_id: str, db: Session = Depends(get_db)):
             )
 
         # Delete user (this will cascade to related tables)
-        db.delete(user)
-        db.commit()
+        await db.execute(delete(AuthSession).where(AuthSession.user_id == user_id))
+        await db.delete(user)
+        await db.commit()
+        principal_cache.revoke(user_id)
 
         return {"message": "User deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete user: {str(e)}"
@@ -0,0 +1,48 @@
+"""
+Authorization for role-gated endpoints
+
+Access tokens carry the user's role, active flag and token_version (see
+security.user_claims). The claims are only trusted while their token_version
+matches the user's current one, which comes from the principal cache or, on a
+miss, the users table. Changing a user's role, is_active or password bumps
+token_version (database.bump_token_version), so outstanding tokens are
+rejected by every worker within PRINCIPAL_CACHE_TTL. Role and status are
+taken from the principal, never from a stale token. The checks themselves
+live in principal.authenticate(), shared with get_current_principal.
+"""
+
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.principal import authenticate
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Caller identity and authorization as stated by a verified token"""
+    id: str
+    username: str
+    email: str
+    role: str
+    is_active: bool
+    token_version: int
+
+async def get_token_claims(token: str, db: AsyncSession = Depends(get_db)) -> TokenClaims:
+    """Resolve the caller and reject tokens whose token_version is no longer current"""
+    principal = await authenticate(token, db)
+    return TokenClaims(
+        id=principal.id,
+        username=principal.username,
+        email=principal.email,
+        role=principal.role,
+        is_active=principal.is_active,
+        token_version=principal.token_version,
+    )
+
+def require_role(role: str, detail: str):
+    """Dependency that only admits callers whose token grants `role`"""
+    async def dependency(claims: TokenClaims = Depends(get_token_claims)) -> TokenClaims:
+        if claims.role != role:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+        return claims
+    return dependency
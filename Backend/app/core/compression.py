@@ -0,0 +1,205 @@
+"""
+Response compression
+
+CompressionMiddleware compresses JSON and other text responses with brotli
+when the client accepts it and the brotli package is installed, otherwise
+with gzip. Some responses are sent as is:
+- bodies under COMPRESSION_MIN_SIZE, where the headers cost more than the
+  compression saves;
+- types that are already compressed (images, PDFs, archives, office files);
+- responses that already carry a Content-Encoding;
+- streamed responses.
+Compressing a large body takes milliseconds of CPU, so bodies of at least
+COMPRESSION_OFFLOAD_SIZE are compressed in a worker thread and the event loop
+keeps serving other requests. Each encoding's ratio and CPU time are
+reported at GET /health/compression (diagnostics access only), as data for
+tuning the thresholds.
+"""
+
+import gzip
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding the client accepts: br, then gzip, else None"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+class CompressionStats:
+    """Bytes and CPU time per encoding, and why responses were left alone"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.encodings: Dict[str, Dict[str, float]] = {}
+            self.skipped: Dict[str, int] = {}
+
+    def record(self, encoding: str, size_in: int, size_out: int, cpu_time: float, offloaded: bool):
+        with self._lock:
+            stats = self.encodings.setdefault(encoding, {
+                "responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_time": 0.0, "max_cpu_time": 0.0, "offloaded": 0,
+            })
+            stats["responses"] += 1
+            stats["bytes_in"] += size_in
+            stats["bytes_out"] += size_out
+            stats["cpu_time"] += cpu_time
+            stats["max_cpu_time"] = max(stats["max_cpu_time"], cpu_time)
+            stats["offloaded"] += int(offloaded)
+
+    def skip(self, reason: str):
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            encodings = {name: dict(stats) for name, stats in self.encodings.items()}
+            skipped = dict(self.skipped)
+        return {
+            "enabled": settings.COMPRESSION_ENABLED,
+            "brotli_available": brotli is not None,
+            "min_size": settings.COMPRESSION_MIN_SIZE,
+            "offload_size": settings.COMPRESSION_OFFLOAD_SIZE,
+            "encodings": {
+                name: {
+                    "responses": stats["responses"],
+                    "bytes_in": stats["bytes_in"],
+                    "bytes_out": stats["bytes_out"],
+                    "ratio": round(stats["bytes_in"] / stats["bytes_out"], 2) if stats["bytes_out"] else None,
+                    "cpu_ms": round(stats["cpu_time"] * 1000, 3),
+                    "avg_cpu_ms": round(stats["cpu_time"] / stats["responses"] * 1000, 3),
+                    "max_cpu_ms": round(stats["max_cpu_time"] * 1000, 3),
+                    "offloaded": stats["offloaded"],
+                }
+                for name, stats in encodings.items()
+            },
+            "skipped": skipped,
+        }
+
+compression_stats = CompressionStats()
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> Tuple[bytes, float]:
+    """Compressed body and the CPU seconds it took on the calling thread"""
+    started = time.thread_time()
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=brotli_quality)
+    else:
+        compressed = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    return compressed, time.thread_time() - started
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses complete, compressible response bodies"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        offload_size: int = 65536,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Dict[str, Any]] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            # First body message: decide once for the whole response
+            passthrough = True
+            headers = MutableHeaders(scope=start_message)
+            if not is_compressible(headers.get("content-type", "")):
+                compression_stats.skip("content_type")
+            else:
+                # The body differs by Accept-Encoding, so shared caches must key on it
+                headers.add_vary_header("Accept-Encoding")
+                body = message.get("body", b"")
+                if "content-encoding" in headers:
+                    compression_stats.skip("already_encoded")
+                elif message.get("more_body", False):
+                    compression_stats.skip("streaming")
+                elif len(body) < self.minimum_size:
+                    compression_stats.skip("small")
+                elif encoding is None:
+                    compression_stats.skip("not_accepted")
+                else:
+                    offloaded = len(body) >= self.offload_size
+                    if offloaded:
+                        compressed, cpu_time = await anyio.to_thread.run_sync(
+                            compress, body, encoding, self.gzip_level, self.brotli_quality
+                        )
+                    else:
+                        compressed, cpu_time = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                    compression_stats.record(encoding, len(body), len(compressed), cpu_time, offloaded)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    etag = headers.get("etag")
+                    if etag and not etag.startswith("W/"):
+                        # Byte-for-byte different from the identity body
+                        headers["ETag"] = f"W/{etag}"
+                    message = {"type": "http.response.body", "body": compressed, "more_body": False}
+
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+        if start_message is not None and not passthrough:
+            # Headers-only response (no body message was sent)
+            await send(start_message)
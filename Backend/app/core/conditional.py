@@ -0,0 +1,106 @@
+"""
+Conditional GET (ETag / Last-Modified)
+
+Every row has an updated_at that changes on each write, so it is used as the
+resource version:
+- A detail response gets a weak ETag over its URL and the row's updated_at,
+  plus a Last-Modified header.
+- A list response gets a weak ETag over its URL and the count and
+  max(updated_at) of the whole filtered set. A new or deleted row changes the
+  count. Lists send no Last-Modified: a deleted row does not move
+  max(updated_at), so If-Modified-Since alone could answer wrongly.
+
+The URL is part of the ETag because fields=, cursor and filters change the
+body. The `token` parameter is left out so the ETag survives token renewal.
+A request carrying If-None-Match (or If-Modified-Since on a detail route) is
+checked first against a metadata query: the primary key and updated_at, or
+the count/max aggregate for lists. On a match it gets a 304 without fetching
+or serializing the rows.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from fastapi import Request, Response, status
+from sqlalchemy import Select, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+def _utc(value: datetime) -> datetime:
+    # Columns are naive UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def _resource_key(request: Request) -> str:
+    query = sorted((k, v) for k, v in request.query_params.multi_items() if k != "token")
+    return f"{request.url.path}?{query}"
+
+def row_validators(request: Request, updated_at: Optional[datetime]) -> Validators:
+    """Validators for one row"""
+    version = updated_at.isoformat() if updated_at else ""
+    digest = hashlib.sha1(f"{_resource_key(request)}|{version}".encode()).hexdigest()[:20]
+    last_modified = _utc(updated_at).replace(microsecond=0) if updated_at else None
+    return Validators(f'W/"{digest}"', last_modified)
+
+def list_validators(request: Request, count: int, max_updated_at: Optional[datetime]) -> Validators:
+    """Validators for a filtered list: its size and newest change"""
+    version = max_updated_at.isoformat() if max_updated_at else ""
+    digest = hashlib.sha1(f"{_resource_key(request)}|{count}|{version}".encode()).hexdigest()[:20]
+    return Validators(f'W/"{digest}"')
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+def is_fresh(request: Request, validators: Validators) -> bool:
+    """True when the client's copy is current (weak comparison, RFC 9110 13.1)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque(validators.etag)
+        return any(_opaque(tag) == current for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            return validators.last_modified <= _utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def not_modified(validators: Validators) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers())
+
+async def not_modified_row(request: Request, db: AsyncSession, model: Any, *criteria) -> Optional[Response]:
+    """304 when a conditional detail request is current, from the row's updated_at alone; None otherwise"""
+    if not is_conditional(request):
+        return None
+    row = (await db.execute(select(model.updated_at).where(*criteria))).first()
+    if row is None:
+        # Missing or not visible: the handler's full path raises the 404/403
+        return None
+    validators = row_validators(request, row.updated_at)
+    return not_modified(validators) if is_fresh(request, validators) else None
+
+async def count_and_version(db: AsyncSession, query: Select) -> Tuple[int, Optional[datetime]]:
+    """COUNT(*) and max(updated_at) of a filtered query in one statement"""
+    subquery = query.subquery()
+    count, max_updated_at = (await db.execute(
+        select(func.count(), func.max(subquery.c.updated_at)).select_from(subquery)
+    )).one()
+    return count, max_updated_at
@@ -12,7 +12,13 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your_super_secret_key_change_in_production")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-    ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))  # idle lifetime of a session
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = int(os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "10"))  # previous token gets 409, not revocation
+    ALGORITHM: str = os.getenv("ALGORITHM", "EdDSA")  # EdDSA or RS256 (key set), HS256 (SECRET_KEY only)
+    JWT_KEYS_DIR: str = os.getenv("JWT_KEYS_DIR", "keys")
+    JWT_KEY_ACTIVATION_DELAY: int = int(os.getenv("JWT_KEY_ACTIVATION_DELAY", "300"))  # seconds a new key is published before signing
+    JWT_KEYS_RELOAD_INTERVAL: int = int(os.getenv("JWT_KEYS_RELOAD_INTERVAL", "60"))  # seconds
+    JWT_ACCEPT_HS256: bool = os.getenv("JWT_ACCEPT_HS256", "True").lower() == "true"  # old HS256 tokens stay valid for one token lifetime after the first key
 
     # Server Settings
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -40,6 +46,72 @@ class Settings(BaseSettings):
 
     # Database Settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+    # Apply pending migrations at startup (single-process dev); production runs `python migrate.py upgrade`
+    AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "False").lower() == "true"
+
+    # Connection Pool Settings (per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+
+    # SQLite Settings (applied to every connection when DATABASE_URL is SQLite)
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "True").lower() == "true"
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))  # negative = KiB
+    SQLITE_BUSY_TIMEOUT: int = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # milliseconds
+    SQLITE_SERIALIZED_WRITES: bool = os.getenv("SQLITE_SERIALIZED_WRITES", "True").lower() == "true"
+
+    # Diagnostic endpoints: open when DEBUG, otherwise only with this token (X-Diagnostics-Token)
+    DIAGNOSTICS_TOKEN: str = os.getenv("DIAGNOSTICS_TOKEN", "")
+
+    # SQL Instrumentation (per-request query counts, see /health/db/queries)
+    SQL_INSTRUMENTATION: bool = os.getenv("SQL_INSTRUMENTATION", "True").lower() == "true"
+    SQL_DEBUG_HEADERS: bool = os.getenv("SQL_DEBUG_HEADERS", os.getenv("DEBUG", "True")).lower() == "true"
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "3"))  # identical statements per request
+
+    # Slow Query Log (see /health/db/slow-queries)
+    SLOW_QUERY_LOG: bool = os.getenv("SLOW_QUERY_LOG", "True").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "True").lower() == "true"
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")  # empty = memory only
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+
+    # Authenticated principal cache (per worker)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))  # 0 disables the cache
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # seconds
+
+    # Verified token claims cache (per worker, entries expire with their token)
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 disables the cache
+
+    # Sign-in rate limits ("hits/seconds", see /health/auth)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory (per process) or redis (shared)
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))  # memory backend only
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "False").lower() == "true"
+    RATE_LIMIT_LOGIN_PER_IP: str = os.getenv("RATE_LIMIT_LOGIN_PER_IP", "30/60")
+    RATE_LIMIT_LOGIN_FAILURES_PER_USERNAME: str = os.getenv("RATE_LIMIT_LOGIN_FAILURES_PER_USERNAME", "10/300")
+    RATE_LIMIT_REGISTER_PER_IP: str = os.getenv("RATE_LIMIT_REGISTER_PER_IP", "20/600")
+
+    # Password hashing pool (per worker, see /health/auth)
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread or process
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))  # running + queued
+
+    # Public catalog response cache (per worker, see /health/cache)
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))  # entries; 0 disables the cache
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "30"))  # seconds
+
+    # Response compression (brotli needs the brotli package, see /health/compression)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "True").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes; smaller bodies are sent as is
+    COMPRESSION_OFFLOAD_SIZE: int = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "65536"))  # bytes; compressed in a worker thread
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))  # 0-11
 
     class Config:
         case_sensitive = True
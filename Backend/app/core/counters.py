@@ -0,0 +1,166 @@
+"""
+Reconciliation of denormalized counters
+
+Several parent rows carry aggregates of their child rows so list pages do not
+have to count children on every read. Handlers keep them current with single
+conditional UPDATEs. Failed requests, manual fixes or imports can still leave
+them drifted. reconcile() walks each parent table in primary-key chunks. For
+each chunk it recomputes the aggregates with one GROUP BY query over the child
+table and rewrites only the rows that differ. Every chunk is its own short
+transaction, so the job can run while the app is serving traffic.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import select, update, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.database import (
+    Scholarship, ScholarshipApplication, Project, ProjectSupport, StudyMaterial,
+    StudyMaterialDownload, StudyMaterialRating, ResearchCollaboration, CollaborationParticipant
+)
+
+@dataclass
+class DenormalizedCounter:
+    column: InstrumentedAttribute
+    child_key: InstrumentedAttribute
+    aggregate: Callable[[], ColumnElement]
+    where: Optional[Callable[[], ColumnElement]] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.column.class_.__tablename__}.{self.column.key}"
+
+    def _query(self, *columns):
+        query = select(*columns)
+        if self.where is not None:
+            query = query.where(self.where())
+        return query
+
+    def grouped(self, parent_ids: List[str]):
+        """Child aggregates for a chunk of parents, one row per parent with children"""
+        return (
+            self._query(self.child_key.label("parent_id"), self.aggregate().label("value"))
+            .where(self.child_key.in_(parent_ids))
+            .group_by(self.child_key)
+            .subquery()
+        )
+
+    def correlated(self):
+        """Child aggregate for the parent row being updated, 0 when it has none"""
+        parent_id = self.column.class_.id
+        return self._query(func.coalesce(self.aggregate(), 0)).where(self.child_key == parent_id).scalar_subquery()
+
+# Keep these definitions in step with the handlers that maintain the counters
+COUNTERS = [
+    DenormalizedCounter(
+        Scholarship.current_applications, ScholarshipApplication.scholarship_id,
+        lambda: func.count(ScholarshipApplication.id),
+    ),
+    DenormalizedCounter(
+        Project.current_funding, ProjectSupport.project_id,
+        lambda: func.sum(ProjectSupport.support_amount),
+        where=lambda: ProjectSupport.support_type == "financial",
+    ),
+    DenormalizedCounter(
+        StudyMaterial.download_count, StudyMaterialDownload.material_id,
+        lambda: func.count(StudyMaterialDownload.id),
+    ),
+    DenormalizedCounter(
+        StudyMaterial.rating, StudyMaterialRating.material_id,
+        lambda: func.round(func.avg(StudyMaterialRating.rating)),
+    ),
+    DenormalizedCounter(
+        StudyMaterial.rating_count, StudyMaterialRating.material_id,
+        lambda: func.count(StudyMaterialRating.id),
+    ),
+    DenormalizedCounter(
+        ResearchCollaboration.current_collaborators, CollaborationParticipant.collaboration_id,
+        lambda: func.count(CollaborationParticipant.id),
+    ),
+]
+
+@dataclass
+class DriftReport:
+    counter: str
+    scanned: int = 0
+    drifted: int = 0
+    repaired: int = 0
+    total_drift: float = 0
+    max_drift: float = 0
+    elapsed: float = 0
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "counter": self.counter,
+            "scanned": self.scanned,
+            "drifted": self.drifted,
+            "repaired": self.repaired,
+            "total_drift": self.total_drift,
+            "max_drift": self.max_drift,
+            "elapsed_s": round(self.elapsed, 3),
+            "samples": self.samples,
+        }
+
+def reconcile_counter(db_engine: Engine, counter: DenormalizedCounter, chunk_size: int = 1000,
+                      repair: bool = True, pause: float = 0.0, max_samples: int = 10) -> DriftReport:
+    """Compare one counter with its child rows chunk by chunk and fix the rows that differ"""
+    model = counter.column.class_
+    report = DriftReport(counter.name)
+    started = time.perf_counter()
+    last_id = None
+
+    while True:
+        with db_engine.begin() as conn:
+            ids_query = select(model.id).order_by(model.id).limit(chunk_size)
+            if last_id is not None:
+                ids_query = ids_query.where(model.id > last_id)
+            parent_ids = conn.scalars(ids_query).all()
+            if not parent_ids:
+                break
+
+            grouped = counter.grouped(parent_ids)
+            rows = conn.execute(
+                select(model.id, counter.column, func.coalesce(grouped.c.value, 0))
+                .outerjoin(grouped, grouped.c.parent_id == model.id)
+                .where(model.id.in_(parent_ids))
+            ).all()
+
+            drifted = []
+            for parent_id, stored, expected in rows:
+                if stored is not None and stored == expected:
+                    continue
+                drift = abs(float(expected) - float(stored or 0))
+                drifted.append(parent_id)
+                report.total_drift += drift
+                report.max_drift = max(report.max_drift, drift)
+                if len(report.samples) < max_samples:
+                    report.samples.append({"id": parent_id, "stored": stored, "expected": float(expected)})
+
+            if drifted and repair:
+                # Recompute at write time so increments committed since the
+                # read above are not overwritten with a stale value
+                result = conn.execute(
+                    update(model)
+                    .where(model.id.in_(drifted))
+                    .values({counter.column.key: counter.correlated()})
+                )
+                report.repaired += result.rowcount
+
+        report.scanned += len(parent_ids)
+        report.drifted += len(drifted)
+        last_id = parent_ids[-1]
+        if pause:
+            time.sleep(pause)
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+def reconcile(db_engine: Engine, names: Optional[List[str]] = None, chunk_size: int = 1000,
+              repair: bool = True, pause: float = 0.0) -> List[DriftReport]:
+    """Reconcile every registered counter, or only the ones named table.column"""
+    counters = [c for c in COUNTERS if not names or c.name in names]
+    return [reconcile_counter(db_engine, c, chunk_size, repair, pause) for c in counters]
@@ -2,12 +2,23 @@
 Database configuration and initialization using PostgreSQL
 """
 
+import json
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, func
+import threading
+import time
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, JSON, func, text, literal
+from sqlalchemy import exc as sa_exc, event, inspect as sa_inspect, Insert, Update, Delete
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import functions, expression
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
-from typing import Generator
+from app.core.query_stats import instrument_engine
+from app.core import slow_queries
+from typing import AsyncGenerator, Dict, Any
 import uuid
 
 # Database setup - SQLite for development, PostgreSQL for production
@@ -20,19 +31,229 @@ DATABASE_URL = os.getenv(
 if os.getenv("DATABASE_URL") and "postgresql" in os.getenv("DATABASE_URL"):
     DATABASE_URL = os.getenv("DATABASE_URL")
 
+def get_pool_options(url: str) -> Dict[str, Any]:
+    """Pool tuning from settings; in-memory SQLite keeps its single-connection pool"""
+    if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+class PoolMetrics:
+    """Counters for connection acquisition on the request pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.acquisitions = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record_acquire(self, wait: float):
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.acquisitions * 1000, 3) if self.acquisitions else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long callers wait for a connection"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except sa_exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_acquire(time.perf_counter() - start)
+        return connection
+
 engine = create_engine(
     DATABASE_URL,
     connect_args={
         "check_same_thread": False
-    } if "sqlite" in DATABASE_URL else {}
+    } if "sqlite" in DATABASE_URL else {},
+    **get_pool_options(DATABASE_URL)
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Production pragmas for every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+    cursor.close()
+
+if IS_SQLITE:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+@compiles(functions.now, "sqlite")
+def sqlite_now(element, compiler, **kw):
+    """Render now() on SQLite in the same text format SQLAlchemy binds datetimes with
+
+    CURRENT_TIMESTAMP stores 'YYYY-MM-DD HH:MM:SS', which sorts before the
+    '.000000' suffixed value of an equal bound datetime, so (created_at, id)
+    cursor comparisons would repeat the boundary row. Rows written before this
+    are rewritten by the "normalize sqlite timestamps" migration.
+    """
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (aiosqlite/asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgres:"):
+        return url.replace("postgres:", "postgresql+asyncpg:", 1)
+    return url
+
+# Async engine used by the API request handlers; the sync engine above is kept
+# for scripts (init_db.py, test_system.py) and table creation
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+_async_pool_options = get_pool_options(ASYNC_DATABASE_URL)
+if _async_pool_options:
+    _async_pool_options["poolclass"] = InstrumentedAsyncPool
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_pool_options)
+
+# SQLite allows one writer at a time. Writes are routed to a dedicated engine
+# holding a single connection, so concurrent writers queue on its pool instead
+# of failing with "database is locked", while reads spread over the main pool.
+sqlite_writer_engine = None
+
+if IS_SQLITE:
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    if settings.SQLITE_SERIALIZED_WRITES and _async_pool_options:
+        sqlite_writer_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        event.listen(sqlite_writer_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+if settings.SQL_INSTRUMENTATION:
+    instrument_engine(async_engine.sync_engine)
+    if sqlite_writer_engine is not None:
+        instrument_engine(sqlite_writer_engine.sync_engine)
+
+if settings.SLOW_QUERY_LOG:
+    for _engine in (engine, async_engine.sync_engine, sqlite_writer_engine and sqlite_writer_engine.sync_engine):
+        if _engine is not None:
+            slow_queries.instrument_engine(_engine)
+
+class RoutingSession(Session):
+    """Send flushes and DML to the SQLite writer engine, everything else to the pool
+
+    Once a transaction has written, every later statement in it goes to the
+    writer too, so its reads see its own uncommitted rows. Routing returns to
+    the pool when the transaction ends. The writer connection is held from
+    the first write until commit or rollback, and other writers queue behind
+    it, so handlers do slow work (password hashing, file I/O) before their
+    first write and commit right after their last.
+    """
+
+    _writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if sqlite_writer_engine is not None and (
+            self._writing or self._flushing or isinstance(clause, (Insert, Update, Delete))
+        ):
+            self._writing = True
+            return sqlite_writer_engine.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _end_writer_routing(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 Base = declarative_base()
 
+# JSON documents: JSONB on Postgres so GIN indexes can serve containment
+# queries, JSON text elsewhere. Python None is stored as SQL NULL.
+JSONType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+class json_array_contains(expression.FunctionElement):
+    """True when a JSON array column contains the given scalar value
+
+    Compiles to `column @> '["value"]'` on Postgres, which a GIN index on the
+    column serves, and to a json_each() lookup elsewhere.
+    """
+    type = Boolean()
+    inherit_cache = True
+    name = "json_array_contains"
+
+    def __init__(self, column, value):
+        super().__init__(column, literal(value), literal(json.dumps([value])))
+
+@compiles(json_array_contains)
+def _json_array_contains_default(element, compiler, **kw):
+    column, value, _ = element.clauses
+    return (
+        f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) "
+        f"WHERE json_each.value = {compiler.process(value, **kw)})"
+    )
+
+@compiles(json_array_contains, "postgresql")
+def _json_array_contains_postgresql(element, compiler, **kw):
+    column, _, document = element.clauses
+    return f"{compiler.process(column, **kw)} @> CAST({compiler.process(document, **kw)} AS JSONB)"
+
+def gin_index(name: str, column: str) -> Index:
+    """GIN index over a JSONB column, created on Postgres only"""
+    return Index(name, column, postgresql_using="gin").ddl_if(dialect="postgresql")
+
 # Database Models
 class User(Base):
     __tablename__ = "users"
 
+    __table_args__ = (
+        Index("ix_users_created_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     username = Column(String(255), unique=True, nullable=False)
     email = Column(String(255), unique=True, nullable=False)
@@ -40,16 +261,76 @@ class User(Base):
     name = Column(String(255), nullable=False)
     role = Column(String(50), default="student")  # student or alumni
     is_active = Column(Boolean, default=True)
+    # Bumped by bump_token_version() below; tokens carrying an older value are rejected
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+# Changing any of these must revoke the user's outstanding access tokens
+TOKEN_VERSIONED_COLUMNS = ("role", "is_active", "password_hash")
+
+@event.listens_for(Session, "before_flush")
+def bump_token_version(session, flush_context, instances):
+    """Increment token_version of every user whose role, active flag or password changed
+
+    Runs for every ORM flush, so no handler can forget it. Bulk update()
+    statements bypass the ORM and must set token_version themselves.
+    """
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            attrs = sa_inspect(obj).attrs
+            if any(attrs[name].history.has_changes() for name in TOKEN_VERSIONED_COLUMNS):
+                obj.token_version = (obj.token_version or 0) + 1
+
+class AuthSession(Base):
+    """Refresh-token session; only hashes of the current and previous refresh secrets are stored"""
+    __tablename__ = "auth_sessions"
+
+    __table_args__ = (
+        Index("ix_auth_sessions_user", "user_id"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    token_hash = Column(String(64), nullable=False)  # sha256 of the current refresh secret
+    previous_token_hash = Column(String(64))  # sha256 of the secret it replaced, to authenticate replays
+    generation = Column(Integer, nullable=False, default=0)  # incremented on every rotation
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime)
+    created_at = Column(DateTime, default=func.now())
+    last_used_at = Column(DateTime, default=func.now())
+
+@event.listens_for(Session, "before_flush")
+def revoke_sessions_on_password_change(session, flush_context, instances):
+    """Revoke the refresh-token sessions of every user whose password changed
+
+    The UPDATE runs on the flush's own connection, so it commits or rolls back
+    with the new password. As with token_version, bulk update() statements
+    bypass this hook.
+    """
+    user_ids = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, User) and sa_inspect(obj).attrs["password_hash"].history.has_changes()
+    ]
+    if user_ids:
+        session.connection().execute(
+            AuthSession.__table__.update()
+            .where(AuthSession.user_id.in_(user_ids), AuthSession.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+
 class Profile(Base):
     __tablename__ = "profiles"
 
+    __table_args__ = (
+        gin_index("ix_profiles_skills_gin", "skills"),
+        gin_index("ix_profiles_interests_gin", "interests"),
+    )
+
     id = Column(String, ForeignKey("users.id"), primary_key=True)
     bio = Column(Text)
-    skills = Column(Text)  # JSON string
-    interests = Column(Text)  # JSON string
+    skills = Column(JSONType)  # list of strings
+    interests = Column(JSONType)  # list of strings
     location = Column(String(255))
     phone = Column(String(50))
     linkedin_url = Column(Text)
@@ -63,6 +344,10 @@ class Profile(Base):
 class Application(Base):
     __tablename__ = "applications"
 
+    __table_args__ = (
+        Index("ix_applications_user_status", "user_id", "status"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     company = Column(String(255), nullable=False)
@@ -77,6 +362,11 @@ class Application(Base):
 class Mentorship(Base):
     __tablename__ = "mentorships"
 
+    __table_args__ = (
+        Index("ix_mentorships_mentor_status", "mentor_id", "status"),
+        Index("ix_mentorships_mentee_status", "mentee_id", "status"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     mentor_id = Column(String, ForeignKey("users.id"), nullable=False)
     mentee_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -87,6 +377,12 @@ class Mentorship(Base):
 class Scholarship(Base):
     __tablename__ = "scholarships"
 
+    __table_args__ = (
+        Index("ix_scholarships_status_category", "status", "category"),
+        Index("ix_scholarships_created_by", "created_by"),
+        Index("ix_scholarships_status_created_id", "status", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
@@ -104,6 +400,11 @@ class Scholarship(Base):
 class ScholarshipApplication(Base):
     __tablename__ = "scholarship_applications"
 
+    __table_args__ = (
+        Index("ix_scholarship_applications_scholarship_applicant", "scholarship_id", "applicant_id"),
+        Index("ix_scholarship_applications_applicant", "applicant_id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     scholarship_id = Column(String, ForeignKey("scholarships.id"), nullable=False)
     applicant_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -120,6 +421,12 @@ class ScholarshipApplication(Base):
 class Project(Base):
     __tablename__ = "projects"
 
+    __table_args__ = (
+        Index("ix_projects_status_created_id", "status", "created_at", "id"),
+        Index("ix_projects_created_by", "created_by"),
+        gin_index("ix_projects_team_members_gin", "team_members"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
@@ -129,7 +436,7 @@ class Project(Base):
     funding_type = Column(String(100), nullable=False)  # financial, mentorship, technical, resources, networking
     timeline = Column(String(255), nullable=False)  # Project duration
     expected_outcomes = Column(Text, nullable=False)
-    team_members = Column(Text)  # JSON string of team member details
+    team_members = Column(JSONType)  # list of team member objects
     status = Column(String(50), default="pending")  # pending, funded, in_progress, completed, rejected
     created_by = Column(String, ForeignKey("users.id"), nullable=False)  # Student who created it
     created_at = Column(DateTime, default=func.now())
@@ -138,6 +445,11 @@ class Project(Base):
 class ProjectSupport(Base):
     __tablename__ = "project_supports"
 
+    __table_args__ = (
+        Index("ix_project_supports_project_supporter", "project_id", "supporter_id"),
+        Index("ix_project_supports_supporter", "supporter_id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     project_id = Column(String, ForeignKey("projects.id"), nullable=False)
     supporter_id = Column(String, ForeignKey("users.id"), nullable=False)  # Alumni providing support
@@ -151,13 +463,19 @@ class ProjectSupport(Base):
 class AlumniExpertise(Base):
     __tablename__ = "alumni_expertise"
 
+    __table_args__ = (
+        Index("ix_alumni_expertise_availability_area", "availability_status", "expertise_area"),
+        Index("ix_alumni_expertise_user", "user_id"),
+        gin_index("ix_alumni_expertise_skills_gin", "skills"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     expertise_area = Column(String(255), nullable=False)
     years_experience = Column(Integer, default=0)
     current_position = Column(String(255))
     company = Column(String(255))
-    skills = Column(Text)  # JSON string of skills
+    skills = Column(JSONType)  # list of strings
     availability_status = Column(String(50), default="available")  # available, busy, unavailable
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -165,6 +483,19 @@ class AlumniExpertise(Base):
 class Notification(Base):
     __tablename__ = "notifications"
 
+    __table_args__ = (
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_type", "user_id", "type"),
+        # Partial index for the unread feed and badge counts
+        Index(
+            "ix_notifications_user_unread_created_id",
+            "user_id", "created_at", "id",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0"),
+        ),
+        gin_index("ix_notifications_data_gin", "data"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
@@ -172,7 +503,7 @@ class Notification(Base):
     type = Column(String(100), nullable=False)  # scholarship, project, mentorship, system
     priority = Column(String(50), default="normal")  # low, normal, high, urgent
     is_read = Column(Boolean, default=False)
-    data = Column(Text)  # JSON string for additional data
+    data = Column(JSONType)  # additional data object
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
@@ -181,6 +512,13 @@ class Notification(Base):
 class StudyMaterial(Base):
     __tablename__ = "study_materials"
 
+    __table_args__ = (
+        Index("ix_study_materials_approved_created_id", "is_approved", "created_at", "id"),
+        Index("ix_study_materials_approved_subject", "is_approved", "subject_code", "subject_name"),
+        Index("ix_study_materials_uploaded_by", "uploaded_by"),
+        gin_index("ix_study_materials_tags_gin", "tags"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
     description = Column(Text)
@@ -196,13 +534,17 @@ class StudyMaterial(Base):
     download_count = Column(Integer, default=0)
     rating = Column(Integer, default=0)  # Average rating 1-5
     rating_count = Column(Integer, default=0)
-    tags = Column(Text)  # JSON string of tags
+    tags = Column(JSONType)  # list of strings
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 class StudyMaterialDownload(Base):
     __tablename__ = "study_material_downloads"
 
+    __table_args__ = (
+        Index("ix_study_material_downloads_material", "material_id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     material_id = Column(String, ForeignKey("study_materials.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -211,6 +553,10 @@ class StudyMaterialDownload(Base):
 class StudyMaterialRating(Base):
     __tablename__ = "study_material_ratings"
 
+    __table_args__ = (
+        Index("ix_study_material_ratings_material_user", "material_id", "user_id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     material_id = Column(String, ForeignKey("study_materials.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -222,6 +568,11 @@ class StudyMaterialRating(Base):
 class ResearchCollaboration(Base):
     __tablename__ = "research_collaborations"
 
+    __table_args__ = (
+        Index("ix_research_collaborations_status_created_id", "status", "created_at", "id"),
+        Index("ix_research_collaborations_created_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
@@ -243,6 +594,11 @@ class ResearchCollaboration(Base):
 class CollaborationApplication(Base):
     __tablename__ = "collaboration_applications"
 
+    __table_args__ = (
+        Index("ix_collaboration_applications_collab_applicant", "collaboration_id", "applicant_id"),
+        Index("ix_collaboration_applications_collab_created", "collaboration_id", "created_at"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     collaboration_id = Column(String, ForeignKey("research_collaborations.id"), nullable=False)
     applicant_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -261,6 +617,10 @@ class CollaborationApplication(Base):
 class CollaborationParticipant(Base):
     __tablename__ = "collaboration_participants"
 
+    __table_args__ = (
+        Index("ix_collaboration_participants_collab_user", "collaboration_id", "user_id"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     collaboration_id = Column(String, ForeignKey("research_collaborations.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -274,6 +634,10 @@ class CollaborationParticipant(Base):
 class ResearchUpdate(Base):
     __tablename__ = "research_updates"
 
+    __table_args__ = (
+        Index("ix_research_updates_collab_created", "collaboration_id", "created_at"),
+    )
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     collaboration_id = Column(String, ForeignKey("research_collaborations.id"), nullable=False)
     author_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -284,23 +648,44 @@ class ResearchUpdate(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
-def get_db() -> Generator[Session, None, None]:
-    """Get database session"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session for a request"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 def create_db_and_tables():
-    """Initialize database and create tables if needed"""
-    try:
-        # Create tables
-        Base.metadata.create_all(bind=engine)
-        print("Database and tables created successfully")
-    except Exception as e:
-        print(f"Database initialization failed: {e}")
+    """Initialize database by applying any pending schema migrations; failures propagate"""
+    from app.core.migrations import upgrade
+    upgrade(engine)
+    print("Database and tables created successfully")
 
 def get_database_session() -> Session:
     """Get database session instance"""
     return SessionLocal()
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Live state of the request connection pool plus acquisition metrics"""
+    pool = async_engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "timeout": settings.DB_POOL_TIMEOUT,
+        })
+    stats.update(pool_metrics.snapshot())
+    if sqlite_writer_engine is not None:
+        stats["sqlite_writer"] = {
+            "checked_out": sqlite_writer_engine.pool.checkedout(),
+        }
+    return stats
+
+async def dispose_engines():
+    """Close pooled connections on shutdown"""
+    await async_engine.dispose()
+    if sqlite_writer_engine is not None:
+        await sqlite_writer_engine.dispose()
+    engine.dispose()
@@ -0,0 +1,26 @@
+"""
+Access control for diagnostic endpoints
+
+Endpoints such as /health/db/queries expose per-route SQL statistics, raw
+statements, query plans and cache internals, and can clear their counters.
+They are open while DEBUG is on. Otherwise a request must send the
+DIAGNOSTICS_TOKEN secret in the X-Diagnostics-Token header. With no token
+configured they answer 404, as if they did not exist. Counters are cleared
+with POST to the endpoint's /reset path, never through a GET.
+"""
+
+import hmac
+from typing import Optional
+from fastapi import Header, HTTPException, status
+from app.core.config import settings
+
+async def require_diagnostics_access(x_diagnostics_token: Optional[str] = Header(default=None)):
+    """Dependency admitting DEBUG deployments or callers holding DIAGNOSTICS_TOKEN"""
+    if settings.DEBUG:
+        return
+    if not settings.DIAGNOSTICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_diagnostics_token or not hmac.compare_digest(
+        x_diagnostics_token.encode(), settings.DIAGNOSTICS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Diagnostics access denied")
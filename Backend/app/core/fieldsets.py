@@ -0,0 +1,73 @@
+"""
+Sparse fieldsets
+
+List and detail endpoints accept `fields=title,status`. The names are checked
+against the model's columns (and the route's response schema, where it has
+one), and the query loads only those columns with load_only(). Large Text
+columns the client did not ask for, such as descriptions or personal
+statements, are therefore never read from the database. The response holds
+`id` plus the requested fields and is serialized directly, because a partial
+object would not pass the route's response_model.
+
+Handlers name the extra columns they read themselves (`also=`): the pagination
+key, or the owner and approval columns used in permission checks. Those are
+loaded but not returned unless requested.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Select, inspect as sa_inspect
+from sqlalchemy.orm import load_only
+from app.core.serialization import ModelSerializer
+
+# Paginated lists also need the sort key of the last row for the next cursor
+PAGINATION_COLUMNS = ("created_at",)
+
+@lru_cache(maxsize=256)
+def _serializer(fields: Tuple[str, ...]) -> ModelSerializer:
+    return ModelSerializer(fields)
+
+class FieldSelection:
+    """The columns one request asked for"""
+
+    def __init__(self, model: Any, fields: Tuple[str, ...], load: Tuple[str, ...]):
+        self.model = model
+        self.fields = fields
+        self.load = load
+        self.serializer = _serializer(fields)
+
+    def apply(self, query: Select) -> Select:
+        """Load only the selected columns of the model"""
+        return query.options(load_only(*(getattr(self.model, name) for name in self.load)))
+
+    def one(self, obj: Any):
+        return self.serializer.one(obj)
+
+    def many(self, objs: Iterable[Any]):
+        return self.serializer.many(objs)
+
+def select_fields(
+    model: Any,
+    fields: Optional[str],
+    schema: Optional[Type[BaseModel]] = None,
+    also: Iterable[str] = (),
+) -> Optional[FieldSelection]:
+    """Parse a `fields=` parameter; None when the client wants whole rows"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    available = [column.key for column in sa_inspect(model).column_attrs]
+    if schema is not None:
+        # Never expose columns the full response leaves out (e.g. password hashes)
+        available = [name for name in available if name in schema.model_fields]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    selected = tuple(dict.fromkeys(["id", *names]))
+    load = tuple(dict.fromkeys([*selected, *also]))
+    return FieldSelection(model, selected, load)
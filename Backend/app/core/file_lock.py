@@ -0,0 +1,28 @@
+"""
+Cross-process exclusive file lock
+
+Used where several workers start at once and exactly one of them may act:
+applying migrations to a SQLite database, or creating the first signing key.
+The lock is released when the file is closed, including when the process
+dies, so a crashed worker never leaves it held.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+@contextmanager
+def exclusive_file_lock(path: str) -> Iterator[None]:
+    """Block until this process holds the lock on `path`, creating the file if needed"""
+    handle = open(path, "a+")
+    try:
+        try:
+            import fcntl
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        except ImportError:  # Windows
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        # Closing the file releases the lock
+        handle.close()
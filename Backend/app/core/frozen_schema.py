@@ -0,0 +1,307 @@
+"""
+Frozen table definitions used by migrations
+
+Migrations must create the schema as it was when they were written, not as
+the models look today. Creating tables from Base.metadata would stamp a fresh
+database with the current schema at an old version, and the later migrations
+would then run against columns and tables that already exist. These
+definitions are copies of the models at the time of each migration and must
+never be edited; schema changes go into a new migration instead.
+
+Python-side defaults (ids, func.now()) are not part of the DDL and are left
+out.
+"""
+
+from sqlalchemy import Table, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, MetaData
+
+# Migration 1: initial schema
+v1_metadata = MetaData()
+
+Table(
+    "users",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("username", String(255), unique=True, nullable=False),
+    Column("email", String(255), unique=True, nullable=False),
+    Column("password_hash", String(255), nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("role", String(50)),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "profiles",
+    v1_metadata,
+    Column("id", String, ForeignKey("users.id"), primary_key=True),
+    Column("bio", Text),
+    Column("skills", Text),
+    Column("interests", Text),
+    Column("location", String(255)),
+    Column("phone", String(50)),
+    Column("linkedin_url", Text),
+    Column("github_url", Text),
+    Column("portfolio_url", Text),
+    Column("graduation_year", String(10)),
+    Column("company", String(255)),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "applications",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("company", String(255), nullable=False),
+    Column("position", String(255), nullable=False),
+    Column("status", String(50)),
+    Column("job_description", Text),
+    Column("application_date", DateTime),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "mentorships",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("mentor_id", String, ForeignKey("users.id"), nullable=False),
+    Column("mentee_id", String, ForeignKey("users.id"), nullable=False),
+    Column("status", String(50)),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "scholarships",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("amount", Integer, nullable=False),
+    Column("category", String(100), nullable=False),
+    Column("eligibility_criteria", Text),
+    Column("application_deadline", DateTime, nullable=False),
+    Column("max_applications", Integer),
+    Column("current_applications", Integer),
+    Column("status", String(50)),
+    Column("created_by", String, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "scholarship_applications",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("scholarship_id", String, ForeignKey("scholarships.id"), nullable=False),
+    Column("applicant_id", String, ForeignKey("users.id"), nullable=False),
+    Column("personal_statement", Text, nullable=False),
+    Column("academic_achievements", Text),
+    Column("financial_need_statement", Text),
+    Column("status", String(50)),
+    Column("reviewed_by", String, ForeignKey("users.id")),
+    Column("reviewed_at", DateTime),
+    Column("review_notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "projects",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("category", String(100), nullable=False),
+    Column("funding_goal", Integer, nullable=False),
+    Column("current_funding", Integer),
+    Column("funding_type", String(100), nullable=False),
+    Column("timeline", String(255), nullable=False),
+    Column("expected_outcomes", Text, nullable=False),
+    Column("team_members", Text),
+    Column("status", String(50)),
+    Column("created_by", String, ForeignKey("users.id"), nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "project_supports",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("project_id", String, ForeignKey("projects.id"), nullable=False),
+    Column("supporter_id", String, ForeignKey("users.id"), nullable=False),
+    Column("support_type", String(100), nullable=False),
+    Column("support_amount", Integer),
+    Column("support_description", Text),
+    Column("status", String(50)),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "alumni_expertise",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("expertise_area", String(255), nullable=False),
+    Column("years_experience", Integer),
+    Column("current_position", String(255)),
+    Column("company", String(255)),
+    Column("skills", Text),
+    Column("availability_status", String(50)),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "notifications",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("message", Text, nullable=False),
+    Column("type", String(100), nullable=False),
+    Column("priority", String(50)),
+    Column("is_read", Boolean),
+    Column("data", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "study_materials",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("subject_code", String(50), nullable=False),
+    Column("subject_name", String(255), nullable=False),
+    Column("file_path", Text, nullable=False),
+    Column("file_type", String(50), nullable=False),
+    Column("file_size", Integer),
+    Column("uploaded_by", String, ForeignKey("users.id"), nullable=False),
+    Column("is_approved", Boolean),
+    Column("approved_by", String, ForeignKey("users.id")),
+    Column("approved_at", DateTime),
+    Column("download_count", Integer),
+    Column("rating", Integer),
+    Column("rating_count", Integer),
+    Column("tags", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "study_material_downloads",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("material_id", String, ForeignKey("study_materials.id"), nullable=False),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("downloaded_at", DateTime),
+)
+
+Table(
+    "study_material_ratings",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("material_id", String, ForeignKey("study_materials.id"), nullable=False),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("rating", Integer, nullable=False),
+    Column("review", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "research_collaborations",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text, nullable=False),
+    Column("research_area", String(255), nullable=False),
+    Column("objectives", Text, nullable=False),
+    Column("methodology", Text),
+    Column("expected_outcomes", Text),
+    Column("timeline", String(255), nullable=False),
+    Column("max_collaborators", Integer),
+    Column("current_collaborators", Integer),
+    Column("status", String(50)),
+    Column("lead_researcher", String, ForeignKey("users.id"), nullable=False),
+    Column("budget", Integer),
+    Column("requirements", Text),
+    Column("deliverables", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "collaboration_applications",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("collaboration_id", String, ForeignKey("research_collaborations.id"), nullable=False),
+    Column("applicant_id", String, ForeignKey("users.id"), nullable=False),
+    Column("application_letter", Text, nullable=False),
+    Column("research_experience", Text),
+    Column("relevant_skills", Text),
+    Column("availability_hours", Integer),
+    Column("proposed_contribution", Text),
+    Column("status", String(50)),
+    Column("reviewed_by", String, ForeignKey("users.id")),
+    Column("reviewed_at", DateTime),
+    Column("review_notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "collaboration_participants",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("collaboration_id", String, ForeignKey("research_collaborations.id"), nullable=False),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("role", String(100), nullable=False),
+    Column("joined_at", DateTime),
+    Column("contribution_hours", Integer),
+    Column("status", String(50)),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "research_updates",
+    v1_metadata,
+    Column("id", String, primary_key=True),
+    Column("collaboration_id", String, ForeignKey("research_collaborations.id"), nullable=False),
+    Column("author_id", String, ForeignKey("users.id"), nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("update_type", String(50)),
+    Column("is_public", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+# Migration 7: auth sessions
+v7_metadata = MetaData()
+
+# Referenced by the foreign key only; never created from here
+Table("users", v7_metadata, Column("id", String, primary_key=True))
+
+auth_sessions_v7 = Table(
+    "auth_sessions",
+    v7_metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id"), nullable=False),
+    Column("token_hash", String(64), nullable=False),
+    Column("generation", Integer, nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("revoked_at", DateTime),
+    Column("created_at", DateTime),
+    Column("last_used_at", DateTime),
+    Index("ix_auth_sessions_user", "user_id"),
+)
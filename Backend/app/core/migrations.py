@@ -0,0 +1,335 @@
+"""
+Versioned schema migrations
+
+Migrations are registered in order with @migration(version, name) and applied
+with `python migrate.py upgrade`. Applied versions are recorded in the
+schema_migrations table, so worker startup only has to compare version numbers.
+
+upgrade() holds a lock for its whole run: a session-level advisory lock on
+Postgres, a file lock next to the database on SQLite. Concurrent runners wait,
+then find the migrations already applied. Migrations create tables from the
+frozen definitions in app.core.frozen_schema, never from the live models.
+"""
+
+import ast
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Sequence
+from sqlalchemy import Table, Column, Integer, String, DateTime, MetaData, select, func, text, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.file_lock import exclusive_file_lock
+from app.core.frozen_schema import v1_metadata, auth_sessions_v7
+
+# Kept out of Base.metadata so create_all never touches the history table
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+    # Non-transactional migrations run on an AUTOCOMMIT connection, which
+    # Postgres requires for CREATE INDEX CONCURRENTLY
+    transactional: bool = True
+
+MIGRATIONS: List[Migration] = []
+
+def migration(version: int, name: str, transactional: bool = True):
+    """Register a forward migration"""
+    def decorator(upgrade_fn: Callable[[Connection], None]):
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append(Migration(version, name, upgrade_fn, transactional))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return upgrade_fn
+    return decorator
+
+def head_version() -> int:
+    """Latest migration version known to this code"""
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+def get_current_version(conn: Connection) -> int:
+    """Latest applied migration version, 0 for an unmanaged database"""
+    if not inspect(conn).has_table(schema_migrations.name):
+        return 0
+    return conn.scalar(select(func.max(schema_migrations.c.version))) or 0
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_KEY = 728_461_903
+
+@contextmanager
+def migration_lock(engine: Engine) -> Iterator[None]:
+    """Hold an exclusive, cross-process lock while migrations run"""
+    if engine.dialect.name == "postgresql":
+        # Autocommit, so the waiting connection holds no transaction that
+        # CREATE INDEX CONCURRENTLY would have to wait for
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        return
+
+    database = engine.url.database if engine.dialect.name == "sqlite" else None
+    if not database or database == ":memory:":
+        # In-memory databases belong to a single process
+        yield
+        return
+    with exclusive_file_lock(f"{os.path.abspath(database)}.migrate.lock"):
+        yield
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """Apply pending migrations up to target (default: head) under the migration lock"""
+    with migration_lock(engine):
+        return _upgrade(engine, target)
+
+def _upgrade(engine: Engine, target: Optional[int]) -> List[Migration]:
+    # Read under the lock: another runner may have just finished
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        current = get_current_version(conn)
+
+    applied = []
+    for m in MIGRATIONS:
+        if m.version <= current or (target is not None and m.version > target):
+            continue
+
+        if m.transactional:
+            with engine.begin() as conn:
+                m.upgrade(conn)
+                _record(conn, m)
+        else:
+            with engine.connect() as conn:
+                m.upgrade(conn.execution_options(isolation_level="AUTOCOMMIT"))
+            with engine.begin() as conn:
+                _record(conn, m)
+
+        print(f"Applied migration {m.version}: {m.name}")
+        applied.append(m)
+
+    return applied
+
+async def get_schema_version(async_engine: AsyncEngine) -> int:
+    """Read the applied schema version through the async engine"""
+    async with async_engine.connect() as conn:
+        return await conn.run_sync(get_current_version)
+
+def _record(conn: Connection, m: Migration):
+    conn.execute(schema_migrations.insert().values(
+        version=m.version,
+        name=m.name,
+        applied_at=datetime.utcnow()
+    ))
+
+# Migration helpers
+
+def _is_online(conn: Connection) -> bool:
+    return conn.get_execution_options().get("isolation_level") == "AUTOCOMMIT"
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+    using: Optional[str] = None,
+):
+    """Create an index if missing; CONCURRENTLY on Postgres when run outside a transaction"""
+    postgres = conn.dialect.name == "postgresql"
+    concurrently = "CONCURRENTLY " if postgres and _is_online(conn) else ""
+    unique_sql = "UNIQUE " if unique else ""
+    using_sql = f" USING {using}" if using and postgres else ""
+    where_sql = f" WHERE {where}" if where else ""
+    conn.execute(text(
+        f"CREATE {unique_sql}INDEX {concurrently}IF NOT EXISTS {name} "
+        f"ON {table}{using_sql} ({', '.join(columns)}){where_sql}"
+    ))
+
+def drop_index(conn: Connection, name: str):
+    """Drop an index if present; CONCURRENTLY on Postgres when run outside a transaction"""
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" and _is_online(conn) else ""
+    conn.execute(text(f"DROP INDEX {concurrently}IF EXISTS {name}"))
+
+def add_column(conn: Connection, table: str, column: str, column_sql: str):
+    """Add a column if the table does not have it yet"""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {column_sql}"))
+
+def alter_column_type(conn: Connection, table: str, column: str, new_type: str, using: Optional[str] = None):
+    """Change a column type on Postgres; SQLite columns are dynamically typed so this is a no-op there"""
+    if conn.dialect.name != "postgresql":
+        return
+    using_sql = f" USING {using}" if using else ""
+    conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {new_type}{using_sql}"))
+
+# Migrations
+
+@migration(1, "initial schema")
+def initial_schema(conn: Connection):
+    # Skips tables an unmanaged database already has
+    v1_metadata.create_all(bind=conn)
+
+HOT_PATH_INDEXES = [
+    # (name, table, columns, where)
+    ("ix_applications_user_status", "applications", ["user_id", "status"], None),
+    ("ix_mentorships_mentor_status", "mentorships", ["mentor_id", "status"], None),
+    ("ix_mentorships_mentee_status", "mentorships", ["mentee_id", "status"], None),
+    ("ix_scholarships_status_category", "scholarships", ["status", "category"], None),
+    ("ix_scholarships_created_by", "scholarships", ["created_by"], None),
+    ("ix_scholarship_applications_scholarship_applicant", "scholarship_applications", ["scholarship_id", "applicant_id"], None),
+    ("ix_scholarship_applications_applicant", "scholarship_applications", ["applicant_id"], None),
+    ("ix_projects_status_created", "projects", ["status", "created_at"], None),
+    ("ix_projects_created_by", "projects", ["created_by"], None),
+    ("ix_project_supports_project_supporter", "project_supports", ["project_id", "supporter_id"], None),
+    ("ix_project_supports_supporter", "project_supports", ["supporter_id"], None),
+    ("ix_alumni_expertise_availability_area", "alumni_expertise", ["availability_status", "expertise_area"], None),
+    ("ix_alumni_expertise_user", "alumni_expertise", ["user_id"], None),
+    ("ix_notifications_user_created", "notifications", ["user_id", "created_at"], None),
+    ("ix_notifications_user_type", "notifications", ["user_id", "type"], None),
+    ("ix_notifications_user_unread", "notifications", ["user_id", "created_at"], "is_read = {false}"),
+    ("ix_study_materials_approved_created", "study_materials", ["is_approved", "created_at"], None),
+    ("ix_study_materials_approved_subject", "study_materials", ["is_approved", "subject_code", "subject_name"], None),
+    ("ix_study_materials_uploaded_by", "study_materials", ["uploaded_by"], None),
+    ("ix_study_material_downloads_material", "study_material_downloads", ["material_id"], None),
+    ("ix_study_material_ratings_material_user", "study_material_ratings", ["material_id", "user_id"], None),
+    ("ix_research_collaborations_status_created", "research_collaborations", ["status", "created_at"], None),
+    ("ix_research_collaborations_created", "research_collaborations", ["created_at"], None),
+    ("ix_collaboration_applications_collab_applicant", "collaboration_applications", ["collaboration_id", "applicant_id"], None),
+    ("ix_collaboration_applications_collab_created", "collaboration_applications", ["collaboration_id", "created_at"], None),
+    ("ix_collaboration_participants_collab_user", "collaboration_participants", ["collaboration_id", "user_id"], None),
+    ("ix_research_updates_collab_created", "research_updates", ["collaboration_id", "created_at"], None),
+]
+
+@migration(2, "hot path indexes", transactional=False)
+def hot_path_indexes(conn: Connection):
+    false_literal = "false" if conn.dialect.name == "postgresql" else "0"
+    for name, table, columns, where in HOT_PATH_INDEXES:
+        create_index(conn, name, table, columns, where=where.format(false=false_literal) if where else None)
+
+# Sort indexes extended with the primary key so (created_at, id) cursor pages
+# are a single index range scan; they replace the created_at-only indexes
+KEYSET_INDEXES = [
+    # (name, table, columns, where, replaces)
+    ("ix_users_created_id", "users", ["created_at", "id"], None, None),
+    ("ix_scholarships_status_created_id", "scholarships", ["status", "created_at", "id"], None, None),
+    ("ix_projects_status_created_id", "projects", ["status", "created_at", "id"], None, "ix_projects_status_created"),
+    ("ix_notifications_user_created_id", "notifications", ["user_id", "created_at", "id"], None, "ix_notifications_user_created"),
+    ("ix_notifications_user_unread_created_id", "notifications", ["user_id", "created_at", "id"], "is_read = {false}", "ix_notifications_user_unread"),
+    ("ix_study_materials_approved_created_id", "study_materials", ["is_approved", "created_at", "id"], None, "ix_study_materials_approved_created"),
+    ("ix_research_collaborations_status_created_id", "research_collaborations", ["status", "created_at", "id"], None, "ix_research_collaborations_status_created"),
+    ("ix_research_collaborations_created_id", "research_collaborations", ["created_at", "id"], None, "ix_research_collaborations_created"),
+]
+
+@migration(3, "keyset pagination indexes", transactional=False)
+def keyset_pagination_indexes(conn: Connection):
+    false_literal = "false" if conn.dialect.name == "postgresql" else "0"
+    for name, table, columns, where, replaces in KEYSET_INDEXES:
+        create_index(conn, name, table, columns, where=where.format(false=false_literal) if where else None)
+        if replaces:
+            drop_index(conn, replaces)
+
+# Columns moved from JSON-in-Text to native JSON (JSONB on Postgres):
+# (table, column, shape)
+JSON_COLUMNS = [
+    ("profiles", "skills", list),
+    ("profiles", "interests", list),
+    ("alumni_expertise", "skills", list),
+    ("study_materials", "tags", list),
+    ("projects", "team_members", list),
+    ("notifications", "data", dict),
+]
+
+def _coerce_json(raw, shape):
+    """Parse a legacy text value into a JSON list or object"""
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        try:
+            # profiles.py used to store str(list), e.g. "['Python', 'SQL']"
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            value = raw
+    if isinstance(value, shape):
+        return value
+    if shape is dict:
+        return {"value": value}
+    if isinstance(value, (tuple, set)):
+        return list(value)
+    if isinstance(value, str):
+        # Free-text "a, b, c" input from the old string fields
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [value]
+
+@migration(4, "json columns")
+def json_columns(conn: Connection):
+    for table, column, shape in JSON_COLUMNS:
+        rows = conn.execute(text(
+            f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL"
+        )).fetchall()
+        for row_id, raw in rows:
+            if not isinstance(raw, str):
+                # Already a native JSON column (created by migration 1)
+                continue
+            value = _coerce_json(raw, shape) if raw.strip() else None
+            conn.execute(
+                text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+                {"value": json.dumps(value) if value is not None else None, "id": row_id}
+            )
+        alter_column_type(conn, table, column, "JSONB", using=f"{column}::jsonb")
+
+@migration(5, "json gin indexes", transactional=False)
+def json_gin_indexes(conn: Connection):
+    if conn.dialect.name != "postgresql":
+        return
+    for table, column, _ in JSON_COLUMNS:
+        create_index(conn, f"ix_{table}_{column}_gin", table, [column], using="gin")
+
+@migration(6, "user token version")
+def user_token_version(conn: Connection):
+    add_column(conn, "users", "token_version", "INTEGER NOT NULL DEFAULT 0")
+
+@migration(7, "auth sessions")
+def auth_sessions(conn: Connection):
+    auth_sessions_v7.create(bind=conn, checkfirst=True)
+
+# SQLite stores datetimes as text. Rows written through CURRENT_TIMESTAMP
+# before sqlite_now() have no fractional seconds ('YYYY-MM-DD HH:MM:SS'),
+# which sorts before the '.000000' form SQLAlchemy binds cursor values in, so
+# keyset pages would return the boundary row again. Rewrite them to the bound
+# format; values that already carry six fractional digits are left alone.
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%f000"
+
+@migration(8, "normalize sqlite timestamps")
+def normalize_sqlite_timestamps(conn: Connection):
+    if conn.dialect.name != "sqlite":
+        return
+    inspector = inspect(conn)
+    for table in inspector.get_table_names():
+        for column in inspector.get_columns(table):
+            if not isinstance(column["type"], DateTime):
+                continue
+            name = column["name"]
+            conn.execute(text(
+                f"UPDATE {table} SET {name} = strftime('{SQLITE_TIMESTAMP_FORMAT}', {name}) "
+                f"WHERE {name} IS NOT NULL AND length({name}) < 26 "
+                f"AND strftime('{SQLITE_TIMESTAMP_FORMAT}', {name}) IS NOT NULL"
+            ))
+
+@migration(9, "auth session previous token hash")
+def auth_session_previous_token_hash(conn: Connection):
+    add_column(conn, "auth_sessions", "previous_token_hash", "VARCHAR(64)")
@@ -0,0 +1,53 @@
+"""
+Keyset (cursor) pagination helpers
+
+List endpoints page on (created_at, id) newest first. The cursor is an opaque
+token holding the sort key of the last row returned, so fetching a deep page
+is the same index seek as the first one instead of an OFFSET scan that reads
+and discards every earlier row. skip/limit keep working for old clients.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Encode a row's sort key as an opaque cursor"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor back into (created_at, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+def paginate(query: Select, model: Any, cursor: Optional[str], skip: int, limit: int) -> Select:
+    """Order by (created_at, id) desc and seek past the cursor, or fall back to offset"""
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        query = query.offset(skip)
+    # One extra row tells us whether there is a next page
+    return query.limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page"""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    if last.created_at is None:
+        return page, None
+    return page, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,112 @@
+"""
+Password hashing off the event loop
+
+A bcrypt hash or check costs 100-300ms of CPU. Run inline in an async handler
+it stalls every other request on the worker, so login and register hand it to
+a small dedicated pool instead. bcrypt releases the GIL, so the default thread
+pool uses several cores; PASSWORD_HASH_EXECUTOR=process switches to a process
+pool for hash backends that do not. At most PASSWORD_HASH_MAX_PENDING calls
+may be running or queued. Beyond that, callers get PasswordHashingOverloaded
+right away instead of waiting in a queue that only grows during a login burst.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+class PasswordHashingOverloaded(Exception):
+    """Raised when the hashing pool already has PASSWORD_HASH_MAX_PENDING calls"""
+
+def _timed(fn: Callable, *args) -> Tuple[float, Any]:
+    # Runs in the pool; returns its own CPU time so queue wait can be told apart
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+class PasswordHasher:
+    """Bounded pool for password hashing with queue-depth metrics"""
+
+    def __init__(self, workers: int, max_pending: int, kind: str = "thread"):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        # Only touched from the event loop thread, so no lock is needed
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingOverloaded(f"{self.pending} password hashes already pending")
+
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            run_time, result = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        wait = max(0.0, time.perf_counter() - started - run_time)
+        self.completed += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.total_run += run_time
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password in the pool"""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash in the pool"""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "queued": max(0, self.pending - self.workers),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "avg_run_ms": round(self.total_run / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING,
+    settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,164 @@
+"""
+Authenticated principal resolution
+
+Routers need the caller's id, role and status on almost every request.
+Resolved users are kept in an in-process LRU cache with a TTL, so repeat
+requests skip the primary-key lookup. Handlers that change or delete a user
+call principal_cache.invalidate(). With several workers, another worker's copy
+can be out of date until its TTL expires (PRINCIPAL_CACHE_TTL).
+
+Tokens carry the user's token_version; a token whose version no longer
+matches the principal is rejected, so bumping the column revokes it.
+authenticate() is the one place a token is turned into a caller, so every
+dependency (get_current_principal, authorization.get_token_claims) applies
+the same revocation checks.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_db, User
+from app.core.security import verify_token
+
+@dataclass(frozen=True)
+class Principal:
+    """Read-only snapshot of a user row, safe to share between requests"""
+    id: str
+    username: str
+    email: str
+    name: str
+    role: str
+    is_active: bool
+    token_version: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            is_active=user.is_active,
+            token_version=user.token_version or 0,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+class PrincipalCache:
+    """LRU of principals by user id; entries expire after `ttl` seconds"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def revoke(self, user_id: str):
+        """Drop a user and reject their outstanding tokens until those expire"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            now = time.monotonic()
+            self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+            self._revoked[user_id] = now + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    def is_revoked(self, user_id: str) -> bool:
+        with self._lock:
+            expires = self._revoked.get(user_id)
+            return expires is not None and expires > time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+async def load_principal(db: AsyncSession, user_id: str) -> Optional[Principal]:
+    """Principal for a user id, from the cache or the users table"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.put(principal)
+    return principal
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def authenticate(token: str, db: AsyncSession) -> Principal:
+    """Verify a JWT and return its active, current principal, or raise 401"""
+    payload = verify_token(token)
+    if not payload:
+        raise _unauthorized("Invalid authentication credentials")
+    # Deleted on this worker: refused even while the row might still be cached elsewhere
+    if principal_cache.is_revoked(payload["sub"]):
+        raise _unauthorized("User not found or disabled")
+
+    principal = await load_principal(db, payload["sub"])
+    if not principal or not principal.is_active:
+        raise _unauthorized("User not found or disabled")
+    if payload.get("tv", 0) != principal.token_version:
+        raise _unauthorized("Token has been revoked")
+
+    return principal
+
+async def get_current_principal(token: str, db: AsyncSession = Depends(get_db)) -> Principal:
+    """Resolve the caller of a request from its JWT"""
+    return await authenticate(token, db)
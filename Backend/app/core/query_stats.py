@@ -0,0 +1,175 @@
+"""
+Per-request SQL instrumentation
+
+Engine event hooks time every statement and attribute it to the HTTP request
+being served, which QueryStatsMiddleware tracks in a context variable. Totals
+are aggregated per route for GET /health/db/queries and, when SQL_DEBUG_HEADERS
+is on, returned with each response as X-DB-* headers. The same statement run
+several times within one request is flagged as a likely N+1.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+
+class RequestQueries:
+    """Statements issued while serving one request"""
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    @property
+    def route(self) -> Optional[str]:
+        return _route_key(self.scope) if self.scope is not None else None
+
+    def repeated(self) -> Dict[str, int]:
+        """Statements run often enough in this request to look like an N+1"""
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= settings.SQL_N_PLUS_ONE_THRESHOLD
+        }
+
+current_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "current_request_queries", default=None
+)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_queries.get() is not None:
+        context._query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = current_request_queries.get()
+    start = getattr(context, "_query_start", None)
+    if queries is not None and start is not None:
+        queries.record(statement, time.perf_counter() - start)
+
+def instrument_engine(engine: Engine):
+    """Attach the timing hooks to a (sync or async.sync_engine) engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _truncate(statement: Optional[str], length: int = 500) -> Optional[str]:
+    if statement is None:
+        return None
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+class RouteQueryStats:
+    """Query counts and DB time aggregated per route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, queries: RequestQueries):
+        repeated = queries.repeated()
+        with self._lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_time": 0.0,
+                    "slowest_time": 0.0,
+                    "slowest_statement": None,
+                    "n_plus_one_requests": 0,
+                    "n_plus_one_statement": None,
+                }
+            stats["requests"] += 1
+            stats["queries"] += queries.count
+            stats["max_queries"] = max(stats["max_queries"], queries.count)
+            stats["db_time"] += queries.total_time
+            if queries.slowest_time > stats["slowest_time"]:
+                stats["slowest_time"] = queries.slowest_time
+                stats["slowest_statement"] = queries.slowest_statement
+            if repeated:
+                stats["n_plus_one_requests"] += 1
+                stats["n_plus_one_statement"] = max(repeated, key=repeated.get)
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Routes ordered by total DB time, heaviest first"""
+        with self._lock:
+            items = [(route, dict(stats)) for route, stats in self.routes.items()]
+        items.sort(key=lambda item: item[1]["db_time"], reverse=True)
+        return [
+            {
+                "route": route,
+                "requests": stats["requests"],
+                "queries": stats["queries"],
+                "avg_queries": round(stats["queries"] / stats["requests"], 2),
+                "max_queries": stats["max_queries"],
+                "db_time_ms": round(stats["db_time"] * 1000, 3),
+                "avg_db_time_ms": round(stats["db_time"] / stats["requests"] * 1000, 3),
+                "slowest_ms": round(stats["slowest_time"] * 1000, 3),
+                "slowest_statement": _truncate(stats["slowest_statement"]),
+                "n_plus_one_requests": stats["n_plus_one_requests"],
+                "n_plus_one_statement": _truncate(stats["n_plus_one_statement"]),
+            }
+            for route, stats in items[:limit]
+        ]
+
+route_query_stats = RouteQueryStats()
+
+def _route_key(scope) -> Optional[str]:
+    route = scope.get("route")
+    if route is None:
+        return None
+    return f"{scope['method']} {route.path}"
+
+class QueryStatsMiddleware:
+    """ASGI middleware that collects the SQL issued by each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = current_request_queries.set(queries)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.SQL_DEBUG_HEADERS:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(queries.count)
+                headers["X-DB-Time-Ms"] = f"{queries.total_time * 1000:.3f}"
+                headers["X-DB-Slowest-Ms"] = f"{queries.slowest_time * 1000:.3f}"
+                repeated = queries.repeated()
+                if repeated:
+                    headers["X-DB-N-Plus-One"] = str(max(repeated.values()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_request_queries.reset(token)
+            route = queries.route
+            if route is not None:
+                route_query_stats.record(route, queries)
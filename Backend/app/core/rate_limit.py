@@ -0,0 +1,244 @@
+"""
+Sliding-window rate limits for the sign-in endpoints
+
+Each limit counts hits in fixed windows and weights the previous window by how
+much of it still overlaps the sliding window, so it needs just two counters per
+key. The counters live in a CounterStore:
+- MemoryCounterStore keeps them in this process (one node, and a stand-in for
+  the shared store in tests).
+- RedisCounterStore shares them between nodes (RATE_LIMIT_BACKEND=redis).
+A store error lets the request through rather than locking everyone out.
+Limits are checked at the top of the handlers, before any database or bcrypt
+work.
+
+Every limit increments first and compares the count it got back, so
+concurrent requests cannot all pass a check made before any of them was
+counted. The per-username limit only means to count failed logins: each
+attempt is counted up front and refunded once the password turns out to be
+right, or when the attempt is rejected, so a lockout does not keep extending
+while someone hammers it.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Dict, Optional, Protocol, Tuple
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+
+logger = logging.getLogger("app.rate_limit")
+
+class CounterStore(Protocol):
+    async def incr(self, key: str, ttl: int) -> int:
+        """Increment a counter, (re)setting its expiry, and return the new value"""
+
+    async def get(self, key: str) -> int:
+        """Current value of a counter, 0 when missing or expired"""
+
+    async def decr(self, key: str) -> int:
+        """Decrement a counter that is above 0 and return the new value"""
+
+class MemoryCounterStore:
+    """Counters in a dict; bounded, expired entries are purged as it fills up"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._counters: Dict[str, Tuple[int, float]] = {}
+
+    def _purge(self, now: float):
+        self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+        while len(self._counters) >= self.max_keys:
+            # Still full of live keys: drop the oldest ones
+            self._counters.pop(next(iter(self._counters)))
+
+    async def incr(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        count, expires = self._counters.get(key, (0, 0.0))
+        if expires <= now:
+            count = 0
+        if key not in self._counters and len(self._counters) >= self.max_keys:
+            self._purge(now)
+        self._counters[key] = (count + 1, now + ttl)
+        return count + 1
+
+    async def get(self, key: str) -> int:
+        count, expires = self._counters.get(key, (0, 0.0))
+        return count if expires > time.monotonic() else 0
+
+    async def decr(self, key: str) -> int:
+        count, expires = self._counters.get(key, (0, 0.0))
+        if count <= 0 or expires <= time.monotonic():
+            return 0
+        self._counters[key] = (count - 1, expires)
+        return count - 1
+
+# Never below zero, so a refund after the key expired does not bank a hit
+DECR_ABOVE_ZERO = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count > 0 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+
+class RedisCounterStore:
+    """Counters in Redis, shared by every node"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package (pip install redis)")
+        self._client = redis.from_url(url)
+
+    async def incr(self, key: str, ttl: int) -> int:
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            count, _ = await pipe.execute()
+        return int(count)
+
+    async def get(self, key: str) -> int:
+        value = await self._client.get(key)
+        return int(value or 0)
+
+    async def decr(self, key: str) -> int:
+        return int(await self._client.eval(DECR_ABOVE_ZERO, 1, key))
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """'30/60' -> (30 hits, 60 seconds)"""
+    limit, window = rate.split("/", 1)
+    return int(limit), int(window)
+
+class SlidingWindowLimit:
+    """At most `limit` hits per `window` seconds for each identity"""
+
+    def __init__(self, name: str, rate: str, store: CounterStore):
+        self.name = name
+        self.limit, self.window = parse_rate(rate)
+        self.store = store
+        self.allowed = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def _keys(self, identity: str, now: float) -> Tuple[str, str, float]:
+        index = int(now // self.window)
+        elapsed = (now - index * self.window) / self.window
+        prefix = f"rl:{self.name}:{identity}"
+        return f"{prefix}:{index}", f"{prefix}:{index - 1}", elapsed
+
+    def _retry_after(self, current: int, previous: int, elapsed: float) -> int:
+        if current >= self.limit or previous == 0:
+            wait = (1 - elapsed) * self.window
+        else:
+            # Wait until enough of the previous window has slid out
+            wait = ((1 - (self.limit - current) / previous) - elapsed) * self.window
+        # Rounded first so float noise (40.000000001) does not add a second
+        return max(1, math.ceil(round(wait, 6)))
+
+    async def _estimate(self, identity: str) -> Tuple[float, int, int, float]:
+        current_key, previous_key, elapsed = self._keys(identity, time.time())
+        # The increment is the check: its result already includes this hit
+        current = await self.store.incr(current_key, 2 * self.window)
+        previous = await self.store.get(previous_key)
+        return previous * (1 - elapsed) + current, current, previous, elapsed
+
+    async def hit(self, identity: str) -> Optional[int]:
+        """Count a hit; returns seconds to wait when it is over the limit, else None"""
+        try:
+            estimate, current, previous, elapsed = await self._estimate(identity)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Rate limit store failed for %s: %s", self.name, e)
+            return None
+        if estimate > self.limit:
+            self.rejected += 1
+            return self._retry_after(current, previous, elapsed)
+        self.allowed += 1
+        return None
+
+    async def refund(self, identity: str):
+        """Take back a hit in the current window, for outcomes the limit should not count"""
+        try:
+            current_key, _, _ = self._keys(identity, time.time())
+            await self.store.decr(current_key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Rate limit store failed for %s: %s", self.name, e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "window_s": self.window,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "store_errors": self.errors,
+        }
+
+def create_store() -> CounterStore:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisCounterStore(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryCounterStore(settings.RATE_LIMIT_MAX_KEYS)
+
+store = create_store()
+login_per_ip = SlidingWindowLimit("login-ip", settings.RATE_LIMIT_LOGIN_PER_IP, store)
+login_failures_per_username = SlidingWindowLimit("login-user", settings.RATE_LIMIT_LOGIN_FAILURES_PER_USERNAME, store)
+register_per_ip = SlidingWindowLimit("register-ip", settings.RATE_LIMIT_REGISTER_PER_IP, store)
+
+def client_ip(request: Request) -> str:
+    """Caller address; the first X-Forwarded-For hop only when RATE_LIMIT_TRUST_FORWARDED is set"""
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def too_many_requests(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, please try again later",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+def _username_key(username: str) -> str:
+    return username.strip().lower()
+
+async def enforce_login_limits(request: Request, username: str):
+    """Reject a login attempt over the per-IP or per-username limit
+
+    An allowed attempt stays counted against the username as a failure until
+    record_login_success() refunds it.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    retry_after = await login_per_ip.hit(client_ip(request))
+    if retry_after is None:
+        username_key = _username_key(username)
+        retry_after = await login_failures_per_username.hit(username_key)
+        if retry_after is not None:
+            await login_failures_per_username.refund(username_key)
+    if retry_after is not None:
+        raise too_many_requests(retry_after)
+
+async def record_login_success(username: str):
+    """Refund the attempt enforce_login_limits() counted; the password was right"""
+    if settings.RATE_LIMIT_ENABLED:
+        await login_failures_per_username.refund(_username_key(username))
+
+async def enforce_register_limits(request: Request):
+    """Reject a registration over the per-IP limit"""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    retry_after = await register_per_ip.hit(client_ip(request))
+    if retry_after is not None:
+        raise too_many_requests(retry_after)
+
+def rate_limit_stats() -> Dict[str, Any]:
+    return {
+        "enabled": settings.RATE_LIMIT_ENABLED,
+        "backend": settings.RATE_LIMIT_BACKEND,
+        "limits": {
+            limit.name: limit.stats()
+            for limit in (login_per_ip, login_failures_per_username, register_per_ip)
+        },
+    }
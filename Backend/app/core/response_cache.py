@@ -0,0 +1,160 @@
+"""
+Server-side response cache for public catalog endpoints
+
+Browsing scholarships, projects, supporters and alumni expertise is
+unauthenticated and read-mostly. Each of those calls used to run a COUNT and
+a page query. Rendered response bodies are now kept in an in-process LRU:
+- The key is the route path plus the sorted query parameters.
+- Entries expire after RESPONSE_CACHE_TTL seconds, and at most
+  RESPONSE_CACHE_SIZE are kept.
+- Each entry carries tags such as "scholarships" (every list) and
+  "scholarship:<id>" (one detail page). Write handlers call
+  response_cache.invalidate() with the tags they affect, after committing.
+
+A read that began before an invalidation does not store its result, so an
+in-flight request cannot put stale data back. A hit whose ETag matches
+If-None-Match is answered with 304, so repeat browsing touches neither the
+database nor the serializer. The cache is per worker: with several workers,
+another worker's copy can stay stale until its TTL expires. Hit rates are at
+GET /health/cache, behind diagnostics access.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import orjson
+from fastapi import Request, Response
+from app.core.conditional import Validators, is_fresh, not_modified
+from app.core.config import settings
+from app.core.serialization import ORJSONResponse
+
+@dataclass(frozen=True)
+class CachedResponse:
+    expires_at: float
+    body: bytes
+    headers: Dict[str, str]
+    tags: Tuple[str, ...]
+
+    def validators(self) -> Optional[Validators]:
+        etag = self.headers.get("ETag")
+        return Validators(etag) if etag else None
+
+class ResponseCache:
+    """LRU of rendered JSON bodies with TTL and tag invalidation"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._invalidated_at = 0.0
+        self.reset_stats()
+
+    @staticmethod
+    def key(request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for tag in entry.tags:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+
+    def get(self, request: Request) -> Optional[Response]:
+        """The cached response (or a 304 for it), or None on a miss"""
+        if self.max_size <= 0:
+            return None
+        key = self.key(request)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                # put() compares against this to spot writes that raced the read
+                request.state.response_cache_miss_at = now
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            validators = entry.validators()
+            if validators is not None and is_fresh(request, validators):
+                self.not_modified += 1
+                return not_modified(validators)
+        return Response(entry.body, media_type="application/json", headers={**entry.headers, "X-Cache": "HIT"})
+
+    def put(
+        self,
+        request: Request,
+        content: Any,
+        tags: Iterable[str],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """Render `content`, keep it unless a write happened since the miss, and return it"""
+        response = ORJSONResponse(content, headers={**(headers or {}), "X-Cache": "MISS"})
+        if self.max_size <= 0:
+            return response
+        key = self.key(request)
+        tags = tuple(tags)
+        missed_at = getattr(request.state, "response_cache_miss_at", None)
+        with self._lock:
+            if missed_at is None or self._invalidated_at >= missed_at:
+                self.skipped_stores += 1
+                return response
+            self._drop(key)
+            self._entries[key] = CachedResponse(time.monotonic() + self.ttl, response.body, dict(headers or {}), tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self.stores += 1
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return response
+
+    def invalidate(self, *tags: str):
+        """Drop every entry carrying any of `tags`; call after the write commits"""
+        with self._lock:
+            self._invalidated_at = time.monotonic()
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._invalidated_at = time.monotonic()
+            self._entries.clear()
+            self._tags.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.not_modified = self.misses = 0
+            self.stores = self.skipped_stores = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_s": self.ttl,
+                "bytes": sum(len(entry.body) for entry in self._entries.values()),
+                "hits": self.hits,
+                "not_modified": self.not_modified,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "skipped_stores": self.skipped_stores,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
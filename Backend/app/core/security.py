@@ -2,35 +2,162 @@
 Security utilities for authentication and authorization
 """
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import jwt
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.signing_keys import KeySet
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Asymmetric signing keys; unused when ALGORITHM is HS256
+key_set = KeySet(settings.JWT_KEYS_DIR, settings.JWT_KEY_ACTIVATION_DELAY, settings.JWT_KEYS_RELOAD_INTERVAL)
+
+def uses_key_set() -> bool:
+    return settings.ALGORITHM != "HS256"
+
+# Version of the claim set below
+CLAIMS_VERSION = 1
+
+def user_claims(user) -> Dict[str, Any]:
+    """Identity and authorization claims for a user's access token"""
+    return {
+        "sub": user.id,
+        "username": user.username,
+        "email": user.email,
+        "role": user.role,
+        "active": bool(user.is_active),
+        "tv": user.token_version or 0,
+    }
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    to_encode.update({"exp": expire, "iat": now, "cv": CLAIMS_VERSION})
+    if not uses_key_set():
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+    key = key_set.signing_key()
+    return jwt.encode(to_encode, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+class TokenCache:
+    """LRU of verified token claims keyed by token digest, each entry dropped at the token's exp"""
+
+    def __init__(self, max_size: int):
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: bytes, payload: Dict[str, Any]):
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (exp, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+# Tokens signed by a deleted key must not outlive it in the cache
+key_set.on_removal(token_cache.clear)
+
+def hs256_accepted_until() -> Optional[datetime]:
+    """When HS256 tokens stop verifying under a key set; None when they never do
+
+    Every HS256 token was issued before the first signing key existed, so none
+    can legitimately expire later than that plus one token lifetime. The
+    switch to key signing therefore logs nobody out, and the window closes by
+    itself.
+    """
+    if not settings.JWT_ACCEPT_HS256:
+        return None
+    first_key = key_set.first_key_created_at()
+    if first_key is None:
+        return None
+    return first_key + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+def _decode(token: str) -> Dict[str, Any]:
+    header = jwt.get_unverified_header(token)
+    kid = header.get("kid")
+    if kid is None:
+        # Pre-rotation HS256 token
+        if header.get("alg") != "HS256":
+            raise jwt.InvalidTokenError("Unsigned or unsupported token")
+        if not uses_key_set():
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        accepted_until = hs256_accepted_until()
+        if accepted_until is None:
+            raise jwt.InvalidTokenError("HS256 tokens are no longer accepted")
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        if payload.get("exp", 0) > accepted_until.timestamp():
+            raise jwt.InvalidTokenError("HS256 token outlives the switch to signing keys")
+        return payload
+    key = key_set.get(kid) if uses_key_set() else None
+    if key is None:
+        raise jwt.InvalidTokenError(f"Unknown signing key {kid!r}")
+    return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     """Verify JWT token"""
+    if uses_key_set():
+        key_set.refresh()
+    key = TokenCache.key(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        # Copy so a caller mutating its claims cannot affect other requests
+        return dict(payload)
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        payload = _decode(token)
     except jwt.PyJWTError:
         return None
+    token_cache.put(key, payload)
+    return dict(payload)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -0,0 +1,148 @@
+"""
+Refresh-token sessions
+
+Login creates an auth_sessions row and hands the client an opaque refresh
+token `<session id>.<generation>.<secret>`. Only the SHA-256 of the current
+secret, and of the one it replaced, is stored. Every refresh rotates the
+secret and increments the generation with one conditional UPDATE. Renewing an
+access token is therefore a primary-key lookup instead of a bcrypt check.
+
+Presenting the previous generation's genuine secret means a rotated-out token
+was replayed: the whole session is revoked and both the thief and the real
+client must log in again. Anything else that does not match (a guessed secret,
+or a generation older than the previous one, whose hash is no longer kept) is
+rejected without touching the session, so knowing a session id is not enough
+to log its owner out. A session expires after REFRESH_TOKEN_EXPIRE_DAYS
+without use.
+
+Two tabs refreshing with the same token at once are not a replay. The one
+whose UPDATE loses, or that arrives within REFRESH_TOKEN_REUSE_GRACE_SECONDS
+of the rotation, gets RefreshTokenRaced and the session is left alone; the
+client retries with the token the winning request stored.
+"""
+
+import hashlib
+import hmac
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select, update, delete, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AuthSession
+
+class InvalidRefreshToken(Exception):
+    """Refresh token is malformed, unknown, expired or revoked"""
+
+class RefreshTokenReused(InvalidRefreshToken):
+    """A rotated-out refresh token was presented; its session has been revoked"""
+
+class RefreshTokenRaced(Exception):
+    """A concurrent refresh rotated the same token first; nothing was revoked"""
+
+def _hash(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+def _format(session_id: str, generation: int, secret: str) -> str:
+    return f"{session_id}.{generation}.{secret}"
+
+def _parse(token: str) -> Tuple[str, int, str]:
+    try:
+        session_id, generation, secret = token.split(".", 2)
+        return session_id, int(generation), secret
+    except ValueError:
+        raise InvalidRefreshToken("Malformed refresh token")
+
+def _expiry(now: datetime) -> datetime:
+    return now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+async def create_session(db: AsyncSession, user_id: str) -> str:
+    """Start a session for a user and return its first refresh token; the caller commits"""
+    now = datetime.utcnow()
+    # Drop this user's dead sessions so the table stays small
+    await db.execute(
+        delete(AuthSession)
+        .where(AuthSession.user_id == user_id, or_(AuthSession.revoked_at.isnot(None), AuthSession.expires_at <= now))
+        .execution_options(synchronize_session=False)
+    )
+    secret = secrets.token_urlsafe(32)
+    session = AuthSession(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        token_hash=_hash(secret),
+        generation=0,
+        expires_at=_expiry(now),
+        created_at=now,
+        last_used_at=now,
+    )
+    db.add(session)
+    return _format(session.id, 0, secret)
+
+async def revoke_session(db: AsyncSession, session_id: str):
+    """Revoke a session; the caller commits"""
+    await db.execute(
+        update(AuthSession)
+        .where(AuthSession.id == session_id, AuthSession.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+async def rotate_session(db: AsyncSession, token: str) -> Tuple[str, str, str]:
+    """Exchange a refresh token for the next one; returns (session id, user id, new token) and commits"""
+    session_id, generation, secret = _parse(token)
+    now = datetime.utcnow()
+
+    session = await db.scalar(select(AuthSession).where(AuthSession.id == session_id))
+    if not session or session.revoked_at is not None or session.expires_at <= now:
+        raise InvalidRefreshToken("Refresh token expired or revoked")
+
+    # Only a replay proven by the previous secret may revoke the session
+    if generation == session.generation - 1 and session.previous_token_hash is not None \
+            and hmac.compare_digest(session.previous_token_hash, _hash(secret)):
+        grace = timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+        if session.last_used_at is not None and now - session.last_used_at < grace:
+            raise RefreshTokenRaced("Refresh token was just rotated by another request")
+        await revoke_session(db, session_id)
+        await db.commit()
+        raise RefreshTokenReused("Refresh token was already used")
+    if generation != session.generation or not hmac.compare_digest(session.token_hash, _hash(secret)):
+        raise InvalidRefreshToken("Invalid refresh token")
+
+    # Conditional on the generation so two concurrent refreshes cannot both win
+    new_secret = secrets.token_urlsafe(32)
+    user_id: Optional[str] = await db.scalar(
+        update(AuthSession)
+        .where(
+            AuthSession.id == session_id,
+            AuthSession.generation == generation,
+            AuthSession.revoked_at.is_(None),
+        )
+        .values(
+            generation=generation + 1,
+            token_hash=_hash(new_secret),
+            previous_token_hash=session.token_hash,
+            last_used_at=now,
+            expires_at=_expiry(now),
+        )
+        .returning(AuthSession.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if user_id is None:
+        # A concurrent refresh of this token won (or a logout revoked the session)
+        raise RefreshTokenRaced("Refresh token was just rotated by another request")
+
+    await db.commit()
+    return session_id, user_id, _format(session_id, generation + 1, new_secret)
+
+async def end_session(db: AsyncSession, token: str) -> bool:
+    """Revoke the session a current refresh token belongs to; the caller commits"""
+    try:
+        session_id, generation, secret = _parse(token)
+    except InvalidRefreshToken:
+        return False
+    session = await db.scalar(select(AuthSession).where(AuthSession.id == session_id))
+    if not session or session.generation != generation or not hmac.compare_digest(session.token_hash, _hash(secret)):
+        return False
+    await revoke_session(db, session_id)
+    return True
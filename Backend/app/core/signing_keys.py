@@ -0,0 +1,218 @@
+"""
+Asymmetric token signing keys
+
+Keys live as PEM files in JWT_KEYS_DIR. `<kid>.pem` holds a private key, so
+this node can sign with it. `<kid>.pub.pem` holds only the public half, so
+the node can verify but not sign. A kid starts with its UTC creation time, so
+the newest key sorts last. The signing key is the newest private key that is
+at least JWT_KEY_ACTIVATION_DELAY seconds old. A freshly rotated key is
+therefore published in the JWKS before any token is signed with it, and other
+nodes and proxies have time to fetch it. Older keys stay in the set for
+verification until every token they signed has expired. Rotation never logs
+anyone out. The directory is rescanned every JWT_KEYS_RELOAD_INTERVAL
+seconds, and right away when a token names an unknown kid.
+
+A worker that starts against an empty directory creates the first key while
+holding a lock file in it, so workers starting together agree on one key. A
+directory holding only public keys is a verify-only node: nothing is created
+there, and the node verifies tokens without issuing any.
+"""
+
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from app.core.file_lock import exclusive_file_lock
+
+KID_TIME_FORMAT = "%Y%m%d%H%M%S"
+SUPPORTED_ALGORITHMS = ("EdDSA", "RS256")
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Optional[Any]
+    created_at: datetime
+
+    @property
+    def can_sign(self) -> bool:
+        return self.private_key is not None
+
+    def jwk(self) -> Dict[str, Any]:
+        """Public JWK for the JWKS document"""
+        encoder = OKPAlgorithm if self.algorithm == "EdDSA" else RSAAlgorithm
+        jwk = encoder.to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+def _algorithm_for(public_key: Any) -> str:
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    raise ValueError(f"Unsupported key type {type(public_key).__name__}")
+
+def _created_at(kid: str, path: str) -> datetime:
+    try:
+        return datetime.strptime(kid.split("-", 1)[0], KID_TIME_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        # Hand-named key: fall back to the file's modification time
+        return datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+
+def load_key_file(path: str) -> SigningKey:
+    name = os.path.basename(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if name.endswith(".pub.pem"):
+        kid = name[:-len(".pub.pem")]
+        private_key = None
+        public_key = serialization.load_pem_public_key(data)
+    else:
+        kid = name[:-len(".pem")]
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    return SigningKey(kid, _algorithm_for(public_key), public_key, private_key, _created_at(kid, path))
+
+def _write_exclusive(path: str, data: bytes, mode: int):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+def generate_key(directory: str, algorithm: str = "EdDSA") -> SigningKey:
+    """Create a new private key file in `directory` and return it"""
+    if algorithm not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported signing algorithm {algorithm!r}, expected one of {SUPPORTED_ALGORITHMS}")
+    os.makedirs(directory, exist_ok=True)
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    kid = f"{datetime.now(timezone.utc).strftime(KID_TIME_FORMAT)}-{secrets.token_hex(4)}"
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    _write_exclusive(os.path.join(directory, f"{kid}.pem"), pem, 0o600)
+    return load_key_file(os.path.join(directory, f"{kid}.pem"))
+
+def export_public_key(key: SigningKey, directory: str) -> str:
+    """Write the public half of a key for verify-only nodes"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{key.kid}.pub.pem")
+    pem = key.public_key.public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    with open(path, "wb") as f:
+        f.write(pem)
+    return path
+
+class KeySet:
+    """Signing and verification keys loaded from a directory"""
+
+    def __init__(self, directory: str, activation_delay: float, reload_interval: float):
+        self.directory = directory
+        self.activation_delay = activation_delay
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._keys: Dict[str, SigningKey] = {}
+        self._signature: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._forced_at = 0.0
+        self._removal_listeners: List[Callable[[], None]] = []
+
+    def on_removal(self, listener: Callable[[], None]):
+        """Call `listener` whenever a reload finds that a key was deleted"""
+        self._removal_listeners.append(listener)
+
+    def _scan(self) -> Tuple:
+        if not os.path.isdir(self.directory):
+            return ()
+        entries = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".pem"):
+                path = os.path.join(self.directory, name)
+                entries.append((name, os.path.getmtime(path)))
+        return tuple(entries)
+
+    def _reload(self):
+        signature = self._scan()
+        self._checked_at = time.monotonic()
+        if signature == self._signature:
+            return
+        keys: Dict[str, SigningKey] = {}
+        for name, _ in signature:
+            key = load_key_file(os.path.join(self.directory, name))
+            # A private key wins over an exported public copy of itself
+            if key.kid not in keys or key.can_sign:
+                keys[key.kid] = key
+        removed = set(self._keys) - set(keys)
+        self._keys = keys
+        self._signature = signature
+        if removed:
+            for listener in self._removal_listeners:
+                listener()
+
+    def refresh(self, force: bool = False):
+        """Rescan the directory if the reload interval passed, or now when forced (at most once a second)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._signature is None or now - self._checked_at >= self.reload_interval:
+                self._reload()
+            elif force and now - self._forced_at >= 1.0:
+                self._forced_at = now
+                self._reload()
+
+    def keys(self) -> List[SigningKey]:
+        self.refresh()
+        return sorted(self._keys.values(), key=lambda k: (k.created_at, k.kid))
+
+    def get(self, kid: str) -> Optional[SigningKey]:
+        self.refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            # Possibly rotated on another node; look again before rejecting
+            self.refresh(force=True)
+            key = self._keys.get(kid)
+        return key
+
+    def signing_key(self) -> SigningKey:
+        signers = [k for k in self.keys() if k.can_sign]
+        if not signers:
+            raise RuntimeError(
+                f"No private signing key in {self.directory}. "
+                "Run `python manage_keys.py rotate` or copy the key files from another node."
+            )
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.activation_delay)
+        active = [k for k in signers if k.created_at <= cutoff]
+        # Before any key is old enough (first start), sign with the oldest one
+        return active[-1] if active else signers[0]
+
+    def ensure_signing_key(self, algorithm: str) -> Optional[SigningKey]:
+        """Generate a first key when the directory holds none at all; None on a verify-only node"""
+        if not self.keys():
+            os.makedirs(self.directory, exist_ok=True)
+            with exclusive_file_lock(os.path.join(self.directory, ".create.lock")):
+                # Another worker may have created it while this one waited
+                with self._lock:
+                    self._reload()
+                if not self._keys:
+                    generate_key(self.directory, algorithm)
+                    with self._lock:
+                        self._reload()
+        if not any(k.can_sign for k in self.keys()):
+            return None
+        return self.signing_key()
+
+    def first_key_created_at(self) -> Optional[datetime]:
+        """Creation time of the oldest key in the set, i.e. when key signing began"""
+        keys = self.keys()
+        return keys[0].created_at if keys else None
+
+    def jwks(self) -> Dict[str, Any]:
+        return {"keys": [k.jwk() for k in self.keys()]}
@@ -0,0 +1,187 @@
+"""
+Slow query log
+
+Statements slower than SLOW_QUERY_MS are written as JSON lines to a rotating
+log file. Each entry holds the bound-parameter shape (types only, never
+values), the route that issued the statement, and its query plan. The plan
+comes from EXPLAIN on Postgres and EXPLAIN QUERY PLAN on SQLite. Offenders are
+also aggregated in memory per statement for GET /health/db/slow-queries,
+which is gated like the other diagnostics (see app/core/diagnostics.py).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.query_stats import current_request_queries
+
+logger = logging.getLogger("app.slow_queries")
+logger.propagate = False
+
+_EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+def _configure_logger():
+    if logger.handlers or not settings.SLOW_QUERY_LOG_FILE:
+        return
+    directory = os.path.dirname(settings.SLOW_QUERY_LOG_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    handler = RotatingFileHandler(
+        settings.SLOW_QUERY_LOG_FILE,
+        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, so the log carries no user data"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+def explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """Capture the plan for a statement on the connection that ran it"""
+    if not statement.lstrip().lower().startswith(_EXPLAINABLE):
+        return None
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect == "postgresql":
+        prefix = "EXPLAIN "
+    else:
+        return None
+
+    cursor = conn.connection.cursor()
+    try:
+        if dialect == "postgresql":
+            # A failed EXPLAIN must not abort the request's transaction
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception as e:
+            if dialect == "postgresql":
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return f"EXPLAIN failed: {e}"
+        if dialect == "postgresql":
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return "\n".join(row[0] for row in rows)
+        # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+        return "\n".join(str(row[-1]) for row in rows)
+    finally:
+        cursor.close()
+
+class SlowQueryLog:
+    """Slow statements aggregated by statement text"""
+
+    def __init__(self, max_entries: int = 500):
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def has_plan(self, statement: str) -> bool:
+        with self._lock:
+            entry = self.entries.get(statement)
+            return entry is not None and entry["plan"] is not None
+
+    def record(self, statement: str, elapsed: float, route: Optional[str], shape: Any, plan: Optional[str]):
+        with self._lock:
+            entry = self.entries.get(statement)
+            if entry is None:
+                if len(self.entries) >= self.max_entries:
+                    # Make room by dropping the least costly statement
+                    cheapest = min(self.entries, key=lambda s: self.entries[s]["total_time"])
+                    del self.entries[cheapest]
+                entry = self.entries[statement] = {
+                    "count": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "routes": set(),
+                    "parameters": shape,
+                    "plan": None,
+                    "last_seen": None,
+                }
+            entry["count"] += 1
+            entry["total_time"] += elapsed
+            entry["max_time"] = max(entry["max_time"], elapsed)
+            entry["last_seen"] = datetime.utcnow().isoformat()
+            if route:
+                entry["routes"].add(route)
+            if plan is not None:
+                entry["plan"] = plan
+
+    def top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Slow statements ordered by total time spent, worst first"""
+        with self._lock:
+            items = [(statement, dict(entry)) for statement, entry in self.entries.items()]
+        items.sort(key=lambda item: item[1]["total_time"], reverse=True)
+        return [
+            {
+                "statement": statement,
+                "count": entry["count"],
+                "total_ms": round(entry["total_time"] * 1000, 3),
+                "avg_ms": round(entry["total_time"] / entry["count"] * 1000, 3),
+                "max_ms": round(entry["max_time"] * 1000, 3),
+                "routes": sorted(entry["routes"]),
+                "parameters": entry["parameters"],
+                "plan": entry["plan"],
+                "last_seen": entry["last_seen"],
+            }
+            for statement, entry in items[:limit]
+        ]
+
+slow_query_log = SlowQueryLog()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_slow_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    if elapsed * 1000 < settings.SLOW_QUERY_MS:
+        return
+
+    queries = current_request_queries.get()
+    route = queries.route if queries is not None else None
+    shape = parameter_shape(parameters) if not executemany else "executemany"
+
+    # Plans are captured once per statement to keep the overhead bounded
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and not slow_query_log.has_plan(statement):
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f"EXPLAIN failed: {e}"
+
+    slow_query_log.record(statement, elapsed, route, shape, plan)
+    logger.info(json.dumps({
+        "timestamp": datetime.utcnow().isoformat(),
+        "duration_ms": round(elapsed * 1000, 3),
+        "route": route,
+        "statement": statement,
+        "parameters": shape,
+        "plan": plan,
+    }))
+
+def instrument_engine(engine: Engine):
+    """Attach the slow query hooks to a (sync or async.sync_engine) engine"""
+    _configure_logger()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,96 @@
+"""
+Shared fixtures: the API served against a throwaway SQLite database
+"""
+
+import asyncio
+import os
+import sys
+from typing import Any, Tuple
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core import database
+from app.core.config import settings
+from app.core.database import Base, User, RoutingSession, apply_sqlite_pragmas, get_db
+from app.core.principal import principal_cache
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token, user_claims, token_cache
+from main import app
+
+class Api:
+    """An HTTP client for the app plus direct sessions on its database"""
+
+    def __init__(self, client: httpx.AsyncClient, sessions: async_sessionmaker):
+        self.client = client
+        self.sessions = sessions
+
+    async def user(self, username: str, role: str = "student", **fields: Any) -> Tuple[User, str]:
+        """Insert a user and return it with an access token"""
+        async with self.sessions() as db:
+            user = User(
+                username=username, email=f"{username}@example.com",
+                password_hash="x", name=username.title(), role=role, **fields
+            )
+            db.add(user)
+            await db.commit()
+        return user, create_access_token(user_claims(user))
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """Run `scenario(api)` against a fresh database laid out like production SQLite
+
+    Reads go through a pool and writes through a single-connection writer, as
+    in app.core.database, so concurrent requests behave as they do when served.
+    """
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+
+    def run(scenario):
+        async def main():
+            url = f"sqlite+aiosqlite:///{tmp_path / 'api.db'}"
+            reader = create_async_engine(
+                url, poolclass=AsyncAdaptedQueuePool,
+                pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW
+            )
+            writer = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0)
+            for engine in (reader, writer):
+                event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+            monkeypatch.setattr(database, "sqlite_writer_engine", writer)
+            async with writer.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(
+                bind=reader, class_=AsyncSession, sync_session_class=RoutingSession,
+                autoflush=False, expire_on_commit=False
+            )
+
+            async def test_db():
+                async with sessions() as db:
+                    yield db
+
+            app.dependency_overrides[get_db] = test_db
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    await scenario(Api(client, sessions))
+            finally:
+                app.dependency_overrides.pop(get_db, None)
+                await reader.dispose()
+                await writer.dispose()
+
+        principal_cache.clear()
+        token_cache.clear()
+        response_cache.clear()
+        try:
+            asyncio.run(main())
+        finally:
+            principal_cache.clear()
+            token_cache.clear()
+            response_cache.clear()
+
+    return run
@@ -5,15 +5,26 @@ Integrates with Supabase for database and authentication
 
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
 
 from app.core.config import settings
-from app.core.database import create_db_and_tables
+from app.core.compression import CompressionMiddleware, compression_stats
+from app.core.diagnostics import require_diagnostics_access
+from app.core.database import create_db_and_tables, dispose_engines, get_pool_stats, async_engine
+from app.core.migrations import get_schema_version, head_version
+from app.core.query_stats import QueryStatsMiddleware, route_query_stats
+from app.core.password_hashing import password_hasher
+from app.core.principal import principal_cache
+from app.core.rate_limit import rate_limit_stats
+from app.core.response_cache import response_cache
+from app.core.serialization import ORJSONResponse
+from app.core.slow_queries import slow_query_log
 from app.api.api_v1.api import api_router
-from app.core.security import verify_token
+from app.core.security import verify_token, token_cache, key_set, uses_key_set
 
 # Load environment variables
 load_dotenv()
@@ -23,16 +34,38 @@ load_dotenv()
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up the application...")
-    create_db_and_tables()
+    schema_version = await get_schema_version(async_engine)
+    if schema_version < head_version() and settings.AUTO_MIGRATE:
+        try:
+            create_db_and_tables()
+        except Exception:
+            await dispose_engines()
+            raise
+        schema_version = await get_schema_version(async_engine)
+    if schema_version < head_version():
+        await dispose_engines()
+        raise RuntimeError(
+            f"Database schema is at version {schema_version}, expected {head_version()}. "
+            "Run `python migrate.py upgrade` before starting workers."
+        )
+    if uses_key_set():
+        signing_key = key_set.ensure_signing_key(settings.ALGORITHM)
+        if signing_key is None:
+            print(f"Verify-only node: no private key in {settings.JWT_KEYS_DIR}, tokens are not issued here")
+        else:
+            print(f"Signing tokens with {signing_key.algorithm} key {signing_key.kid}")
     yield
     # Shutdown
     print("Shutting down the application...")
+    password_hasher.shutdown()
+    await dispose_engines()
 
 # Create FastAPI application
 app = FastAPI(
     title="Flutter App Backend API",
     description="Backend API for Flutter application with Supabase integration",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -45,6 +78,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Added last so it wraps the others and compresses every response
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # Security scheme
 security = HTTPBearer()
 
@@ -60,6 +106,14 @@ async def root():
         "status": "running"
     }
 
+@app.get("/.well-known/jwks.json")
+async def jwks():
+    """Public keys for verifying access tokens"""
+    return JSONResponse(
+        key_set.jwks() if uses_key_set() else {"keys": []},
+        headers={"Cache-Control": f"public, max-age={settings.JWT_KEYS_RELOAD_INTERVAL}"}
+    )
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -69,6 +123,76 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/health/db", dependencies=[Depends(require_diagnostics_access)])
+async def database_health():
+    """Connection pool state and acquisition metrics"""
+    return {
+        "status": "healthy",
+        "pool": get_pool_stats()
+    }
+
+@app.get("/health/auth", dependencies=[Depends(require_diagnostics_access)])
+async def auth_health():
+    """Sign-in rate limits, password hashing pool, token and principal cache metrics"""
+    return {
+        "rate_limits": rate_limit_stats(),
+        "password_hashing": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats()
+    }
+
+@app.get("/health/compression", dependencies=[Depends(require_diagnostics_access)])
+async def compression_health():
+    """Compression ratio and CPU time per encoding, and skipped responses by reason"""
+    return compression_stats.snapshot()
+
+@app.post("/health/compression/reset", dependencies=[Depends(require_diagnostics_access)])
+async def reset_compression_stats():
+    """Clear the compression counters"""
+    compression_stats.reset()
+    return {"message": "Compression statistics reset"}
+
+@app.get("/health/cache", dependencies=[Depends(require_diagnostics_access)])
+async def response_cache_health():
+    """Public catalog response cache size and hit rate"""
+    return response_cache.stats()
+
+@app.post("/health/cache/reset", dependencies=[Depends(require_diagnostics_access)])
+async def reset_response_cache_stats():
+    """Clear the response cache counters (cached entries are kept)"""
+    response_cache.reset_stats()
+    return {"message": "Response cache statistics reset"}
+
+@app.get("/health/db/queries", dependencies=[Depends(require_diagnostics_access)])
+async def database_query_stats(limit: int = 20):
+    """Per-route query counts, DB time and likely N+1 statements"""
+    return {
+        "enabled": settings.SQL_INSTRUMENTATION,
+        "n_plus_one_threshold": settings.SQL_N_PLUS_ONE_THRESHOLD,
+        "routes": route_query_stats.snapshot(limit)
+    }
+
+@app.post("/health/db/queries/reset", dependencies=[Depends(require_diagnostics_access)])
+async def reset_database_query_stats():
+    """Clear the per-route query counters"""
+    route_query_stats.reset()
+    return {"message": "Query statistics reset"}
+
+@app.get("/health/db/slow-queries", dependencies=[Depends(require_diagnostics_access)])
+async def database_slow_queries(limit: int = 20):
+    """Statements over SLOW_QUERY_MS, worst total time first, with their plans"""
+    return {
+        "enabled": settings.SLOW_QUERY_LOG,
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "statements": slow_query_log.top(limit)
+    }
+
+@app.post("/health/db/slow-queries/reset", dependencies=[Depends(require_diagnostics_access)])
+async def reset_database_slow_queries():
+    """Clear the in-memory slow statement aggregates"""
+    slow_query_log.reset()
+    return {"message": "Slow query statistics reset"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
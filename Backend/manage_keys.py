@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Manage the token signing keys in JWT_KEYS_DIR
+
+Usage:
+    python manage_keys.py list                  Show keys and which one signs
+    python manage_keys.py rotate [EdDSA|RS256]  Add a key; it signs after JWT_KEY_ACTIVATION_DELAY
+    python manage_keys.py prune                 Delete retired keys whose tokens have all expired
+    python manage_keys.py export-public DIR     Write public keys for verify-only nodes
+
+Every signing node must share the same private key files. After `rotate`,
+copy the new .pem to the other signing nodes (and its .pub.pem to verify-only
+nodes) before the activation delay runs out. Running workers pick it up
+within JWT_KEYS_RELOAD_INTERVAL.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+# Load environment variables before settings are read
+load_dotenv()
+
+from app.core.config import settings
+from app.core.security import key_set
+from app.core.signing_keys import generate_key, export_public_key
+
+def retirement_times():
+    """Map kid -> when it stopped signing (None while it may still sign)"""
+    keys = key_set.keys()
+    signer = key_set.signing_key() if any(k.can_sign for k in keys) else None
+    retired = {}
+    for index, key in enumerate(keys):
+        successor = next((k for k in keys[index + 1:] if k.can_sign), None)
+        if signer is None or key.created_at >= signer.created_at or successor is None:
+            retired[key.kid] = None
+        else:
+            retired[key.kid] = successor.created_at + timedelta(seconds=settings.JWT_KEY_ACTIVATION_DELAY)
+    return retired
+
+def list_keys():
+    keys = key_set.keys()
+    if not keys:
+        print(f"No keys in {settings.JWT_KEYS_DIR}")
+        return
+    signer = key_set.signing_key() if any(k.can_sign for k in keys) else None
+    retired = retirement_times()
+    for key in keys:
+        if signer and key.kid == signer.kid:
+            state = "signing"
+        elif signer and key.created_at > signer.created_at:
+            state = "pending activation"
+        elif retired[key.kid]:
+            state = f"retired {retired[key.kid]:%Y-%m-%d %H:%M} UTC"
+        else:
+            state = "verify only"
+        kind = "private" if key.can_sign else "public"
+        print(f"  {key.kid}  {key.algorithm:<6} {kind:<7} {state}")
+
+def rotate(algorithm: str):
+    key = generate_key(settings.JWT_KEYS_DIR, algorithm)
+    print(f"✅ Created {key.algorithm} key {key.kid}")
+    if key_set.signing_key().kid == key.kid:
+        print("   Signing with it now (no other key)")
+    else:
+        activates = key.created_at + timedelta(seconds=settings.JWT_KEY_ACTIVATION_DELAY)
+        print(f"   Published in the JWKS now, signs from {activates:%Y-%m-%d %H:%M:%S} UTC")
+
+def prune():
+    # Keep a retired key until every token it could have signed has expired
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    removed = 0
+    for kid, retired_at in retirement_times().items():
+        if retired_at is None or retired_at > cutoff:
+            continue
+        for suffix in (".pem", ".pub.pem"):
+            path = os.path.join(settings.JWT_KEYS_DIR, kid + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"🗑️  Removed key {kid} (retired {retired_at:%Y-%m-%d %H:%M} UTC)")
+        removed += 1
+    if not removed:
+        print("No retired keys to remove")
+
+def export_public(directory: str):
+    for key in key_set.keys():
+        print(f"📄 {export_public_key(key, directory)}")
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+
+    if command == "list":
+        list_keys()
+    elif command == "rotate":
+        rotate(sys.argv[2] if len(sys.argv) > 2 else settings.ALGORITHM)
+    elif command == "prune":
+        prune()
+    elif command == "export-public" and len(sys.argv) > 2:
+        export_public(sys.argv[2])
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Apply or inspect database schema migrations
+
+Usage:
+    python migrate.py upgrade [version]   Apply pending migrations (default: all)
+    python migrate.py current             Show applied and latest versions
+"""
+
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables before the engine is created
+load_dotenv()
+
+from app.core.database import engine
+from app.core.migrations import MIGRATIONS, upgrade, get_current_version, head_version
+
+def show_current():
+    with engine.connect() as conn:
+        current = get_current_version(conn)
+    print(f"Current schema version: {current}")
+    print(f"Latest available version: {head_version()}")
+    for m in MIGRATIONS:
+        marker = "x" if m.version <= current else " "
+        print(f"  [{marker}] {m.version}: {m.name}")
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+
+    if command == "upgrade":
+        target = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        applied = upgrade(engine, target)
+        if not applied:
+            print("Database schema is up to date")
+    elif command == "current":
+        show_current()
+    else:
+        print(__doc__)
+        sys.exit(1)
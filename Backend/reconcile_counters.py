@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Find and repair drifted denormalized counters
+
+Usage:
+    python reconcile_counters.py                      # check and repair every counter
+    python reconcile_counters.py --dry-run            # report drift only
+    python reconcile_counters.py --only scholarships.current_applications
+    python reconcile_counters.py --chunk-size 500 --pause-ms 50 --json drift.json
+
+Safe to run while the app is serving traffic: each chunk of parent rows is
+checked and repaired in its own short transaction. Exits with status 1 when
+--dry-run finds drift, so it can gate a scheduled job.
+"""
+
+import argparse
+import json
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables before the engine is created
+load_dotenv()
+
+from app.core.database import engine
+from app.core.counters import COUNTERS, reconcile
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile denormalized counters with their child rows")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without repairing it")
+    parser.add_argument("--only", action="append", choices=[c.name for c in COUNTERS], help="counter to check (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="parent rows per transaction")
+    parser.add_argument("--pause-ms", type=float, default=0, help="sleep between chunks to limit load")
+    parser.add_argument("--json", metavar="PATH", help="also write the drift report as JSON")
+    args = parser.parse_args()
+
+    print(f"🚀 Reconciling counters in {engine.url.render_as_string(hide_password=True)}"
+          f"{' (dry run)' if args.dry_run else ''}...")
+    reports = reconcile(engine, args.only, args.chunk_size, repair=not args.dry_run, pause=args.pause_ms / 1000)
+
+    for report in reports:
+        marker = "✅" if not report.drifted else ("⚠️ " if args.dry_run else "🔧")
+        print(f"{marker} {report.counter}: {report.drifted:,} of {report.scanned:,} rows drifted "
+              f"(max {report.max_drift:g}, total {report.total_drift:g}), {report.repaired:,} repaired "
+              f"in {report.elapsed:.1f}s")
+        for sample in report.samples:
+            print(f"     {sample['id']}: stored {sample['stored']}, expected {sample['expected']:g}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([report.as_dict() for report in reports], f, indent=2, default=str)
+        print(f"📊 Report written to {args.json}")
+
+    if args.dry_run and any(report.drifted for report in reports):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,647 @@
+"""
+Synthetic dataset generator and bulk loader
+
+Builds a referentially consistent NextStep dataset at any size, from a small
+demo database up to millions of rows for benchmarks, and loads it in batches.
+Postgres (psycopg2) loads use COPY; every other database uses multi-row
+executemany inserts.
+
+Usage:
+    python seed_data.py                           # 100 users, ~2k rows
+    python seed_data.py --users 50000             # ~1M rows
+    python seed_data.py --users 600000 --reset    # ~10M rows
+
+Table sizes are derived from --users through RATIOS. The demo accounts listed
+in the README (password123) are always included and active. Counters such as
+current_applications, current_funding, download_count and rating agree with
+the generated child rows.
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection, Engine
+from app.core.database import (
+    Base, engine, User, Profile, Application, Mentorship, Scholarship, ScholarshipApplication,
+    Project, ProjectSupport, AlumniExpertise, Notification, StudyMaterial, StudyMaterialDownload,
+    StudyMaterialRating, ResearchCollaboration, CollaborationApplication, CollaborationParticipant,
+    ResearchUpdate
+)
+from app.core.migrations import migration_metadata, upgrade
+from app.core.security import get_password_hash
+
+# Every generated account shares this password; it is hashed once per run
+PASSWORD = "password123"
+
+DEMO_USERS = [
+    ("sarah.johnson", "sarah.johnson@alumni.com", "Sarah Johnson", "alumni"),
+    ("michael.chen", "michael.chen@alumni.com", "Michael Chen", "alumni"),
+    ("emily.rodriguez", "emily.rodriguez@alumni.com", "Emily Rodriguez", "alumni"),
+    ("david.kim", "david.kim@alumni.com", "David Kim", "alumni"),
+    ("lisa.thompson", "lisa.thompson@alumni.com", "Lisa Thompson", "alumni"),
+    ("john.doe", "john.doe@student.com", "John Doe", "student"),
+    ("jane.smith", "jane.smith@student.com", "Jane Smith", "student"),
+]
+
+# Rows per user for each table (users and profiles are 1:1)
+RATIOS = {
+    "alumni_share": 0.3,
+    "applications": 1.0,
+    "mentorships": 0.1,
+    "scholarships": 0.02,
+    "scholarship_applications": 0.5,
+    "projects": 0.02,
+    "project_supports": 0.05,
+    "notifications": 10.0,
+    "study_materials": 0.05,
+    "study_material_downloads": 2.0,
+    "study_material_ratings": 0.5,
+    "research_collaborations": 0.01,
+    "collaboration_applications": 0.05,
+    "research_updates": 0.05,
+}
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Alex", "Ana", "Arjun", "Ben", "Chen", "Chloe", "Daniel", "Diya",
+    "Elena", "Ethan", "Fatima", "Grace", "Hana", "Ishaan", "Jack", "Kavya", "Leo", "Maya",
+    "Mohammed", "Nina", "Omar", "Priya", "Rahul", "Riya", "Sam", "Sofia", "Tara", "Vikram",
+]
+LAST_NAMES = [
+    "Agarwal", "Brown", "Chen", "Das", "Fernandez", "Garcia", "Gupta", "Iyer", "Johnson", "Khan",
+    "Kim", "Kumar", "Lee", "Martin", "Mehta", "Nair", "Patel", "Reddy", "Rodriguez", "Shah",
+    "Singh", "Smith", "Tanaka", "Thompson", "Wang", "Williams", "Wilson", "Yadav", "Zhang", "Ali",
+]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "SQL", "React", "Flutter",
+    "Django", "FastAPI", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Statistics",
+    "Data Analysis", "System Design", "Cloud", "AWS", "Docker", "Kubernetes", "DevOps", "Security",
+    "Product Strategy", "Agile", "User Research", "UI/UX", "Digital Marketing", "Finance",
+    "Operations", "Leadership", "Communication", "Public Speaking",
+]
+INTERESTS = [
+    "AI", "Startups", "Open Source", "Research", "Healthcare", "Education", "Climate", "FinTech",
+    "Robotics", "Gaming", "Design", "Social Impact", "Entrepreneurship", "Space", "Blockchain",
+]
+CITIES = ["Bengaluru", "Mumbai", "Delhi", "Hyderabad", "Pune", "Chennai", "Kolkata", "San Francisco", "London", "Singapore"]
+COMPANIES = ["Google", "Microsoft", "Amazon", "Infosys", "TCS", "Flipkart", "Razorpay", "Zomato", "Meta", "Apple", "Wipro", "Swiggy"]
+POSITIONS = ["Software Engineer", "Data Scientist", "Product Manager", "Designer", "Analyst", "ML Engineer", "DevOps Engineer", "Consultant"]
+EXPERTISE_AREAS = ["Software Engineering", "Data Science", "Product Management", "Marketing", "Finance", "Healthcare", "Design", "Research"]
+SCHOLARSHIP_CATEGORIES = ["merit-based", "need-based", "research", "achievement"]
+PROJECT_CATEGORIES = ["technology", "research", "social-impact", "healthcare", "education", "environment", "business", "arts-culture"]
+FUNDING_TYPES = ["financial", "mentorship", "technical", "resources", "networking"]
+SUBJECTS = [
+    ("CS101", "Introduction to Programming"), ("CS201", "Data Structures"), ("CS301", "Algorithms"),
+    ("CS302", "Operating Systems"), ("CS303", "Database Systems"), ("CS401", "Machine Learning"),
+    ("MA101", "Calculus"), ("MA201", "Linear Algebra"), ("MA202", "Probability"),
+    ("EE101", "Circuits"), ("EC201", "Microeconomics"), ("PH101", "Physics"),
+]
+TAGS = ["notes", "exam", "assignment", "slides", "lab", "cheatsheet", "midterm", "final", "tutorial", "solutions"]
+RESEARCH_AREAS = ["Artificial Intelligence", "Renewable Energy", "Public Health", "Education Technology", "Computational Biology", "Economics", "Materials Science"]
+WORDS = (
+    "build learn research impact community students alumni career growth design data systems "
+    "network innovation support mentor project scholarship future skills team analysis model "
+    "platform outcome experience opportunity develop improve measure deliver explore"
+).split()
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def paragraph(rng: random.Random, sentences: int = 3) -> str:
+    return " ".join(sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+def new_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def skewed(rng: random.Random, n: int) -> int:
+    """Index in [0, n) biased towards low values, so some rows are much more popular"""
+    return int(n * rng.random() ** 2)
+
+class Dataset:
+    """Generates every table's rows from a single seeded RNG"""
+
+    def __init__(self, users: int, seed: int = 42, now: Optional[datetime] = None):
+        self.rng = random.Random(seed)
+        self.now = now or datetime.utcnow().replace(microsecond=0)
+        self.n_users = max(users, len(DEMO_USERS))
+        self.counts = {
+            table: max(1, int(self.n_users * ratio))
+            for table, ratio in RATIOS.items() if table != "alumni_share"
+        }
+        n_alumni = max(5, int(self.n_users * RATIOS["alumni_share"]))
+
+        self.user_ids = [new_id(self.rng) for _ in range(self.n_users)]
+        self.user_created = [self.timestamp(3 * 365) for _ in range(self.n_users)]
+        # Demo alumni first, then generated alumni, then demo students, then students
+        demo_alumni = sum(1 for *_, role in DEMO_USERS if role == "alumni")
+        self.alumni = list(range(0, n_alumni))
+        self.students = list(range(n_alumni, self.n_users))
+        self.demo_index = {}
+        for i, (username, *_rest, role) in enumerate(DEMO_USERS):
+            index = i if role == "alumni" else n_alumni + (i - demo_alumni)
+            self.demo_index[index] = DEMO_USERS[i]
+
+    def timestamp(self, max_days: int, after: Optional[datetime] = None) -> datetime:
+        """Random past timestamp within max_days, not earlier than `after`"""
+        start = self.now - timedelta(days=max_days)
+        if after is not None and after > start:
+            start = after
+        span = max((self.now - start).total_seconds(), 1)
+        return start + timedelta(seconds=self.rng.random() * span)
+
+    def pick_alumni(self) -> int:
+        return self.alumni[skewed(self.rng, len(self.alumni))]
+
+    def pick_student(self) -> int:
+        return self.students[self.rng.randrange(len(self.students))]
+
+    def pick_user(self) -> int:
+        return skewed(self.rng, self.n_users)
+
+    def assign(self, children: int, parents: int, cap: Optional[int] = None) -> array:
+        """Parent index for each child row, skewed towards popular parents
+
+        `cap` bounds children per parent where (parent, user) pairs must be
+        unique; overflow moves to a random parent or is dropped if that is full.
+        """
+        counts = array("I", [0] * parents)
+        assigned = array("I")
+        for _ in range(children):
+            parent = skewed(self.rng, parents)
+            if cap is not None and counts[parent] >= cap:
+                parent = self.rng.randrange(parents)
+                if counts[parent] >= cap:
+                    continue
+            counts[parent] += 1
+            assigned.append(parent)
+        return assigned
+
+    # Users and profiles
+
+    def users(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        alumni = set(self.alumni)
+        password_hash = get_password_hash(PASSWORD)
+        for i, user_id in enumerate(self.user_ids):
+            if i in self.demo_index:
+                username, email, name, role = self.demo_index[i]
+            else:
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                role = "alumni" if i in alumni else "student"
+                username = f"{first.lower()}.{last.lower()}{i}"
+                email = f"{username}@{'alumni' if role == 'alumni' else 'student'}.nextstep.dev"
+                name = f"{first} {last}"
+            created = self.user_created[i]
+            yield {
+                "id": user_id, "username": username, "email": email, "password_hash": password_hash,
+                "name": name, "role": role, "is_active": i in self.demo_index or rng.random() > 0.02,
+                "created_at": created, "updated_at": created,
+            }
+
+    def profiles(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        alumni = set(self.alumni)
+        for i, user_id in enumerate(self.user_ids):
+            is_alumni = i in alumni
+            created = self.user_created[i]
+            yield {
+                "id": user_id, "bio": paragraph(rng, 2),
+                "skills": rng.sample(SKILLS, rng.randint(2, 6)),
+                "interests": rng.sample(INTERESTS, rng.randint(1, 4)),
+                "location": rng.choice(CITIES), "phone": f"+91{rng.randrange(7000000000, 9999999999)}",
+                "linkedin_url": f"https://linkedin.com/in/user{i}", "github_url": f"https://github.com/user{i}",
+                "portfolio_url": None,
+                "graduation_year": str(rng.randint(2005, 2023) if is_alumni else rng.randint(2025, 2029)),
+                "company": rng.choice(COMPANIES) if is_alumni else None,
+                "created_at": created, "updated_at": created,
+            }
+
+    def alumni_expertise(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for i in self.alumni:
+            if rng.random() > 0.7:
+                continue
+            created = self.timestamp(365, after=self.user_created[i])
+            yield {
+                "id": new_id(rng), "user_id": self.user_ids[i],
+                "expertise_area": rng.choice(EXPERTISE_AREAS), "years_experience": rng.randint(1, 25),
+                "current_position": rng.choice(POSITIONS), "company": rng.choice(COMPANIES),
+                "skills": rng.sample(SKILLS, rng.randint(3, 7)),
+                "availability_status": rng.choices(["available", "busy", "unavailable"], [6, 3, 1])[0],
+                "created_at": created, "updated_at": created,
+            }
+
+    def applications(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for _ in range(self.counts["applications"]):
+            user = self.pick_student()
+            created = self.timestamp(365, after=self.user_created[user])
+            yield {
+                "id": new_id(rng), "user_id": self.user_ids[user], "company": rng.choice(COMPANIES),
+                "position": rng.choice(POSITIONS),
+                "status": rng.choices(["applied", "interviewing", "rejected", "accepted"], [5, 2, 3, 1])[0],
+                "job_description": sentence(rng, 20), "application_date": created, "notes": None,
+                "created_at": created, "updated_at": created,
+            }
+
+    def mentorships(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for _ in range(self.counts["mentorships"]):
+            created = self.timestamp(365)
+            yield {
+                "id": new_id(rng), "mentor_id": self.user_ids[self.pick_alumni()],
+                "mentee_id": self.user_ids[self.pick_student()],
+                "status": rng.choices(["pending", "accepted", "rejected", "completed"], [3, 5, 1, 2])[0],
+                "created_at": created, "updated_at": created,
+            }
+
+    # Scholarships
+
+    def scholarships(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        n = self.counts["scholarships"]
+        self.scholarship_ids = [new_id(rng) for _ in range(n)]
+        self.scholarship_owner = array("I", (self.pick_alumni() for _ in range(n)))
+        self.scholarship_created = [self.timestamp(2 * 365) for _ in range(n)]
+        self.scholarship_app_parent = self.assign(self.counts["scholarship_applications"], n, cap=len(self.students) // 2)
+        applications = array("I", [0] * n)
+        for parent in self.scholarship_app_parent:
+            applications[parent] += 1
+        for s in range(n):
+            created = self.scholarship_created[s]
+            yield {
+                "id": self.scholarship_ids[s], "title": f"{rng.choice(EXPERTISE_AREAS)} Scholarship {s + 1}",
+                "description": paragraph(rng), "amount": rng.randrange(10000, 200000, 1000),
+                "category": rng.choice(SCHOLARSHIP_CATEGORIES), "eligibility_criteria": sentence(rng),
+                "application_deadline": created + timedelta(days=rng.randint(30, 240)),
+                "max_applications": max(applications[s], rng.choice([50, 100, 200, 500])),
+                "current_applications": applications[s],
+                "status": rng.choices(["active", "closed", "draft"], [17, 2, 1])[0],
+                "created_by": self.user_ids[self.scholarship_owner[s]],
+                "created_at": created, "updated_at": created,
+            }
+
+    def scholarship_applications(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        seen = set()
+        for parent in self.scholarship_app_parent:
+            # One application per (scholarship, student)
+            applicant = self.pick_student()
+            while (parent, applicant) in seen:
+                applicant = self.pick_student()
+            seen.add((parent, applicant))
+            created = self.timestamp(365, after=self.scholarship_created[parent])
+            status = rng.choices(["pending", "under_review", "approved", "rejected"], [5, 2, 1, 2])[0]
+            reviewed = status != "pending"
+            yield {
+                "id": new_id(rng), "scholarship_id": self.scholarship_ids[parent],
+                "applicant_id": self.user_ids[applicant], "personal_statement": paragraph(rng),
+                "academic_achievements": sentence(rng), "financial_need_statement": sentence(rng),
+                "status": status,
+                "reviewed_by": self.user_ids[self.scholarship_owner[parent]] if reviewed else None,
+                "reviewed_at": self.timestamp(30, after=created) if reviewed else None,
+                "review_notes": sentence(rng, 8) if reviewed else None,
+                "created_at": created, "updated_at": created,
+            }
+
+    # Projects
+
+    def projects(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        n = self.counts["projects"]
+        self.project_ids = [new_id(rng) for _ in range(n)]
+        self.project_created = [self.timestamp(2 * 365) for _ in range(n)]
+        self.support_parent = self.assign(self.counts["project_supports"], n)
+        self.support_amount = array("I", (
+            rng.randrange(500, 20000, 500) if rng.random() < 0.6 else 0 for _ in self.support_parent
+        ))
+        funding = array("Q", [0] * n)
+        for parent, amount in zip(self.support_parent, self.support_amount):
+            funding[parent] += amount
+        for p in range(n):
+            goal = rng.randrange(5000, 100000, 1000)
+            created = self.project_created[p]
+            yield {
+                "id": self.project_ids[p], "title": f"{rng.choice(PROJECT_CATEGORIES).title()} Project {p + 1}",
+                "description": paragraph(rng), "category": rng.choice(PROJECT_CATEGORIES),
+                "funding_goal": goal, "current_funding": funding[p], "funding_type": rng.choice(FUNDING_TYPES),
+                "timeline": f"{rng.randint(1, 12)} months", "expected_outcomes": sentence(rng),
+                "team_members": [
+                    {"name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "role": rng.choice(POSITIONS)}
+                    for _ in range(rng.randint(1, 4))
+                ],
+                "status": "funded" if funding[p] >= goal else rng.choice(["pending", "in_progress"]),
+                "created_by": self.user_ids[self.pick_student()],
+                "created_at": created, "updated_at": created,
+            }
+
+    def project_supports(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for parent, amount in zip(self.support_parent, self.support_amount):
+            created = self.timestamp(365, after=self.project_created[parent])
+            yield {
+                "id": new_id(rng), "project_id": self.project_ids[parent],
+                "supporter_id": self.user_ids[self.pick_alumni()],
+                "support_type": "financial" if amount else rng.choice(FUNDING_TYPES[1:]),
+                "support_amount": amount, "support_description": sentence(rng),
+                "status": rng.choices(["active", "completed", "cancelled"], [6, 3, 1])[0],
+                "created_at": created, "updated_at": created,
+            }
+
+    # Notifications
+
+    def notifications(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        kinds = ["scholarship", "project", "mentorship", "system"]
+        for _ in range(self.counts["notifications"]):
+            user = self.pick_user()
+            kind = rng.choices(kinds, [4, 3, 2, 1])[0]
+            created = self.timestamp(180, after=self.user_created[user])
+            yield {
+                "id": new_id(rng), "user_id": self.user_ids[user], "title": f"{kind.title()} Update",
+                "message": sentence(rng), "type": kind,
+                "priority": rng.choices(["low", "normal", "high", "urgent"], [2, 6, 2, 1])[0],
+                "is_read": rng.random() < 0.7, "data": {"action": rng.choice(["created", "updated", "approved"])},
+                "created_at": created, "updated_at": created,
+            }
+
+    # Study materials
+
+    def study_materials(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        n = self.counts["study_materials"]
+        self.material_ids = [new_id(rng) for _ in range(n)]
+        self.material_created = [self.timestamp(2 * 365) for _ in range(n)]
+        self.download_parent = self.assign(self.counts["study_material_downloads"], n)
+        self.rating_parent = self.assign(self.counts["study_material_ratings"], n, cap=self.n_users // 2)
+        self.rating_value = array("B", (rng.choices([1, 2, 3, 4, 5], [1, 1, 3, 5, 4])[0] for _ in self.rating_parent))
+        downloads = array("I", [0] * n)
+        for parent in self.download_parent:
+            downloads[parent] += 1
+        rating_count = array("I", [0] * n)
+        rating_sum = array("Q", [0] * n)
+        for parent, value in zip(self.rating_parent, self.rating_value):
+            rating_count[parent] += 1
+            rating_sum[parent] += value
+        for m in range(n):
+            code, name = rng.choice(SUBJECTS)
+            file_type = rng.choice(["pdf", "pdf", "pdf", "ppt", "doc"])
+            approved = rng.random() < 0.85
+            created = self.material_created[m]
+            yield {
+                "id": self.material_ids[m], "title": f"{name} {rng.choice(TAGS).title()}",
+                "description": sentence(rng), "subject_code": code, "subject_name": name,
+                "file_path": f"uploads/study_materials/{self.material_ids[m]}.{file_type}",
+                "file_type": file_type, "file_size": rng.randint(50_000, 20_000_000),
+                "uploaded_by": self.user_ids[self.pick_user()], "is_approved": approved,
+                "approved_by": self.user_ids[self.pick_alumni()] if approved else None,
+                "approved_at": self.timestamp(30, after=created) if approved else None,
+                "download_count": downloads[m],
+                # Half-up like SQL ROUND, which the handlers and reconciler use
+                "rating": (2 * rating_sum[m] + rating_count[m]) // (2 * rating_count[m]) if rating_count[m] else 0,
+                "rating_count": rating_count[m],
+                "tags": rng.sample(TAGS, rng.randint(1, 3)),
+                "created_at": created, "updated_at": created,
+            }
+
+    def study_material_downloads(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for parent in self.download_parent:
+            yield {
+                "id": new_id(rng), "material_id": self.material_ids[parent],
+                "user_id": self.user_ids[self.pick_user()],
+                "downloaded_at": self.timestamp(365, after=self.material_created[parent]),
+            }
+
+    def study_material_ratings(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        seen = set()
+        for parent, value in zip(self.rating_parent, self.rating_value):
+            # One rating per (material, user)
+            user = self.pick_user()
+            while (parent, user) in seen:
+                user = rng.randrange(self.n_users)
+            seen.add((parent, user))
+            created = self.timestamp(365, after=self.material_created[parent])
+            yield {
+                "id": new_id(rng), "material_id": self.material_ids[parent], "user_id": self.user_ids[user],
+                "rating": value, "review": sentence(rng, 10) if rng.random() < 0.4 else None,
+                "created_at": created, "updated_at": created,
+            }
+
+    # Research collaborations
+
+    def research_collaborations(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        n = self.counts["research_collaborations"]
+        self.collab_ids = [new_id(rng) for _ in range(n)]
+        self.collab_lead = array("I", (self.pick_alumni() for _ in range(n)))
+        self.collab_created = [self.timestamp(2 * 365) for _ in range(n)]
+        self.collab_max = array("I", (rng.randint(5, 10) for _ in range(n)))
+        self.collab_app_parent = self.assign(self.counts["collaboration_applications"], n, cap=(len(self.alumni) - 1) // 2)
+        # Accepted applicants become participants, up to max_collaborators
+        self.collab_app_status = []
+        participants = array("I", [0] * n)
+        for parent in self.collab_app_parent:
+            status = rng.choices(["pending", "under_review", "accepted", "rejected"], [4, 2, 3, 2])[0]
+            if status == "accepted":
+                if participants[parent] < self.collab_max[parent]:
+                    participants[parent] += 1
+                else:
+                    status = "rejected"
+            self.collab_app_status.append(status)
+        for c in range(n):
+            created = self.collab_created[c]
+            yield {
+                "id": self.collab_ids[c], "title": f"{rng.choice(RESEARCH_AREAS)} Study {c + 1}",
+                "description": paragraph(rng), "research_area": rng.choice(RESEARCH_AREAS),
+                "objectives": sentence(rng), "methodology": sentence(rng), "expected_outcomes": sentence(rng),
+                "timeline": f"{rng.randint(3, 24)} months", "max_collaborators": self.collab_max[c],
+                "current_collaborators": participants[c],
+                "status": rng.choices(["open", "in_progress", "completed", "cancelled"], [5, 3, 1, 1])[0],
+                "lead_researcher": self.user_ids[self.collab_lead[c]], "budget": rng.randrange(0, 500000, 5000),
+                "requirements": sentence(rng), "deliverables": sentence(rng),
+                "created_at": created, "updated_at": created,
+            }
+
+    def collaboration_applications(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        seen = set()
+        self.collab_participants = []
+        for parent, status in zip(self.collab_app_parent, self.collab_app_status):
+            # One application per (collaboration, alumnus)
+            applicant = self.pick_alumni()
+            while (parent, applicant) in seen or applicant == self.collab_lead[parent]:
+                applicant = self.alumni[rng.randrange(len(self.alumni))]
+            seen.add((parent, applicant))
+            created = self.timestamp(365, after=self.collab_created[parent])
+            reviewed = status not in ("pending", "under_review")
+            reviewed_at = self.timestamp(30, after=created) if reviewed else None
+            if status == "accepted":
+                self.collab_participants.append((parent, applicant, reviewed_at))
+            yield {
+                "id": new_id(rng), "collaboration_id": self.collab_ids[parent],
+                "applicant_id": self.user_ids[applicant], "application_letter": paragraph(rng, 2),
+                "research_experience": sentence(rng), "relevant_skills": ", ".join(rng.sample(SKILLS, 3)),
+                "availability_hours": rng.randint(2, 20), "proposed_contribution": sentence(rng),
+                "status": status,
+                "reviewed_by": self.user_ids[self.collab_lead[parent]] if reviewed else None,
+                "reviewed_at": reviewed_at, "review_notes": sentence(rng, 8) if reviewed else None,
+                "created_at": created, "updated_at": created,
+            }
+
+    def collaboration_participants(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        for parent, user, joined in self.collab_participants:
+            yield {
+                "id": new_id(rng), "collaboration_id": self.collab_ids[parent], "user_id": self.user_ids[user],
+                "role": rng.choice(["researcher", "assistant", "contributor", "advisor"]),
+                "joined_at": joined, "contribution_hours": rng.randint(0, 200),
+                "status": rng.choices(["active", "inactive", "completed"], [7, 1, 2])[0],
+                "created_at": joined, "updated_at": joined,
+            }
+
+    def research_updates(self) -> Iterator[Dict[str, Any]]:
+        rng = self.rng
+        n = len(self.collab_ids)
+        for _ in range(self.counts["research_updates"]):
+            parent = skewed(rng, n)
+            created = self.timestamp(365, after=self.collab_created[parent])
+            yield {
+                "id": new_id(rng), "collaboration_id": self.collab_ids[parent],
+                "author_id": self.user_ids[self.collab_lead[parent]], "title": sentence(rng, 5),
+                "content": paragraph(rng), "update_type": rng.choice(["progress", "milestone", "issue", "solution"]),
+                "is_public": rng.random() < 0.8, "created_at": created, "updated_at": created,
+            }
+
+    def tables(self):
+        """(model, row generator) in foreign-key order"""
+        return [
+            (User, self.users), (Profile, self.profiles), (AlumniExpertise, self.alumni_expertise),
+            (Application, self.applications), (Mentorship, self.mentorships),
+            (Scholarship, self.scholarships), (ScholarshipApplication, self.scholarship_applications),
+            (Project, self.projects), (ProjectSupport, self.project_supports),
+            (Notification, self.notifications),
+            (StudyMaterial, self.study_materials), (StudyMaterialDownload, self.study_material_downloads),
+            (StudyMaterialRating, self.study_material_ratings),
+            (ResearchCollaboration, self.research_collaborations),
+            (CollaborationApplication, self.collaboration_applications),
+            (CollaborationParticipant, self.collaboration_participants),
+            (ResearchUpdate, self.research_updates),
+        ]
+
+# Loading
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+def _copy_batch(conn: Connection, table: Table, batch: List[Dict[str, Any]]):
+    """COPY a batch through psycopg2; NULL is written as an unquoted empty field"""
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow(["" if (v := _copy_value(row[c])) is None else v for c in columns])
+    buffer.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def bulk_load(conn: Connection, table: Table, rows: Iterable[Dict[str, Any]], batch_size: int = 5000) -> int:
+    """Insert rows in batches: COPY on psycopg2, executemany elsewhere"""
+    use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+    total = 0
+    for batch in _batches(rows, batch_size):
+        if use_copy:
+            _copy_batch(conn, table, batch)
+        else:
+            conn.execute(table.insert(), batch)
+        total += len(batch)
+    return total
+
+def reset_database(db_engine: Engine):
+    """Drop every application table and the migration history"""
+    Base.metadata.drop_all(bind=db_engine)
+    migration_metadata.drop_all(bind=db_engine)
+
+def seed(db_engine: Engine = engine, users: int = 100, seed_value: int = 42, batch_size: int = 5000, reset: bool = False) -> Dict[str, int]:
+    """Generate a dataset sized by `users` and bulk load it into an empty database"""
+    if reset:
+        reset_database(db_engine)
+    upgrade(db_engine)
+
+    with db_engine.connect() as conn:
+        if conn.scalar(text("SELECT COUNT(*) FROM users")):
+            raise RuntimeError("Database already has users; pass --reset to rebuild it")
+
+    dataset = Dataset(users, seed=seed_value)
+    loaded = {}
+    started = time.perf_counter()
+    for model, rows in dataset.tables():
+        table_start = time.perf_counter()
+        with db_engine.begin() as conn:
+            count = bulk_load(conn, model.__table__, rows(), batch_size)
+        elapsed = time.perf_counter() - table_start
+        loaded[model.__tablename__] = count
+        print(f"📊 {model.__tablename__}: {count:,} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-6):,.0f} rows/s)")
+
+    # Fresh statistics so the planner sees the new table sizes
+    with db_engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    total = sum(loaded.values())
+    print(f"✅ Loaded {total:,} rows in {time.perf_counter() - started:.1f}s")
+    return loaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and bulk load a synthetic NextStep dataset")
+    parser.add_argument("--users", type=int, default=100, help="number of users; every other table scales from it")
+    parser.add_argument("--seed", type=int, default=42, help="random seed, same seed gives the same dataset")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per COPY/executemany batch")
+    parser.add_argument("--reset", action="store_true", help="drop all tables before loading")
+    args = parser.parse_args()
+
+    print(f"🚀 Seeding {engine.url.render_as_string(hide_password=True)} with {args.users:,} users...")
+    try:
+        seed(engine, users=args.users, seed_value=args.seed, batch_size=args.batch_size, reset=args.reset)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
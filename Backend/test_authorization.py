@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Token revocation through token_version
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database import Base, User
+from app.core.authorization import get_token_claims
+from app.core.principal import principal_cache, get_current_principal
+from app.core.security import create_access_token, user_claims, token_cache
+
+def _run(scenario):
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'auth.db')}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(engine, expire_on_commit=False)
+            try:
+                async with sessions() as db:
+                    user = User(username="alum", email="alum@example.com", password_hash="x", name="Alum", role="alumni")
+                    db.add(user)
+                    await db.commit()
+                    await scenario(db, user)
+            finally:
+                await engine.dispose()
+    principal_cache.clear()
+    token_cache.clear()
+    asyncio.run(main())
+
+@pytest.fixture(autouse=True)
+def hs256(monkeypatch):
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+
+async def _rejected(token, db) -> str:
+    with pytest.raises(HTTPException) as excinfo:
+        await get_token_claims(token, db)
+    assert excinfo.value.status_code == 401
+    return excinfo.value.detail
+
+def test_demoted_user_token_is_rejected_after_cache_miss():
+    """A role change revokes tokens even in a worker that never saw the change"""
+    async def scenario(db, user):
+        token = create_access_token(user_claims(user))
+        assert (await get_token_claims(token, db)).role == "alumni"
+
+        user.role = "student"
+        await db.commit()
+        assert user.token_version == 1
+
+        # Another worker: its cached principal expired, so it reads the row
+        principal_cache.clear()
+        assert await _rejected(token, db) == "Token has been revoked"
+
+        fresh = create_access_token(user_claims(user))
+        assert (await get_token_claims(fresh, db)).role == "student"
+    _run(scenario)
+
+def test_deactivated_user_is_rejected():
+    """Deactivation refuses both old and newly minted tokens"""
+    async def scenario(db, user):
+        token = create_access_token(user_claims(user))
+        user.is_active = False
+        await db.commit()
+        principal_cache.clear()
+        assert await _rejected(token, db) == "User not found or disabled"
+        assert await _rejected(create_access_token(user_claims(user)), db) == "User not found or disabled"
+    _run(scenario)
+
+def test_password_change_bumps_version_and_profile_edit_does_not():
+    """Only role, is_active and password changes revoke tokens"""
+    async def scenario(db, user):
+        token = create_access_token(user_claims(user))
+        user.name = "Renamed"
+        await db.commit()
+        assert user.token_version == 0
+        principal_cache.clear()
+        assert (await get_token_claims(token, db)).id == user.id
+
+        user.password_hash = "y"
+        await db.commit()
+        stored = await db.scalar(select(User.token_version).where(User.id == user.id))
+        assert stored == 1
+        principal_cache.clear()
+        assert await _rejected(token, db) == "Token has been revoked"
+    _run(scenario)
+
+def test_deleted_user_is_refused_by_both_dependencies():
+    """A revoked user is rejected the same way whichever dependency a route uses"""
+    async def scenario(db, user):
+        token = create_access_token(user_claims(user))
+        assert (await get_current_principal(token, db)).id == user.id
+        principal_cache.revoke(user.id)
+        assert await _rejected(token, db) == "User not found or disabled"
+        with pytest.raises(HTTPException) as excinfo:
+            await get_current_principal(token, db)
+        assert excinfo.value.status_code == 401
+        assert excinfo.value.detail == "User not found or disabled"
+    _run(scenario)
+
+AUTHENTICATED_ROUTES = [
+    ("GET", "/api/v1/users/me", None),
+    ("PUT", "/api/v1/users/me", {"name": "Changed"}),
+    ("GET", "/api/v1/applications/", None),
+    ("POST", "/api/v1/applications/", {"company": "Acme", "position": "Intern"}),
+    ("GET", "/api/v1/applications/stats/summary", None),
+    ("GET", "/api/v1/profiles/", None),
+    ("POST", "/api/v1/profiles/", {"bio": "Hi"}),
+    ("PUT", "/api/v1/profiles/", {"bio": "Changed"}),
+    ("GET", "/api/v1/profiles/search", None),
+    ("GET", "/api/v1/mentorship/", None),
+    ("POST", "/api/v1/mentorship/request", "mentor"),
+    ("GET", "/api/v1/mentorship/requests/pending", None),
+    ("POST", "/api/v1/auth/verify", None),
+]
+
+def test_deactivated_user_is_refused_on_every_route(api):
+    """Routes that act for the caller all go through the revocation checks"""
+    async def scenario(api):
+        mentor, _ = await api.user("mentor", role="alumni")
+        user, token = await api.user("mentee")
+
+        async def call(method, path, body):
+            if body == "mentor":
+                body = {"mentor_id": mentor.id}
+            response = await api.client.request(method, path, params={"token": token}, json=body)
+            return response.status_code
+
+        assert await call("GET", "/api/v1/users/me", None) == 200
+        assert await call("POST", "/api/v1/applications/", {"company": "Acme", "position": "Intern"}) == 200
+
+        # Deactivated behind the API's back: token_version is unchanged, so
+        # only the is_active check can refuse the token
+        async with api.sessions() as db:
+            await db.execute(update(User).where(User.id == user.id).values(is_active=False))
+            await db.commit()
+        principal_cache.invalidate(user.id)
+
+        for method, path, body in AUTHENTICATED_ROUTES:
+            assert await call(method, path, body) == 401, path
+    api(scenario)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Capacity counters under concurrent requests
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import select, func
+from app.core.database import (
+    Scholarship, ScholarshipApplication, Project, ProjectSupport,
+    ResearchCollaboration, CollaborationParticipant
+)
+
+CAPACITY = 5
+CONTENDERS = 30
+
+async def _add(api, row):
+    async with api.sessions() as db:
+        db.add(row)
+        await db.commit()
+    return row
+
+def test_concurrent_applications_fill_exactly_the_free_slots(api):
+    """30 parallel applies against 5 slots: 5 succeed and the counter matches the rows"""
+    async def scenario(api):
+        alumni, _ = await api.user("donor", role="alumni")
+        scholarship = await _add(api, Scholarship(
+            title="Merit", description="For the best", amount=1000, category="merit-based",
+            application_deadline=datetime.now() + timedelta(days=30),
+            max_applications=CAPACITY, created_by=alumni.id
+        ))
+        tokens = [(await api.user(f"student{i}"))[1] for i in range(CONTENDERS)]
+
+        body = {"scholarship_id": scholarship.id, "personal_statement": "I would put this to good use. " * 3}
+        responses = await asyncio.gather(*(
+            api.client.post(f"/api/v1/scholarships/scholarships/{scholarship.id}/apply", params={"token": token}, json=body)
+            for token in tokens
+        ))
+        codes = sorted(response.status_code for response in responses)
+        assert codes == [200] * CAPACITY + [400] * (CONTENDERS - CAPACITY)
+
+        async with api.sessions() as db:
+            stored = await db.scalar(select(Scholarship.current_applications).where(Scholarship.id == scholarship.id))
+            rows = await db.scalar(select(func.count(ScholarshipApplication.id)))
+        assert stored == rows == CAPACITY
+    api(scenario)
+
+def test_concurrent_joins_fill_exactly_the_free_slots(api):
+    """Parallel participant adds never take more than max_collaborators slots"""
+    async def scenario(api):
+        lead, token = await api.user("lead", role="alumni")
+        collaboration = await _add(api, ResearchCollaboration(
+            title="Study", description="A study", research_area="AI", objectives="Learn",
+            timeline="1 year", max_collaborators=CAPACITY, lead_researcher=lead.id
+        ))
+        members = [(await api.user(f"researcher{i}", role="alumni"))[0] for i in range(CONTENDERS)]
+
+        responses = await asyncio.gather(*(
+            api.client.post(
+                f"/api/v1/research-collaborations/{collaboration.id}/participants/{member.id}/add",
+                params={"token": token}
+            )
+            for member in members
+        ))
+        codes = sorted(response.status_code for response in responses)
+        assert codes == [200] * CAPACITY + [400] * (CONTENDERS - CAPACITY)
+
+        async with api.sessions() as db:
+            stored = await db.scalar(
+                select(ResearchCollaboration.current_collaborators).where(ResearchCollaboration.id == collaboration.id)
+            )
+            rows = await db.scalar(select(func.count(CollaborationParticipant.id)))
+        assert stored == rows == CAPACITY
+    api(scenario)
+
+def test_concurrent_funding_adds_up(api):
+    """Parallel supporters' amounts are all added, and the goal flips the status"""
+    async def scenario(api):
+        student, _ = await api.user("founder")
+        project = await _add(api, Project(
+            title="Solar", description="Panels for the library", category="technology",
+            funding_goal=1000, funding_type="financial", timeline="6 months",
+            expected_outcomes="Cheaper power", created_by=student.id
+        ))
+        tokens = [(await api.user(f"backer{i}", role="alumni"))[1] for i in range(10)]
+
+        body = {
+            "project_id": project.id, "support_type": "financial",
+            "support_amount": 100, "support_description": "Happy to help out"
+        }
+        responses = await asyncio.gather(*(
+            api.client.post(f"/api/v1/projects/projects/{project.id}/support", params={"token": token}, json=body)
+            for token in tokens
+        ))
+        assert [response.status_code for response in responses] == [200] * 10
+
+        async with api.sessions() as db:
+            stored = await db.get(Project, project.id)
+            total = await db.scalar(select(func.sum(ProjectSupport.support_amount)))
+        assert stored.current_funding == total == 1000
+        assert stored.status == "funded"
+    api(scenario)
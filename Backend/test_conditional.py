@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Conditional GET on the scholarship and project catalog
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Scholarship, Project
+from app.core.response_cache import response_cache
+
+SCHOLARSHIPS = "/api/v1/scholarships/scholarships"
+PROJECTS = "/api/v1/projects/projects"
+
+async def _add(api, row):
+    async with api.sessions() as db:
+        db.add(row)
+        await db.commit()
+    return row
+
+async def _get(api, url, **headers):
+    # Clear the response cache so the handler's own validator checks answer
+    response_cache.clear()
+    return await api.client.get(url, headers=headers)
+
+def test_scholarship_reads_are_conditional(api):
+    """Detail and list send weak ETags, answer 304 while current and 200 after an apply"""
+    async def scenario(api):
+        alumni, _ = await api.user("donor", role="alumni")
+        _, token = await api.user("applicant")
+        scholarship = await _add(api, Scholarship(
+            title="Merit", description="For the best", amount=1000, category="merit-based",
+            application_deadline=datetime.now() + timedelta(days=30), created_by=alumni.id
+        ))
+        detail, listing = f"{SCHOLARSHIPS}/{scholarship.id}", f"{SCHOLARSHIPS}?status=active"
+
+        first = await _get(api, detail)
+        assert first.status_code == 200
+        etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+        assert etag.startswith('W/"')
+        first_list = await _get(api, listing)
+        assert first_list.status_code == 200 and first_list.json()["total"] == 1
+        list_etag = first_list.headers["ETag"]
+        assert list_etag.startswith('W/"') and list_etag != etag
+        assert "Last-Modified" not in first_list.headers
+
+        for response in (
+            await _get(api, detail, **{"If-None-Match": etag}),
+            await _get(api, detail, **{"If-None-Match": f'"other", {etag[2:]}'}),
+            await _get(api, detail, **{"If-Modified-Since": last_modified}),
+            await _get(api, listing, **{"If-None-Match": list_etag}),
+        ):
+            assert response.status_code == 304
+            assert response.content == b""
+        # The token is not part of the resource
+        renewed = await api.client.get(detail, params={"token": token}, headers={"If-None-Match": etag})
+        assert renewed.status_code == 304
+        # A cached entry answers the same way
+        assert (await api.client.get(detail, headers={"If-None-Match": etag})).status_code == 304
+        # fields= changes the body, so it is a different resource
+        assert (await _get(api, f"{detail}?fields=id,title", **{"If-None-Match": etag})).status_code == 200
+
+        body = {"scholarship_id": scholarship.id, "personal_statement": "I would put this to good use. " * 3}
+        applied = await api.client.post(f"{detail}/apply", params={"token": token}, json=body)
+        assert applied.status_code == 200
+
+        stale = await api.client.get(detail, headers={"If-None-Match": etag})
+        assert stale.status_code == 200
+        assert stale.headers["ETag"] != etag
+        assert stale.json()["current_applications"] == 1
+        stale_list = await _get(api, listing, **{"If-None-Match": list_etag})
+        assert stale_list.status_code == 200
+        assert stale_list.headers["ETag"] != list_etag
+        assert (await _get(api, detail, **{"If-None-Match": stale.headers["ETag"]})).status_code == 304
+    api(scenario)
+
+def test_project_reads_are_conditional(api):
+    """Financial support moves the project's ETag and Last-Modified stays a valid validator"""
+    async def scenario(api):
+        founder, _ = await api.user("founder")
+        _, token = await api.user("backer", role="alumni")
+        project = await _add(api, Project(
+            title="Solar", description="Panels for the library", category="technology",
+            funding_goal=1000, funding_type="financial", timeline="6 months",
+            expected_outcomes="Cheaper power", created_by=founder.id
+        ))
+        detail, listing = f"{PROJECTS}/{project.id}", f"{PROJECTS}?status=pending"
+
+        first = await _get(api, detail)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"') and "Last-Modified" in first.headers
+        list_etag = (await _get(api, listing)).headers["ETag"]
+        assert (await _get(api, detail, **{"If-None-Match": etag})).status_code == 304
+        assert (await _get(api, listing, **{"If-None-Match": list_etag})).status_code == 304
+
+        body = {
+            "project_id": project.id, "support_type": "financial",
+            "support_amount": 250, "support_description": "Happy to help out"
+        }
+        supported = await api.client.post(f"{detail}/support", params={"token": token}, json=body)
+        assert supported.status_code == 200
+
+        stale = await api.client.get(detail, headers={"If-None-Match": etag})
+        assert stale.status_code == 200
+        assert stale.headers["ETag"] != etag
+        assert stale.json()["current_funding"] == 250
+        assert (await _get(api, listing, **{"If-None-Match": list_etag})).status_code == 200
+    api(scenario)
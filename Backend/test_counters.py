@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Counter reconciliation against the child rows
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+from app.core.counters import COUNTERS, reconcile, reconcile_counter
+from app.core.database import (
+    Base, Scholarship, ScholarshipApplication, Project, ProjectSupport, StudyMaterial,
+    StudyMaterialDownload, StudyMaterialRating, ResearchCollaboration, CollaborationParticipant
+)
+import reconcile_counters
+
+PARENTS = [f"p{i}" for i in range(5)]
+# Ratings per material; averages 4.5, 2.67 and 1.5 check the rounding
+RATINGS = {"p0": [], "p1": [4, 5], "p2": [3], "p3": [2, 3, 3], "p4": [1, 2]}
+
+# Correct value of every counter for each parent, worked out by hand
+EXPECTED = {
+    "scholarships.current_applications": {"p0": 0, "p1": 1, "p2": 2, "p3": 3, "p4": 4},
+    "projects.current_funding": {"p0": 0, "p1": 100, "p2": 200, "p3": 300, "p4": 400},
+    "study_materials.download_count": {"p0": 0, "p1": 1, "p2": 2, "p3": 3, "p4": 4},
+    "study_materials.rating": {"p0": 0, "p1": 5, "p2": 3, "p3": 3, "p4": 2},
+    "study_materials.rating_count": {"p0": 0, "p1": 2, "p2": 1, "p3": 3, "p4": 2},
+    "research_collaborations.current_collaborators": {"p0": 0, "p1": 1, "p2": 2, "p3": 3, "p4": 4},
+}
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for i, parent in enumerate(PARENTS):
+            db.add_all([
+                Scholarship(id=parent, title="S", description="S", amount=1, category="merit-based",
+                            application_deadline=datetime(2030, 1, 1), created_by="u"),
+                Project(id=parent, title="P", description="P", category="technology", funding_goal=10_000,
+                        funding_type="financial", timeline="1y", expected_outcomes="P", created_by="u"),
+                StudyMaterial(id=parent, title="M", subject_code="CS", subject_name="CS", file_path="m.pdf",
+                              file_type="pdf", uploaded_by="u"),
+                ResearchCollaboration(id=parent, title="R", description="R", research_area="R", objectives="R",
+                                      timeline="1y", lead_researcher="u"),
+                # Non-financial support is not funding
+                ProjectSupport(project_id=parent, supporter_id="u", support_type="mentorship", support_amount=999),
+            ])
+            for _ in range(i):
+                db.add_all([
+                    ScholarshipApplication(scholarship_id=parent, applicant_id="u", personal_statement="x"),
+                    ProjectSupport(project_id=parent, supporter_id="u", support_type="financial", support_amount=100),
+                    StudyMaterialDownload(material_id=parent, user_id="u"),
+                    CollaborationParticipant(collaboration_id=parent, user_id="u", role="researcher"),
+                ])
+            db.add_all(StudyMaterialRating(material_id=parent, user_id="u", rating=r) for r in RATINGS[parent])
+        db.commit()
+    yield engine
+    engine.dispose()
+
+def _stored(engine, counter):
+    model = counter.column.class_
+    with engine.connect() as conn:
+        return dict(conn.execute(select(model.id, counter.column)).all())
+
+def _corrupt(engine, counter, parents, value):
+    model = counter.column.class_
+    with engine.begin() as conn:
+        conn.execute(update(model).where(model.id.in_(parents)).values({counter.column.key: value}))
+
+def test_every_counter_is_recomputed_across_chunks(engine):
+    """Corrupted counters are repaired to their child aggregates, two parents per chunk"""
+    assert {counter.name for counter in COUNTERS} == set(EXPECTED)
+    for counter in COUNTERS:
+        _corrupt(engine, counter, PARENTS, 99)
+        _corrupt(engine, counter, ["p2"], None)
+
+    reports = reconcile(engine, chunk_size=2)
+
+    for report in reports:
+        assert (report.scanned, report.drifted, report.repaired) == (5, 5, 5), report.counter
+    for counter in COUNTERS:
+        assert _stored(engine, counter) == EXPECTED[counter.name], counter.name
+    assert all(report.drifted == 0 for report in reconcile(engine, chunk_size=2))
+
+def test_drift_after_a_chunk_boundary_is_found(engine):
+    """Only the drifted row in the last chunk is rewritten"""
+    for counter in COUNTERS:
+        reconcile_counter(engine, counter)
+    counter = next(c for c in COUNTERS if c.name == "projects.current_funding")
+    _corrupt(engine, counter, ["p4"], 350)
+
+    report = reconcile_counter(engine, counter, chunk_size=2)
+
+    assert (report.scanned, report.drifted, report.repaired) == (5, 1, 1)
+    assert report.samples == [{"id": "p4", "stored": 350, "expected": 400.0}]
+    assert report.max_drift == report.total_drift == 50
+    assert _stored(engine, counter) == EXPECTED[counter.name]
+
+def test_dry_run_reports_without_repairing(engine, monkeypatch):
+    """--dry-run leaves the rows alone and exits 1 when it finds drift"""
+    counter = next(c for c in COUNTERS if c.name == "study_materials.rating")
+    _corrupt(engine, counter, ["p1"], 4)
+    monkeypatch.setattr(reconcile_counters, "engine", engine)
+    monkeypatch.setattr(sys, "argv", ["reconcile_counters.py", "--dry-run", "--only", counter.name, "--chunk-size", "2"])
+
+    with pytest.raises(SystemExit) as excinfo:
+        reconcile_counters.main()
+
+    assert excinfo.value.code == 1
+    assert _stored(engine, counter)["p1"] == 4
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Access to the diagnostic endpoints
+"""
+
+import asyncio
+import os
+import sys
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+from app.core.config import settings
+from main import app
+
+DIAGNOSTICS = [
+    "/health/db",
+    "/health/auth",
+    "/health/db/queries",
+    "/health/db/slow-queries",
+    "/health/compression",
+    "/health/cache",
+]
+
+def _get(path: str, **headers) -> int:
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return (await client.get(path, headers=headers)).status_code
+    return asyncio.run(main())
+
+@pytest.mark.parametrize("path", DIAGNOSTICS)
+def test_diagnostics_need_debug_or_the_token(path, monkeypatch):
+    """Hidden without a token, refused with a wrong one, open with the right one or DEBUG"""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "DIAGNOSTICS_TOKEN", "")
+    assert _get(path) == 404
+
+    monkeypatch.setattr(settings, "DIAGNOSTICS_TOKEN", "s3cret")
+    assert _get(path) == 403
+    assert _get(path, **{"X-Diagnostics-Token": "wrong"}) == 403
+    assert _get(path, **{"X-Diagnostics-Token": "s3cret"}) == 200
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    assert _get(path) == 200
+
+def test_liveness_stays_open(monkeypatch):
+    """/health answers without credentials"""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "DIAGNOSTICS_TOKEN", "s3cret")
+    assert _get("/health") == 200
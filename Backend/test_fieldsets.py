@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+fields= parsing, column selection and bad list parameters
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect as sa_inspect, select
+from app.api.api_v1.endpoints.scholarships import ScholarshipResponse
+from app.api.api_v1.endpoints.users import UserResponse
+from app.core.database import Scholarship, User
+from app.core.fieldsets import PAGINATION_COLUMNS, select_fields
+
+SCHOLARSHIPS = "/api/v1/scholarships/scholarships"
+
+def test_no_fields_means_whole_rows():
+    """An absent or empty fields= selects nothing"""
+    assert select_fields(Scholarship, None) is None
+    assert select_fields(Scholarship, "") is None
+
+def test_fields_are_parsed_with_id_first():
+    """Names are trimmed and deduplicated, id always leads, and also= is loaded but not returned"""
+    selection = select_fields(Scholarship, " title, status,,title ", ScholarshipResponse, also=PAGINATION_COLUMNS)
+    assert selection.fields == ("id", "title", "status")
+    assert selection.load == ("id", "title", "status", "created_at")
+    row = Scholarship(id="s1", title="Merit", status="active", description="Long text")
+    assert selection.one(row) == {"id": "s1", "title": "Merit", "status": "active"}
+
+@pytest.mark.parametrize("fields, unknown", [
+    ("title,nope", "nope"),
+    ("Title", "Title"),
+    # A column the response schema leaves out is not selectable
+    ("username,password_hash", "password_hash"),
+])
+def test_unknown_fields_are_rejected(fields, unknown):
+    """A name outside the model's columns (or the response schema) is a 400"""
+    model, schema = (User, UserResponse) if "username" in fields else (Scholarship, ScholarshipResponse)
+    with pytest.raises(HTTPException) as excinfo:
+        select_fields(model, fields, schema)
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail.startswith(f"Unknown fields: {unknown}. Available: ")
+
+def test_fields_limit_columns_and_body(api):
+    """The list returns only the asked-for keys and leaves unrequested columns unread"""
+    async def scenario(api):
+        alumni, _ = await api.user("donor", role="alumni")
+        async with api.sessions() as db:
+            db.add_all(Scholarship(
+                title=f"Merit {n}", description="For the best " * 50, amount=1000, category="merit-based",
+                application_deadline=datetime.now() + timedelta(days=30), created_by=alumni.id
+            ) for n in range(3))
+            await db.commit()
+
+        response = await api.client.get(SCHOLARSHIPS, params={"fields": "title,amount", "limit": 2})
+        assert response.status_code == 200
+        body = response.json()
+        assert [sorted(row) for row in body["scholarships"]] == [["amount", "id", "title"]] * 2
+        assert body["total"] == 3 and body["next_cursor"]
+
+        following = await api.client.get(SCHOLARSHIPS, params={"fields": "title", "cursor": body["next_cursor"]})
+        assert [list(row) for row in following.json()["scholarships"]] == [["id", "title"]]
+
+        selection = select_fields(Scholarship, "title", ScholarshipResponse)
+        async with api.sessions() as db:
+            row = await db.scalar(selection.apply(select(Scholarship)).limit(1))
+            assert "description" in sa_inspect(row).unloaded
+            assert "title" not in sa_inspect(row).unloaded
+    api(scenario)
+
+def test_bad_list_parameters_are_400(api):
+    """Unknown fields and undecodable cursors are client errors, not 500s"""
+    async def scenario(api):
+        unknown = await api.client.get(SCHOLARSHIPS, params={"fields": "title,nope"})
+        assert unknown.status_code == 400
+        assert unknown.json()["detail"].startswith("Unknown fields: nope.")
+        detail = await api.client.get(f"{SCHOLARSHIPS}/missing", params={"fields": "nope"})
+        assert detail.status_code == 400
+
+        for cursor in ("not-a-cursor", "WyJ4Il0", "bm90IGpzb24"):
+            response = await api.client.get(SCHOLARSHIPS, params={"cursor": cursor})
+            assert response.status_code == 400, cursor
+            assert response.json()["detail"] == "Invalid pagination cursor"
+    api(scenario)
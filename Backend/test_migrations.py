@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Schema migrations: fresh databases, concurrent runners and failures
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, func
+from app.core import migrations
+from app.core.database import Base
+from app.core.migrations import Migration, schema_migrations, upgrade, head_version
+
+def test_fresh_database_matches_models():
+    """Upgrading an empty database to head yields exactly the models' tables and columns"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'fresh.db')}")
+        applied = upgrade(engine)
+        assert [m.version for m in applied] == [m.version for m in migrations.MIGRATIONS]
+
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            assert columns == {column.name for column in table.columns}, table.name
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if not index.name.endswith("_gin"):  # Postgres only
+                    assert index.name in indexes, index.name
+        engine.dispose()
+
+def test_concurrent_upgrades_apply_each_migration_once():
+    """Runners started together serialize on the lock"""
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'shared.db')}"
+        results, errors = [], []
+
+        def run():
+            engine = create_engine(url)
+            try:
+                results.append(len(upgrade(engine)))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                engine.dispose()
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert sorted(results) == [0, 0, 0, len(migrations.MIGRATIONS)]
+        engine = create_engine(url)
+        with engine.connect() as conn:
+            assert conn.scalar(select(func.count()).select_from(schema_migrations)) == len(migrations.MIGRATIONS)
+        engine.dispose()
+
+def test_failed_migration_raises_and_is_not_recorded(monkeypatch):
+    """A failing migration stops upgrade() instead of being skipped"""
+    def broken(conn):
+        raise RuntimeError("boom")
+
+    failing = Migration(head_version() + 1, "broken", broken)
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*migrations.MIGRATIONS, failing])
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'broken.db')}")
+        with pytest.raises(RuntimeError, match="boom"):
+            upgrade(engine)
+        with engine.connect() as conn:
+            assert migrations.get_current_version(conn) == failing.version - 1
+        engine.dispose()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Keyset pagination over rows with legacy SQLite timestamps
+"""
+
+import os
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+from app.core.database import User
+from app.core.migrations import normalize_sqlite_timestamps
+from app.core.pagination import paginate, split_page
+
+def _legacy_database(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    User.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        # CURRENT_TIMESTAMP format, with ties so the id breaks them
+        for i in range(7):
+            conn.execute(text(
+                "INSERT INTO users (id, email, username, password_hash, name, role, is_active, token_version, "
+                "created_at, updated_at) VALUES (:id, :email, :id, 'x', 'User', 'student', 1, 0, :ts, :ts)"
+            ), {"id": f"user-{i}", "email": f"user{i}@example.com", "ts": f"2025-09-21 10:58:5{i // 2}"})
+    return engine
+
+def _page_through(engine, limit: int):
+    seen = []
+    cursor = None
+    with Session(engine) as session:
+        for _ in range(20):
+            rows = session.scalars(paginate(select(User), User, cursor, 0, limit)).all()
+            page, cursor = split_page(rows, limit)
+            seen.extend(user.id for user in page)
+            if cursor is None:
+                return seen
+    raise AssertionError(f"pagination did not terminate: {seen}")
+
+def test_cursor_pages_reach_the_end_after_migration():
+    """Every legacy row is returned once and paging stops"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = _legacy_database(os.path.join(directory, "legacy.db"))
+        with engine.begin() as conn:
+            normalize_sqlite_timestamps(conn)
+            stored = conn.scalar(text("SELECT created_at FROM users WHERE id = 'user-0'"))
+        assert stored == "2025-09-21 10:58:50.000000"
+
+        for limit in (1, 2, 3):
+            seen = _page_through(engine, limit)
+            assert sorted(seen) == [f"user-{i}" for i in range(7)]
+            assert len(seen) == len(set(seen))
+        engine.dispose()
+
+def test_normalization_keeps_microseconds():
+    """Values already in the bound format are not rewritten"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = _legacy_database(os.path.join(directory, "legacy.db"))
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE users SET created_at = '2025-09-21 10:58:50.123456' WHERE id = 'user-0'"))
+            normalize_sqlite_timestamps(conn)
+            assert conn.scalar(text("SELECT created_at FROM users WHERE id = 'user-0'")) == "2025-09-21 10:58:50.123456"
+        engine.dispose()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Bounded password hashing pool and the login 503 path
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from app.api.api_v1.endpoints import auth
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.database import User
+from app.core.password_hashing import PasswordHasher, PasswordHashingOverloaded
+from app.core.rate_limit import MemoryCounterStore, SlidingWindowLimit
+from app.core.security import get_password_hash
+
+async def _saturate(hasher: PasswordHasher, release: threading.Event):
+    """Fill every pending slot with a call that blocks until `release` is set"""
+    tasks = [asyncio.create_task(hasher._run(release.wait)) for _ in range(hasher.max_pending)]
+    while hasher.pending < hasher.max_pending:
+        await asyncio.sleep(0)
+    return tasks
+
+def test_calls_beyond_max_pending_are_rejected():
+    """Running plus queued calls are capped; the next one fails at once and the pool recovers"""
+    hasher = PasswordHasher(workers=1, max_pending=3)
+    release = threading.Event()
+
+    async def scenario():
+        tasks = await _saturate(hasher, release)
+        assert hasher.stats()["queued"] == 2
+        with pytest.raises(PasswordHashingOverloaded):
+            await hasher._run(release.wait)
+        release.set()
+        await asyncio.gather(*tasks)
+        assert await hasher.verify("secret", get_password_hash("secret"))
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        hasher.shutdown()
+    stats = hasher.stats()
+    assert (stats["pending"], stats["peak_pending"], stats["rejected"], stats["completed"]) == (0, 3, 1, 4)
+
+def test_overloaded_login_is_503_and_not_counted(api, monkeypatch):
+    """A login the pool turned away gets 503 with Retry-After and its username hit back"""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    store = MemoryCounterStore()
+    monkeypatch.setattr(rate_limit, "login_per_ip", SlidingWindowLimit("login-ip", "1000/60", store))
+    monkeypatch.setattr(rate_limit, "login_failures_per_username", SlidingWindowLimit("login-user", "3/60", store))
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    monkeypatch.setattr(auth, "password_hasher", hasher)
+    release = threading.Event()
+
+    async def scenario(api):
+        async with api.sessions() as db:
+            db.add(User(
+                username="frank", email="frank@example.com", password_hash=get_password_hash("correct horse"),
+                name="Frank", role="student"
+            ))
+            await db.commit()
+
+        tasks = await _saturate(hasher, release)
+        body = {"username": "frank", "password": "wrong guess"}
+        # More attempts than the username limit: none of them may be counted
+        for _ in range(5):
+            response = await api.client.post("/api/v1/auth/login", json=body)
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+        assert hasher.rejected == 5
+        release.set()
+        await asyncio.gather(*tasks)
+
+        for _ in range(3):
+            assert (await api.client.post("/api/v1/auth/login", json=body)).status_code == 401
+        assert (await api.client.post("/api/v1/auth/login", json=body)).status_code == 429
+
+    try:
+        api(scenario)
+    finally:
+        release.set()
+        hasher.shutdown()
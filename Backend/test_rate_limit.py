@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Sliding-window sign-in rate limits
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import MemoryCounterStore, SlidingWindowLimit
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Start of a 60s window
+    clock = Clock(600.0)
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    store = MemoryCounterStore()
+    monkeypatch.setattr(rate_limit, "login_per_ip", SlidingWindowLimit("login-ip", "1000/60", store))
+    username = SlidingWindowLimit("login-user", "3/60", store)
+    monkeypatch.setattr(rate_limit, "login_failures_per_username", username)
+    return username
+
+def _request():
+    return SimpleNamespace(headers={}, client=SimpleNamespace(host="203.0.113.7"))
+
+async def _attempt(username: str) -> bool:
+    try:
+        await rate_limit.enforce_login_limits(_request(), username)
+    except HTTPException as e:
+        assert e.status_code == 429
+        return False
+    # Give the other attempts a turn, as a bcrypt check would
+    await asyncio.sleep(0)
+    return True
+
+def test_previous_window_is_weighted_by_overlap(clock):
+    """Half-way into a window, half of the previous window's hits still count"""
+    limit = SlidingWindowLimit("test", "10/60", MemoryCounterStore())
+
+    async def scenario():
+        for _ in range(10):
+            assert await limit.hit("alice") is None
+        clock.now += 90  # half-way into the next window
+        for _ in range(5):
+            assert await limit.hit("alice") is None
+        # 10 * 0.5 + 6 > 10, and 10 * 0.4 + 6 fits once 0.6 of the window has passed
+        assert await limit.hit("alice") == 6
+        await limit.refund("alice")
+        clock.now += 5
+        assert await limit.hit("alice") is not None
+        await limit.refund("alice")
+        clock.now += 1
+        assert await limit.hit("alice") is None
+    asyncio.run(scenario())
+
+def test_retry_after_when_current_window_is_full(clock):
+    """Over the limit within one window, wait for that window to end"""
+    limit = SlidingWindowLimit("test", "3/60", MemoryCounterStore())
+
+    async def scenario():
+        clock.now += 15
+        for _ in range(3):
+            assert await limit.hit("bob") is None
+        assert await limit.hit("bob") == 45
+    asyncio.run(scenario())
+
+def test_concurrent_attempts_cannot_pass_the_username_limit(clock, limits):
+    """Parallel guesses are counted before they are checked"""
+    async def scenario():
+        return await asyncio.gather(*(_attempt("Carol") for _ in range(10)))
+    assert sum(asyncio.run(scenario())) == 3
+
+def test_rejection_sets_retry_after_and_is_not_counted(clock, limits):
+    """The 429 carries Retry-After, and rejected attempts do not extend the lockout"""
+    async def scenario():
+        for _ in range(3):
+            assert await _attempt("dave")
+        clock.now += 20
+        for _ in range(5):
+            with pytest.raises(HTTPException) as excinfo:
+                await rate_limit.enforce_login_limits(_request(), "dave")
+            assert excinfo.value.headers["Retry-After"] == "40"
+        assert await limits.store.get("rl:login-user:dave:10") == 3
+    asyncio.run(scenario())
+
+def test_successful_login_is_refunded(clock, limits):
+    """Only failed attempts stay counted against the username"""
+    async def scenario():
+        for _ in range(10):
+            assert await _attempt("erin")
+            await rate_limit.record_login_success("erin")
+        assert await limits.store.get("rl:login-user:erin:10") == 0
+    asyncio.run(scenario())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Response cache hits and invalidation on writes
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import Scholarship, Project
+from app.core.response_cache import response_cache
+
+SCHOLARSHIPS = "/api/v1/scholarships/scholarships"
+PROJECTS = "/api/v1/projects/projects"
+
+async def _add(api, row):
+    async with api.sessions() as db:
+        db.add(row)
+        await db.commit()
+    return row
+
+async def _twice(api, url):
+    """Read `url` twice, checking the first is rendered and the second cached"""
+    miss = await api.client.get(url)
+    hit = await api.client.get(url)
+    assert (miss.status_code, hit.status_code) == (200, 200)
+    assert (miss.headers["X-Cache"], hit.headers["X-Cache"]) == ("MISS", "HIT"), url
+    assert hit.json() == miss.json()
+    assert hit.headers.get("ETag") == miss.headers.get("ETag")
+    return hit.json()
+
+async def _fresh(api, url):
+    """The next read after a write is rendered again"""
+    response = await api.client.get(url)
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS", url
+    return response.json()
+
+def test_apply_invalidates_cached_scholarship_reads(api):
+    """An application drops the cached list and detail, so the new count is served"""
+    async def scenario(api):
+        alumni, _ = await api.user("donor", role="alumni")
+        _, token = await api.user("applicant")
+        scholarship = await _add(api, Scholarship(
+            title="Merit", description="For the best", amount=1000, category="merit-based",
+            application_deadline=datetime.now() + timedelta(days=30), created_by=alumni.id
+        ))
+        detail, listing = f"{SCHOLARSHIPS}/{scholarship.id}", f"{SCHOLARSHIPS}?status=active"
+        response_cache.reset_stats()
+
+        assert (await _twice(api, detail))["current_applications"] == 0
+        assert (await _twice(api, listing))["scholarships"][0]["current_applications"] == 0
+        assert response_cache.stats()["hits"] == 2
+
+        body = {"scholarship_id": scholarship.id, "personal_statement": "I would put this to good use. " * 3}
+        applied = await api.client.post(f"{detail}/apply", params={"token": token}, json=body)
+        assert applied.status_code == 200
+
+        assert (await _fresh(api, detail))["current_applications"] == 1
+        assert (await _fresh(api, listing))["scholarships"][0]["current_applications"] == 1
+        assert (await api.client.get(detail)).headers["X-Cache"] == "HIT"
+    api(scenario)
+
+def test_support_invalidates_cached_project_reads(api):
+    """Support drops the cached project, list and supporters, and leaves other projects cached"""
+    async def scenario(api):
+        founder, _ = await api.user("founder")
+        _, token = await api.user("backer", role="alumni")
+        project, other = [await _add(api, Project(
+            title=title, description="Panels for the library", category="technology",
+            funding_goal=1000, funding_type="financial", timeline="6 months",
+            expected_outcomes="Cheaper power", created_by=founder.id
+        )) for title in ("Solar", "Wind")]
+        detail, supporters = f"{PROJECTS}/{project.id}", f"{PROJECTS}/{project.id}/support"
+        listing, untouched = f"{PROJECTS}?status=pending", f"{PROJECTS}/{other.id}"
+
+        assert (await _twice(api, detail))["current_funding"] == 0
+        assert await _twice(api, supporters) == []
+        await _twice(api, listing)
+        await _twice(api, untouched)
+
+        body = {
+            "project_id": project.id, "support_type": "financial",
+            "support_amount": 250, "support_description": "Happy to help out"
+        }
+        supported = await api.client.post(supporters, params={"token": token}, json=body)
+        assert supported.status_code == 200
+
+        assert (await _fresh(api, detail))["current_funding"] == 250
+        assert [row["support_amount"] for row in await _fresh(api, supporters)] == [250]
+        funding = {row["id"]: row["current_funding"] for row in (await _fresh(api, listing))["projects"]}
+        assert funding == {project.id: 250, other.id: 0}
+        assert (await api.client.get(untouched)).headers["X-Cache"] == "HIT"
+    api(scenario)
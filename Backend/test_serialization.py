@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Precompiled serializers and the orjson response class
+"""
+
+import os
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Optional
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import orjson
+from pydantic import BaseModel
+from app.api.api_v1.endpoints.scholarships import ScholarshipResponse
+from app.core.database import Scholarship
+from app.core.serialization import ModelSerializer, ORJSONResponse
+
+class ItemResponse(BaseModel):
+    id: str
+    title: str
+    note: Optional[str]
+    created_at: datetime
+
+ITEM = SimpleNamespace(id="i1", title="Item", note=None, created_at=datetime(2030, 1, 2, 3, 4, 5, 6000), secret="x")
+
+def test_serializer_emits_exactly_the_schema_fields():
+    """Keys follow the schema in order, values are passed through unconverted"""
+    serializer = ModelSerializer.for_schema(ItemResponse)
+
+    assert serializer.fields == ("id", "title", "note", "created_at")
+    assert serializer.one(ITEM) == {"id": "i1", "title": "Item", "note": None, "created_at": ITEM.created_at}
+    assert list(serializer.one(ITEM)) == list(ItemResponse.model_fields)
+    assert serializer.many([ITEM, ITEM]) == [serializer.one(ITEM)] * 2
+    assert serializer.many([]) == []
+
+def test_single_field_and_renamed_sources():
+    """One field still yields a dict, and sources= reads a field from another attribute"""
+    assert ModelSerializer(["id"]).one(ITEM) == {"id": "i1"}
+    renamed = ModelSerializer(["id", "label"], sources={"label": "title"})
+    assert renamed.one(ITEM) == {"id": "i1", "label": "Item"}
+
+def test_orjson_response_matches_the_validated_output():
+    """The rendered body equals what response_model validation used to produce"""
+    serializer = ModelSerializer.for_schema(ItemResponse)
+    body = orjson.loads(ORJSONResponse(serializer.one(ITEM)).body)
+    assert body == ItemResponse.model_validate(ITEM, from_attributes=True).model_dump(mode="json")
+
+    extras = {
+        "decimal": Decimal("2.5"), "whole": Decimal("3"), "set": {1}, "day": date(2030, 1, 2),
+        "model": ItemResponse.model_validate(ITEM, from_attributes=True), 1: "non-str key"
+    }
+    assert orjson.loads(ORJSONResponse(extras).body) == {
+        "decimal": 2.5, "whole": 3, "set": [1], "model": body, "day": "2030-01-02", "1": "non-str key"
+    }
+
+def test_scholarship_detail_has_the_response_schema_shape(api):
+    """A served row has exactly the ScholarshipResponse fields with the same values"""
+    async def scenario(api):
+        alumni, _ = await api.user("donor", role="alumni")
+        async with api.sessions() as db:
+            scholarship = Scholarship(
+                title="Merit", description="For the best", amount=1000, category="merit-based",
+                application_deadline=datetime.now() + timedelta(days=30), created_by=alumni.id
+            )
+            db.add(scholarship)
+            await db.commit()
+            await db.refresh(scholarship)
+
+        response = await api.client.get(f"/api/v1/scholarships/scholarships/{scholarship.id}")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        expected = ScholarshipResponse.model_validate(scholarship).model_dump(mode="json")
+        assert list(response.json()) == list(ScholarshipResponse.model_fields)
+        assert response.json() == expected
+    api(scenario)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Refresh-token rotation and replay detection
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.database import AuthSession, Base, User
+from app.core.sessions import (
+    InvalidRefreshToken, RefreshTokenRaced, RefreshTokenReused, create_session, rotate_session, _parse
+)
+
+def _run(scenario):
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'sessions.db')}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(engine, expire_on_commit=False)
+            try:
+                async with sessions() as db:
+                    user = User(username="student", email="student@example.com", password_hash="x", name="Student")
+                    db.add(user)
+                    await db.flush()
+                    token = await create_session(db, user.id)
+                    await db.commit()
+                await scenario(sessions, token)
+            finally:
+                await engine.dispose()
+    asyncio.run(main())
+
+async def _revoked(sessions, session_id: str) -> bool:
+    async with sessions() as db:
+        session = await db.get(AuthSession, session_id)
+        return session.revoked_at is not None
+
+def test_forged_old_generation_does_not_revoke():
+    """A made-up secret for an older generation is rejected and the session survives"""
+    async def scenario(sessions, token):
+        session_id, _, _ = _parse(token)
+        async with sessions() as db:
+            _, _, token = await rotate_session(db, token)
+        for forged in (f"{session_id}.0.x", f"{session_id}.-5.x", f"{session_id}.1.x"):
+            async with sessions() as db:
+                with pytest.raises(InvalidRefreshToken) as excinfo:
+                    await rotate_session(db, forged)
+            assert not isinstance(excinfo.value, RefreshTokenReused)
+        assert not await _revoked(sessions, session_id)
+
+        async with sessions() as db:
+            _, _, token = await rotate_session(db, token)
+        assert _parse(token)[1] == 2
+    _run(scenario)
+
+async def _age_rotation(sessions, session_id: str):
+    """Move the last rotation back past the reuse grace period"""
+    async with sessions() as db:
+        await db.execute(update(AuthSession).where(AuthSession.id == session_id).values(
+            last_used_at=datetime.utcnow() - timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS + 1)
+        ))
+        await db.commit()
+
+def test_replayed_previous_token_revokes_session():
+    """The genuine rotated-out token revokes the session and its successor stops working"""
+    async def scenario(sessions, first):
+        session_id, _, _ = _parse(first)
+        async with sessions() as db:
+            _, _, second = await rotate_session(db, first)
+        await _age_rotation(sessions, session_id)
+        async with sessions() as db:
+            with pytest.raises(RefreshTokenReused):
+                await rotate_session(db, first)
+        assert await _revoked(sessions, session_id)
+
+        async with sessions() as db:
+            with pytest.raises(InvalidRefreshToken):
+                await rotate_session(db, second)
+    _run(scenario)
+
+def test_previous_token_within_grace_is_a_race():
+    """Right after a rotation the previous token is refused as a race, not a replay"""
+    async def scenario(sessions, first):
+        session_id, _, _ = _parse(first)
+        async with sessions() as db:
+            _, _, second = await rotate_session(db, first)
+        async with sessions() as db:
+            with pytest.raises(RefreshTokenRaced):
+                await rotate_session(db, first)
+        assert not await _revoked(sessions, session_id)
+
+        async with sessions() as db:
+            _, _, third = await rotate_session(db, second)
+        assert _parse(third)[1] == 2
+    _run(scenario)
+
+def test_concurrent_refreshes_keep_the_session(api):
+    """Parallel refreshes of one token: one rotates, the rest get 409 and the session survives"""
+    async def scenario(api):
+        user, _ = await api.user("tabs")
+        async with api.sessions() as db:
+            token = await create_session(db, user.id)
+            await db.commit()
+
+        responses = await asyncio.gather(*(
+            api.client.post("/api/v1/auth/refresh", json={"refresh_token": token}) for _ in range(5)
+        ))
+        codes = sorted(response.status_code for response in responses)
+        assert codes == [200] + [409] * 4
+        assert all(r.headers["Retry-After"] == "1" for r in responses if r.status_code == 409)
+        assert not await _revoked(api.sessions, _parse(token)[0])
+
+        latest = next(r for r in responses if r.status_code == 200).json()["refresh_token"]
+        retried = await api.client.post("/api/v1/auth/refresh", json={"refresh_token": latest})
+        assert retried.status_code == 200
+    api(scenario)
+
+def test_password_change_revokes_every_session():
+    """A new password ends the user's sessions; other changes and rolled-back ones do not"""
+    async def scenario(sessions, first):
+        session_id, _, _ = _parse(first)
+        async with sessions() as db:
+            user_id = (await db.get(AuthSession, session_id)).user_id
+            user = await db.get(User, user_id)
+            second = await create_session(db, user_id)
+            user.role = "alumni"
+            await db.commit()
+        async with sessions() as db:
+            user = await db.get(User, user_id)
+            user.password_hash = "changed"
+            await db.flush()
+            await db.rollback()
+        assert not await _revoked(sessions, session_id)
+
+        async with sessions() as db:
+            user = await db.get(User, user_id)
+            user.password_hash = "changed"
+            await db.commit()
+        for token in (first, second):
+            async with sessions() as db:
+                with pytest.raises(InvalidRefreshToken):
+                    await rotate_session(db, token)
+
+        async with sessions() as db:
+            fresh = await create_session(db, user_id)
+            await db.commit()
+        async with sessions() as db:
+            await rotate_session(db, fresh)
+    _run(scenario)
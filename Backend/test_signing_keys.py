@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Signing key bootstrap and the HS256 transition window
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import jwt
+import pytest
+from app.core import security
+from app.core.config import settings
+from app.core.signing_keys import KeySet, export_public_key, generate_key
+
+def test_workers_starting_together_create_one_key():
+    """Concurrent ensure_signing_key calls on an empty directory agree on a single key"""
+    with tempfile.TemporaryDirectory() as directory:
+        kids, errors = [], []
+
+        def start_worker():
+            try:
+                kids.append(KeySet(directory, 0, 60).ensure_signing_key("EdDSA").kid)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=start_worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert len(set(kids)) == 1
+        assert [name for name in os.listdir(directory) if name.endswith(".pem")] == [f"{kids[0]}.pem"]
+
+def test_verify_only_node_starts_without_a_private_key():
+    """A directory of exported public keys creates no key and still verifies tokens"""
+    with tempfile.TemporaryDirectory() as origin, tempfile.TemporaryDirectory() as directory:
+        key = generate_key(origin, "EdDSA")
+        export_public_key(key, directory)
+        keys = KeySet(directory, 0, 60)
+
+        assert keys.ensure_signing_key("EdDSA") is None
+        assert os.listdir(directory) == [f"{key.kid}.pub.pem"]
+        with pytest.raises(RuntimeError):
+            keys.signing_key()
+
+        token = jwt.encode({"sub": "user-1"}, key.private_key, algorithm="EdDSA", headers={"kid": key.kid})
+        public = keys.get(key.kid)
+        assert jwt.decode(token, public.public_key, algorithms=[public.algorithm]) == {"sub": "user-1"}
+
+@pytest.fixture
+def key_signing(monkeypatch):
+    """Switch to EdDSA with a fresh key directory; yields that directory"""
+    with tempfile.TemporaryDirectory() as directory:
+        monkeypatch.setattr(settings, "ALGORITHM", "EdDSA")
+        monkeypatch.setattr(settings, "JWT_ACCEPT_HS256", True)
+        monkeypatch.setattr(security, "key_set", KeySet(directory, 0, 0))
+        security.token_cache.clear()
+        yield directory
+        security.token_cache.clear()
+
+def _hs256_token(expires_in: timedelta) -> str:
+    exp = datetime.utcnow() + expires_in
+    return jwt.encode({"sub": "user-1", "exp": exp}, settings.SECRET_KEY, algorithm="HS256")
+
+def test_hs256_tokens_issued_before_the_switch_stay_valid(key_signing):
+    """Outstanding HS256 tokens verify after the first key is created"""
+    security.key_set.ensure_signing_key("EdDSA")
+    lifetime = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    assert security.verify_token(_hs256_token(lifetime - timedelta(minutes=1)))["sub"] == "user-1"
+    # Could only have been minted after the switch
+    assert security.verify_token(_hs256_token(lifetime + timedelta(minutes=5))) is None
+
+def test_hs256_window_closes_after_one_token_lifetime(key_signing):
+    """Once the first key is older than a token lifetime, HS256 tokens are refused"""
+    key = generate_key(key_signing, "EdDSA")
+    old_kid = "20200101000000-" + key.kid.split("-", 1)[1]
+    os.rename(os.path.join(key_signing, f"{key.kid}.pem"), os.path.join(key_signing, f"{old_kid}.pem"))
+    assert security.verify_token(_hs256_token(timedelta(minutes=5))) is None
+
+def test_hs256_can_be_refused_outright(key_signing, monkeypatch):
+    """JWT_ACCEPT_HS256=False rejects HS256 tokens at once"""
+    security.key_set.ensure_signing_key("EdDSA")
+    monkeypatch.setattr(settings, "JWT_ACCEPT_HS256", False)
+    assert security.verify_token(_hs256_token(timedelta(minutes=5))) is None
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+SQLite write routing: a transaction that has written reads through the writer
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, select, func
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core import database
+from app.core.database import Base, User, RoutingSession
+
+def test_reads_after_a_flush_see_uncommitted_rows(monkeypatch):
+    """Reads follow the transaction's writes to the writer, then return to the pool"""
+    async def main(directory):
+        url = f"sqlite+aiosqlite:///{os.path.join(directory, 'routing.db')}"
+        reader = create_async_engine(url)
+        writer = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0)
+        monkeypatch.setattr(database, "sqlite_writer_engine", writer)
+        used = []
+        event.listen(reader.sync_engine, "before_cursor_execute", lambda *args: used.append("reader"))
+        event.listen(writer.sync_engine, "before_cursor_execute", lambda *args: used.append("writer"))
+        try:
+            async with writer.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            sessions = async_sessionmaker(
+                bind=reader, class_=AsyncSession, sync_session_class=RoutingSession,
+                autoflush=False, expire_on_commit=False
+            )
+            async with sessions() as db:
+                count = select(func.count()).select_from(User)
+                assert await db.scalar(count) == 0
+                db.add(User(username="u", email="u@example.com", password_hash="x", name="U"))
+                await db.flush()
+                # Served by the writer, which holds the uncommitted insert
+                assert await db.scalar(count) == 1
+                await db.commit()
+                used.clear()
+                assert await db.scalar(count) == 1
+                assert used == ["reader"]
+        finally:
+            await reader.dispose()
+            await writer.dispose()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(main(directory))
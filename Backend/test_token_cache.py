@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Verified-token cache: expiry, size bound and disabling
+"""
+
+import os
+import sys
+import time
+from datetime import timedelta
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from app.core import security
+from app.core.config import settings
+from app.core.security import TokenCache, create_access_token, verify_token
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.time"""
+    now = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+@pytest.fixture
+def hs256(monkeypatch):
+    monkeypatch.setattr(settings, "ALGORITHM", "HS256")
+
+def _token(n: int, minutes: int = 30) -> str:
+    return create_access_token({"sub": f"user-{n}"}, timedelta(minutes=minutes))
+
+def test_entry_expires_at_the_token_exp(clock):
+    """An entry is served until its exp and dropped from then on"""
+    cache = TokenCache(10)
+    key = TokenCache.key("token")
+    exp = clock[0] + 60
+    cache.put(key, {"sub": "u", "exp": exp})
+
+    clock[0] = exp - 1
+    assert cache.get(key) == {"sub": "u", "exp": exp}
+    clock[0] = exp
+    assert cache.get(key) is None
+    assert cache.stats()["size"] == 0
+    clock[0] = exp - 1
+    assert cache.get(key) is None
+
+    # Without a numeric exp there is nothing to bound the entry by
+    cache.put(key, {"sub": "u"})
+    assert cache.stats()["size"] == 0
+
+def test_expired_entry_is_verified_again(hs256, clock, monkeypatch):
+    """verify_token re-decodes a token whose cached entry reached exp"""
+    cache = TokenCache(10)
+    monkeypatch.setattr(security, "token_cache", cache)
+    token = _token(1)
+
+    payload = verify_token(token)
+    assert verify_token(token) == payload
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    clock[0] = payload["exp"]
+    assert cache.get(TokenCache.key(token)) is None
+    decoded = []
+    monkeypatch.setattr(security, "_decode", lambda t: decoded.append(t) or dict(payload))
+    assert verify_token(token) == payload
+    assert decoded == [token]
+
+def test_lru_stays_within_max_size(hs256, monkeypatch):
+    """The least recently used token is evicted once TOKEN_CACHE_SIZE is reached"""
+    cache = TokenCache(3)
+    monkeypatch.setattr(security, "token_cache", cache)
+    tokens = [_token(n) for n in range(5)]
+
+    for token in tokens[:3]:
+        assert verify_token(token) is not None
+    # Touch the oldest so the second becomes least recently used
+    verify_token(tokens[0])
+    for token in tokens[3:]:
+        verify_token(token)
+        assert cache.stats()["size"] <= 3
+
+    cached = [cache.get(TokenCache.key(token)) is not None for token in tokens]
+    assert cached == [True, False, False, True, True]
+    assert cache.stats()["size"] == 3
+
+def test_size_zero_disables_the_cache(hs256, monkeypatch):
+    """With TOKEN_CACHE_SIZE 0 every token is decoded and nothing is stored"""
+    cache = TokenCache(0)
+    monkeypatch.setattr(security, "token_cache", cache)
+    token = _token(1)
+
+    for _ in range(3):
+        assert verify_token(token)["sub"] == "user-1"
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (0, 0, 3)
+    assert verify_token(token + "x") is None